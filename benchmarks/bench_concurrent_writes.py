@@ -0,0 +1,68 @@
+"""
+Measures throughput of locked saves from 1 to N writer processes.
+Every writer saves games to one shared database file and scores to one
+shared highscores file, then lost writes are counted. Run from the
+repository root:
+
+    python -m benchmarks.bench_concurrent_writes --writers 8 --saves 50
+"""
+from connect4.database import LazyDatabase, HighscoresDatabase
+from connect4.game import Game
+from connect4.player import Player
+from connect4.score import Score
+from multiprocessing import Pool
+import argparse
+import os
+import tempfile
+import time
+
+
+def write(games_path, scores_path, saves):
+    """
+    Saves given count of games and scores
+    """
+    for number in range(saves):
+        game = Game([Player('1', 'x'), Player('2', 'o')])
+        game._current_player = game.players()[0]
+        with LazyDatabase() as games:
+            games.update_file(games_path, lambda db: db.add_game(game))
+        score = Score(str(os.getpid()), number + 4)
+        HighscoresDatabase(limit=None).update_file(
+            scores_path, lambda db: db.add_score(score))
+
+
+def run(writers, saves, directory):
+    """
+    Returns tuple of seconds and count of lost writes
+    """
+    games_path = os.path.join(directory, f'database{writers}.json')
+    scores_path = os.path.join(directory, f'highscores{writers}.json')
+    with Pool(writers) as pool:
+        start = time.perf_counter()
+        pool.starmap(write, [(games_path, scores_path, saves)] * writers)
+        elapsed = time.perf_counter() - start
+    with LazyDatabase() as games:
+        games.read_from_file(games_path)
+    scores = HighscoresDatabase(limit=None)
+    scores.read_from_file(scores_path)
+    expected = writers * saves
+    lost = 2 * expected - len(games.headers()) - len(scores.scores())
+    return elapsed, lost
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writers', type=int, default=os.cpu_count())
+    parser.add_argument('--saves', type=int, default=50)
+    args = parser.parse_args(arguments)
+    print('writers  seconds  saves/s  lost')
+    with tempfile.TemporaryDirectory() as directory:
+        for writers in range(1, args.writers + 1):
+            elapsed, lost = run(writers, args.saves, directory)
+            saves = 2 * writers * args.saves
+            print(f'{writers:7}  {elapsed:7.2f}  {saves / elapsed:7.0f}'
+                  f'  {lost:4}')
+
+
+if __name__ == '__main__':
+    main()
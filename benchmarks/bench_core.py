@@ -0,0 +1,233 @@
+"""
+Measures speed of the core hot paths and compares runs with a baseline.
+Results are written as JSON, compare exits with status 1 when any case
+is slower than the baseline by more than the threshold. Run from the
+repository root:
+
+    python -m benchmarks.bench_core run --output results.json
+    python -m benchmarks.bench_core compare baseline.json results.json
+"""
+from connect4.board import Board
+from connect4.game import Game
+from connect4.player import Player
+from connect4.score import Score
+from connect4.detection import winning_sign
+from connect4.classes_io import write_game, read_games
+from connect4.database import Database, HighscoresDatabase
+from connect4.config import WIDTH, HEIGHT, WIN_COUNT
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+
+SIZES = [10, 1000, 100000]
+
+
+def create_game(moves=()):
+    """
+    Returns game with given columns (numbered from 1) played
+    """
+    game = Game([Player('a', 'x'), Player('b', 'o')])
+    game._current_player = game.players()[0]
+    for column in moves:
+        game.board().insert_player_sign(column, game.current_player().sign())
+        game.toggle()
+    return game
+
+
+def full_game(seed=0):
+    """
+    Returns game with full board and no winner
+    """
+    generator = random.Random(seed)
+    while True:
+        columns = [column for column in range(1, WIDTH + 1)
+                   for _ in range(HEIGHT)]
+        generator.shuffle(columns)
+        game = create_game(columns)
+        board = game.board().board()
+        if not winning_sign(board, game.signs(), WIN_COUNT):
+            return game
+
+
+MID_GAME = [4, 4, 3, 5, 2, 6, 4, 3, 5, 5, 1, 7, 6, 2]
+
+
+def fill_board():
+    board = Board()
+    for column in range(1, WIDTH + 1):
+        for _ in range(HEIGHT):
+            board.insert_player_sign(column, 'x')
+
+
+def core_cases():
+    """
+    Returns dict of names of cases mapped to functions measured by them
+    """
+    empty = create_game()
+    middle = create_game(MID_GAME)
+    full = full_game()
+    return {
+        'board.insert_player_sign.fill': fill_board,
+        'board.str.mid': lambda: str(middle.board()),
+        'game.check_winner.empty': lambda: empty.check_winner(full=True),
+        'game.check_winner.mid': lambda: middle.check_winner(),
+        'game.check_winner.mid_full_scan':
+            lambda: middle.check_winner(full=True),
+        'game.check_winner.full': lambda: full.check_winner(full=True),
+    }
+
+
+SIZED_CASES = ['classes_io.write_game', 'classes_io.read_games',
+               'database.save', 'database.load', 'highscores.save',
+               'highscores.load']
+
+
+def sized_cases(size, directory):
+    """
+    Returns dict of cases working on given count of games and scores,
+    named like SIZED_CASES with the size appended
+    """
+    games = [create_game(MID_GAME[:number % len(MID_GAME)])
+             for number in range(size)]
+    for number, game in enumerate(games):
+        game._id = number
+    data = write_game(games, [])
+    scores = [Score(f'player{number % 100}', number % 40 + 4)
+              for number in range(size)]
+    games_path = os.path.join(directory, f'database{size}.json')
+    scores_path = os.path.join(directory, f'highscores{size}.json')
+    Database(games).save_to_file(games_path)
+    HighscoresDatabase(scores, limit=None).save_to_file(scores_path)
+
+    def load_games():
+        Database().read_from_file(games_path)
+
+    def load_scores():
+        HighscoresDatabase(limit=None).read_from_file(scores_path)
+    return {
+        f'classes_io.write_game.{size}': lambda: write_game(games, []),
+        f'classes_io.read_games.{size}': lambda: read_games(data),
+        f'database.save.{size}':
+            lambda: Database(games).save_to_file(games_path),
+        f'database.load.{size}': load_games,
+        f'highscores.save.{size}':
+            lambda: HighscoresDatabase(scores, limit=None).save_to_file(
+                scores_path),
+        f'highscores.load.{size}': load_scores,
+    }
+
+
+def measure(function, min_time, repeat):
+    """
+    Returns the best time of one call of function in seconds
+    and count of calls in one measurement
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, number
+
+
+def run(sizes, pattern=None, min_time=0.2, repeat=3):
+    """
+    Measures all cases whose names contain pattern
+    Returns dict of results ready to write as JSON
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        cases = core_cases()
+        for size in sizes:
+            names = [f'{name}.{size}' for name in SIZED_CASES]
+            if any(not pattern or pattern in name for name in names):
+                cases.update(sized_cases(size, directory))
+        for name, function in cases.items():
+            if pattern and pattern not in name:
+                continue
+            seconds, number = measure(function, min_time, repeat)
+            results[name] = {'seconds': seconds, 'number': number}
+            print(f'{name:42} {seconds * 1e6:14.2f} us', file=sys.stderr)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.time(),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Returns list of tuples of case name, baseline time, current time
+    and ratio of times, with regressions flagged, for cases in both runs
+    """
+    rows = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        old = baseline['results'][name]['seconds']
+        new = result['seconds']
+        ratio = new / old if old else float('inf')
+        rows.append((name, old, new, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='measure cases')
+    run_parser.add_argument('--output', help='file to write results to')
+    run_parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                            help='comma separated counts of records')
+    run_parser.add_argument('--filter', help='measure only cases whose '
+                                             'names contain this text')
+    run_parser.add_argument('--min-time', type=float, default=0.2)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    compare_parser = commands.add_parser(
+        'compare', help='flag cases slower than baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='allowed slowdown, 0.1 is 10%%')
+    args = parser.parse_args(arguments)
+    if args.command == 'run':
+        sizes = [int(size) for size in args.sizes.split(',') if size]
+        results = run(sizes, args.filter, args.min_time, args.repeat)
+        text = json.dumps(results, indent=4)
+        if args.output:
+            with open(args.output, 'w') as file_handle:
+                file_handle.write(text)
+        else:
+            print(text)
+        return 0
+    with open(args.baseline) as file_handle:
+        baseline = json.load(file_handle)
+    with open(args.current) as file_handle:
+        current = json.load(file_handle)
+    rows = compare(baseline, current, args.threshold)
+    print(f'{"case":42} {"baseline us":>12} {"current us":>12} {"ratio":>6}')
+    for name, old, new, ratio, regression in rows:
+        flag = '  REGRESSION' if regression else ''
+        print(f'{name:42} {old * 1e6:12.2f} {new * 1e6:12.2f} '
+              f'{ratio:6.2f}{flag}')
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Measures speedup of ParallelSearch from 1 to N worker processes.
+Every run searches the same positions to a fixed depth, so all runs
+do the same work. Run from the repository root:
+
+    python -m benchmarks.bench_parallel --workers 8 --depth 7
+"""
+from connect4.bitboard import Position
+from connect4.parallel import ParallelSearch
+import argparse
+import os
+import time
+
+
+OPENINGS = [[], [3], [3, 3], [3, 2, 4], [2, 3, 3, 4]]
+
+
+def positions():
+    for moves in OPENINGS:
+        position = Position()
+        for column in moves:
+            position.play(column)
+        yield position
+
+
+def run(workers, depth):
+    """
+    Returns tuple of seconds and nodes of searching all positions
+    """
+    search = ParallelSearch(workers, 'root', time_limit=None,
+                            max_depth=depth)
+    search.executor().submit(int).result()
+    nodes = 0
+    start = time.perf_counter()
+    for position in positions():
+        search.search(position)
+        nodes += search.work()
+    elapsed = time.perf_counter() - start
+    search.close()
+    return elapsed, nodes
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--depth', type=int, default=6)
+    args = parser.parse_args(arguments)
+    base = None
+    print('workers  seconds  nodes/s  speedup')
+    for workers in range(1, args.workers + 1):
+        elapsed, nodes = run(workers, args.depth)
+        base = base or elapsed
+        print(f'{workers:7}  {elapsed:7.2f}  {nodes / elapsed:7.0f}'
+              f'  {base / elapsed:7.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures latency of human moves while bots of other games are thinking.
+PvP games send moves in a loop while PvB games keep their bots busy,
+bots' moves are computed by thread or process scheduler. Run from the
+repository root:
+
+    python -m benchmarks.bench_server_latency --bots 8 --seconds 5
+"""
+from connect4.server import GameServer
+from connect4.scheduler import BotMoveScheduler
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+PLAYERS = [{'name': 'a', 'sign': 'x'}, {'name': 'b', 'sign': 'o'}]
+
+
+async def human_moves(server, stop, latencies):
+    while not stop.is_set():
+        state = await server.handle_request(
+            {'command': 'new', 'players': PLAYERS})
+        for column in (1, 2, 1, 2, 1, 2):
+            start = time.perf_counter()
+            await server.handle_request({'command': 'move',
+                                         'session': state['session'],
+                                         'column': column})
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.001)
+        await server.handle_request({'command': 'close',
+                                     'session': state['session']})
+
+
+async def bot_moves(server, stop):
+    while not stop.is_set():
+        state = await server.handle_request(
+            {'command': 'new', 'mode': 'pvb', 'bot_sign': 'o',
+             'players': PLAYERS[:1]})
+        column = 1
+        while not state.get('finished', True) and not stop.is_set():
+            state = await server.handle_request(
+                {'command': 'move', 'session': state['session'],
+                 'column': column})
+            column = column % 7 + 1
+        await server.handle_request({'command': 'close',
+                                     'session': state.get('session')})
+
+
+async def run(kind, bots, humans, seconds, bot_time_limit, directory):
+    """
+    Returns sorted latencies of human moves in seconds
+    """
+    scheduler = BotMoveScheduler(kind, bots)
+    server = GameServer(os.path.join(directory, 'database.json'),
+                        os.path.join(directory, 'highscores.json'),
+                        bot_time_limit, scheduler=scheduler)
+    stop = asyncio.Event()
+    latencies = []
+    tasks = [asyncio.create_task(bot_moves(server, stop))
+             for _ in range(bots)]
+    tasks += [asyncio.create_task(human_moves(server, stop, latencies))
+              for _ in range(humans)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    server.close()
+    return sorted(latencies)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bots', type=int, default=os.cpu_count())
+    parser.add_argument('--humans', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--bot-time-limit', type=float, default=0.2)
+    args = parser.parse_args(arguments)
+    print('kind     moves  p50 ms  p99 ms  max ms')
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in ('thread', 'process'):
+            latencies = asyncio.run(run(kind, args.bots, args.humans,
+                                        args.seconds, args.bot_time_limit,
+                                        directory))
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(f'{kind:7}  {len(latencies):5}  {p50:6.2f}  {p99:6.2f}'
+                  f'  {latencies[-1] * 1000:6.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,32 @@
 from .interface import Interface
+from .sqlite_database import SqliteDatabase
+from .journal_database import JournalDatabase
+from . import instrumentation, server
+import argparse
+import sys
 
 if __name__ == "__main__":
-    ui = Interface()
+    if '--serve' in sys.argv[1:]:
+        server.main([arg for arg in sys.argv[1:] if arg != '--serve'])
+        sys.exit()
+    parser = argparse.ArgumentParser(description='Connect4 game')
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument('--sqlite', metavar='PATH',
+                         help='save games to SQLite database file')
+    storage.add_argument('--journal', metavar='PATH',
+                         help='save games to append-only journal file')
+    parser.add_argument('--serve', action='store_true',
+                        help='host games for network clients instead of '
+                             'playing in the terminal, the other options '
+                             'are the ones of python -m connect4.server')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    if args.metrics:
+        instrumentation.start(args.metrics, args.metrics_file)
+    database = None
+    if args.sqlite:
+        database = SqliteDatabase(args.sqlite)
+    elif args.journal:
+        database = JournalDatabase(args.journal)
+    ui = Interface(database=database)
     ui.play()
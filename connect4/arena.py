@@ -0,0 +1,149 @@
+from .game import Game
+from .bot import Bot, SearchBot, MCTSBot
+from .errors import ColumnIsFullError, ColumnOutOfRangeError
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+import argparse
+import json
+import time
+
+
+def play_game(index, factories, signs=('x', 'o')):
+    """
+    Plays one game without any input or output between bots created
+    by factories (callables taking bot's sign). First factory's bot starts
+    games with even index, second factory's bot starts odd ones.
+    Bot choosing invalid or full column loses the game
+    Returns dict with game's result
+    """
+    bots = [factory(sign) for factory, sign in zip(factories, signs)]
+    game = Game(bots)
+    first = index % 2
+    game._current_player = bots[first]
+    cells = game.width() * game.height()
+    move_times = []
+    winner = None
+    forfeit = False
+    while len(move_times) < cells:
+        bot = game.current_player()
+        start = time.perf_counter()
+        column = bot.choose_column(game.width())
+        move_times.append(time.perf_counter() - start)
+        try:
+            game.board().insert_player_sign(column, bot.sign())
+        except (ColumnIsFullError, ColumnOutOfRangeError):
+            forfeit = True
+            game.toggle()
+            winner = game.current_player()
+            break
+        result = game.check_winner()
+        if result:
+            winner = result[0]
+            break
+        game.toggle()
+    return {
+        'game': index,
+        'first': first + 1,
+        'winner': bots.index(winner) + 1 if winner else None,
+        'forfeit': forfeit,
+        'moves': len(move_times),
+        'move_times': move_times,
+    }
+
+
+class Arena:
+    """
+    Class Arena. Plays many headless games between two bots
+    and writes result of every game as one JSON line.
+    Contains attributes:
+
+    :param factories: two callables, creating bot for given sign,
+        they have to be picklable to play in worker processes
+    :type factories: list
+
+    :param workers: count of worker processes, 0 plays games
+        in the current process, None uses count of CPUs
+    :type workers: int
+    """
+    def __init__(self, factories, workers=None):
+        if len(factories) != 2:
+            raise ValueError('Arena needs two bots')
+        self._factories = list(factories)
+        self._workers = workers
+
+    def factories(self):
+        return self._factories
+
+    def results(self, games):
+        """
+        Yields results of given count of games as soon as they end
+        """
+        if self._workers == 0:
+            for index in range(games):
+                yield play_game(index, self._factories)
+            return
+        with ProcessPoolExecutor(self._workers) as executor:
+            futures = [executor.submit(play_game, index, self._factories)
+                       for index in range(games)]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, games, path):
+        """
+        Plays given count of games, appending results to file
+        Returns summary of wins, draws, moves and time
+        """
+        summary = {'games': 0, 'wins': [0, 0], 'draws': 0, 'moves': 0,
+                   'seconds': 0.0}
+        start = time.perf_counter()
+        with open(path, 'a') as file_handle:
+            for result in self.results(games):
+                file_handle.write(json.dumps(result) + '\n')
+                file_handle.flush()
+                summary['games'] += 1
+                summary['moves'] += result['moves']
+                if result['winner'] is None:
+                    summary['draws'] += 1
+                else:
+                    summary['wins'][result['winner'] - 1] += 1
+        summary['seconds'] = time.perf_counter() - start
+        return summary
+
+
+def bot_factory(kind, time_limit):
+    """
+    Returns factory of bot of given kind: 'random', 'search' or 'mcts'
+    """
+    if kind == 'random':
+        return Bot
+    if kind == 'search':
+        return partial(SearchBot, time_limit=time_limit)
+    if kind == 'mcts':
+        return partial(MCTSBot, time_limit=time_limit)
+    raise ValueError(f'Unknown bot {kind}')
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description='Plays headless tournament between two bots')
+    parser.add_argument('path', help='file to append results to')
+    parser.add_argument('--first', default='search',
+                        choices=['random', 'search', 'mcts'])
+    parser.add_argument('--second', default='random',
+                        choices=['random', 'search', 'mcts'])
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--time-limit', type=float, default=0.1)
+    args = parser.parse_args(arguments)
+    factories = [bot_factory(args.first, args.time_limit),
+                 bot_factory(args.second, args.time_limit)]
+    summary = Arena(factories, args.workers).run(args.games, args.path)
+    print(f'{args.first} wins: {summary["wins"][0]}, '
+          f'{args.second} wins: {summary["wins"][1]}, '
+          f'draws: {summary["draws"]}')
+    print(f'{summary["games"]} games, {summary["moves"]} moves '
+          f'in {summary["seconds"]:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+from .config import WIDTH, HEIGHT, WIN_COUNT
+import numpy as np
+
+
+ONGOING = 0
+FIRST_WON = 1
+SECOND_WON = 2
+DRAW = 3
+
+EMPTY = 0
+FIRST = 1
+SECOND = 2
+
+
+class BoardBatch:
+    """
+    Class BoardBatch. Keeps many boards in one NumPy array and plays
+    moves of all games at once. Cells are 0 (empty), 1 (first player)
+    or 2 (second player).
+    Contains attributes:
+
+    :param boards: boards of all games
+    :type boards: numpy.ndarray of shape (count, height, width)
+
+    :param heights: count of discs in every column of every game
+    :type heights: numpy.ndarray of shape (count, width)
+
+    :param current: player (1 or 2) which turn is next in every game
+    :type current: numpy.ndarray
+
+    :param moves: count of moves made in every game
+    :type moves: numpy.ndarray
+
+    :param status: ONGOING, FIRST_WON, SECOND_WON or DRAW for every game
+    :type status: numpy.ndarray
+
+    :param win_count: count of signs in line needed to win
+    :type win_count: int
+    """
+    def __init__(self, count, width=WIDTH, height=HEIGHT,
+                 win_count=WIN_COUNT):
+        self._boards = np.zeros((count, height, width), dtype=np.int8)
+        self._heights = np.zeros((count, width), dtype=np.int16)
+        self._current = np.full(count, FIRST, dtype=np.int8)
+        self._moves = np.zeros(count, dtype=np.int32)
+        self._status = np.full(count, ONGOING, dtype=np.int8)
+        self._win_count = win_count
+
+    def count(self):
+        return self._boards.shape[0]
+
+    def height(self):
+        return self._boards.shape[1]
+
+    def width(self):
+        return self._boards.shape[2]
+
+    def boards(self):
+        return self._boards
+
+    def current(self):
+        return self._current
+
+    def moves(self):
+        return self._moves
+
+    def status(self):
+        return self._status
+
+    def reset(self, games=None, first=FIRST):
+        """
+        Clears chosen games (all games by default), so their slots
+        can be used by new games
+        """
+        if games is None:
+            games = slice(None)
+        self._boards[games] = EMPTY
+        self._heights[games] = 0
+        self._current[games] = first
+        self._moves[games] = 0
+        self._status[games] = ONGOING
+
+    def apply_moves(self, columns):
+        """
+        Inserts sign of the current player of every game into its column
+        from columns (numbered from 1, 0 means no move in that game)
+        Moves to invalid or full columns and moves in finished games
+        are rejected and leave the game unchanged
+        Returns tuple of status of every game and array of accepted moves
+        """
+        columns = np.asarray(columns)
+        games = np.arange(self.count())
+        accepted = ((columns >= 1) & (columns <= self.width())
+                    & (self._status == ONGOING))
+        column_index = np.where(accepted, columns - 1, 0)
+        heights = self._heights[games, column_index]
+        accepted &= heights < self.height()
+
+        games = games[accepted]
+        column_index = column_index[accepted]
+        rows = self.height() - 1 - heights[accepted]
+        players = self._current[games]
+        self._boards[games, rows, column_index] = players
+        self._heights[games, column_index] += 1
+        self._moves[games] += 1
+        self._current[games] = FIRST + SECOND - players
+
+        won = self._check_lines(games, rows, column_index, players)
+        self._status[games[won]] = players[won]
+        full = self._moves[games] == self.width() * self.height()
+        self._status[games[full & ~won]] = DRAW
+        return self._status.copy(), accepted
+
+    def _check_lines(self, games, rows, columns, players):
+        """
+        Checks four lines going through given cells
+        Returns array of flags, True where player has win_count
+        signs in line
+        """
+        count = self._win_count
+        offsets = np.arange(1, count)
+        won = np.zeros(games.shape, dtype=bool)
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            line = np.ones(games.shape, dtype=np.int32)
+            for direction in (1, -1):
+                x = rows[:, None] + row_step * direction * offsets
+                y = columns[:, None] + column_step * direction * offsets
+                inside = ((x >= 0) & (x < self.height())
+                          & (y >= 0) & (y < self.width()))
+                x = np.where(inside, x, 0)
+                y = np.where(inside, y, 0)
+                same = inside & (self._boards[games[:, None], x, y]
+                                 == players[:, None])
+                line += np.cumprod(same, axis=1).sum(axis=1)
+            won |= line >= count
+        return won
+
+    def board(self, game, signs):
+        """
+        Returns NumPy array of signs of chosen game, same as the one
+        used by Board
+        """
+        table = np.array([' '] + list(signs))
+        return table[self._boards[game]]
@@ -0,0 +1,273 @@
+from .board import Board
+from .config import WIDTH, HEIGHT, WIN_COUNT
+from .errors import (ColumnIsFullError, ColumnOutOfRangeError,
+                     InvalidDataError, InvalidSignError)
+import numpy as np
+
+
+def has_line(mask, shift, count=WIN_COUNT):
+    """
+    Returns True if given bitmask contains count bits next to each other,
+    where neighbours are shift bits apart
+    """
+    line = mask
+    for index in range(1, count):
+        line &= mask >> (shift * index)
+        if not line:
+            return False
+    return True
+
+
+def is_winning_mask(mask, height, count=WIN_COUNT):
+    """
+    Returns True if given bitmask contains count bits in one line.
+    Every column takes height+1 bits, the top one is always empty
+    so lines never wrap between columns
+    """
+    for shift in (1, height, height + 1, height + 2):
+        if has_line(mask, shift, count):
+            return True
+    return False
+
+
+class BitBoard(Board):
+    """
+    Class BitBoard. Keeps the same interface as Board, but stores
+    the grid as two bitmasks (one for every sign) and discs count
+    of every column, so inserting a sign takes constant time.
+    Column c, row r (counted from the bottom) is bit c*(height+1)+r.
+    Contains attributes:
+
+    :param height: height of the board
+    :type height: int
+
+    :param width: width of the board
+    :type width: int
+
+    :param signs: signs placed on the board, index of sign is index
+        of its bitmask
+    :type signs: list
+
+    :param masks: bitmasks of both signs
+    :type masks: list
+
+    :param heights: count of discs in every column
+    :type heights: list
+
+    :param last_move: row and column of the last inserted sign
+    :type last_move: tuple
+
+    :param renderer: text of the board updated with every inserted sign,
+        created on the first call of str()
+    :type renderer: BoardRenderer
+    """
+    def __init__(self, array=None, width=WIDTH, height=HEIGHT):
+        if array is not None:
+            height, width = array.shape
+        self._height = height
+        self._width = width
+        self._signs = []
+        self._masks = [0, 0]
+        self._heights = [0] * width
+        self._last_move = None
+        self._renderer = None
+        if array is not None:
+            self._load_array(array)
+
+    def _load_array(self, array):
+        """
+        Fills bitmasks using NumPy array of signs
+        Raises InvalidDataError if array has more than two signs
+        or a sign is placed above an empty cell
+        """
+        for column in range(self.width()):
+            for row in range(self.height()):
+                item = array[self.height() - row - 1][column]
+                if item == ' ':
+                    break
+                try:
+                    slot = self._sign_slot(str(item))
+                except InvalidSignError as e:
+                    raise InvalidDataError('Too many signs on board') from e
+                self._masks[slot] |= 1 << self._bit(column, row)
+                self._heights[column] += 1
+            empty = array[:self.height() - self._heights[column], column]
+            if np.any(empty != ' '):
+                raise InvalidDataError('Sign placed above an empty cell')
+
+    def _bit(self, column, row):
+        return column * (self.height() + 1) + row
+
+    def _sign_slot(self, sign):
+        """
+        Returns index of sign's bitmask, registers new sign if there
+        is a free bitmask
+        Raises InvalidSignError if board has already two other signs
+        """
+        if sign in self._signs:
+            return self._signs.index(sign)
+        if len(self._signs) == 2:
+            raise InvalidSignError('Board can hold only two signs')
+        self._signs.append(sign)
+        return len(self._signs) - 1
+
+    def signs(self):
+        return self._signs
+
+    def masks(self):
+        return self._masks
+
+    def heights(self):
+        return self._heights
+
+    def sign_at(self, row, column):
+        bit = self._bit(column, self.height() - row - 1)
+        for slot, sign in enumerate(self.signs()):
+            if self._masks[slot] >> bit & 1:
+                return sign
+        return ' '
+
+    def board(self):
+        """
+        Returns NumPy array of signs equal to the one used by Board.
+        Array is created on every call, changing it does not
+        change the bitboard
+        """
+        array = np.full((self.height(), self.width()), ' ')
+        for slot, sign in enumerate(self.signs()):
+            mask = self._masks[slot]
+            for column in range(self.width()):
+                for row in range(self._heights[column]):
+                    if mask >> self._bit(column, row) & 1:
+                        array[self.height() - row - 1][column] = sign
+        return array
+
+    def insert_player_sign(self, column_number, player_sign):
+        """
+        Inserts chosen sign to chosen column
+        Returns True if operation was succesfull
+        Raises exceptions if column number is invalid or column is full
+        """
+        if column_number not in range(1, self.width()+1):
+            raise ColumnOutOfRangeError('Column is out of range')
+        column = column_number - 1
+        row = self._heights[column]
+        if row == self.height():
+            raise ColumnIsFullError('Column is full')
+        slot = self._sign_slot(player_sign)
+        self._masks[slot] |= 1 << self._bit(column, row)
+        self._heights[column] += 1
+        self._last_move = (self.height() - row - 1, column)
+        self._render_cell(self.height() - row - 1, column)
+        return True
+
+    def is_full(self):
+        return sum(self._heights) == self.width() * self.height()
+
+    def winning_sign(self, count=WIN_COUNT):
+        """
+        Returns sign which has count signs in one line
+        Returns False if there is no such sign
+        """
+        for slot, sign in enumerate(self.signs()):
+            if is_winning_mask(self._masks[slot], self.height(), count):
+                return sign
+        return False
+
+
+class Position:
+    """
+    Class Position. Compact bitboard position used by searching bots.
+    Uses the same bit layout as BitBoard, but keeps only discs of the
+    player whose turn is next and discs of both players.
+    Contains attributes:
+
+    :param width: width of the board
+    :type width: int
+
+    :param height: height of the board
+    :type height: int
+
+    :param win_count: count of signs in line needed to win
+    :type win_count: int
+
+    :param current: bitmask of discs of the player whose turn is next
+    :type current: int
+
+    :param mask: bitmask of all discs on the board
+    :type mask: int
+
+    :param moves: count of discs on the board
+    :type moves: int
+    """
+    def __init__(self, width=WIDTH, height=HEIGHT, win_count=WIN_COUNT,
+                 current=0, mask=0, moves=0):
+        self.width = width
+        self.height = height
+        self.win_count = win_count
+        self.current = current
+        self.mask = mask
+        self.moves = moves
+
+    @classmethod
+    def from_array(cls, array, sign, win_count=WIN_COUNT):
+        """
+        Creates position from NumPy array of signs,
+        sign is sign of the player whose turn is next
+        """
+        board = BitBoard(array)
+        position = cls(board.width(), board.height(), win_count)
+        for slot, board_sign in enumerate(board.signs()):
+            position.mask |= board.masks()[slot]
+            if board_sign == sign:
+                position.current = board.masks()[slot]
+        position.moves = sum(board.heights())
+        return position
+
+    def copy(self):
+        return Position(self.width, self.height, self.win_count,
+                        self.current, self.mask, self.moves)
+
+    def bottom_mask(self, column):
+        return 1 << column * (self.height + 1)
+
+    def top_mask(self, column):
+        return 1 << (self.height - 1 + column * (self.height + 1))
+
+    def column_mask(self, column):
+        return ((1 << self.height) - 1) << column * (self.height + 1)
+
+    def can_play(self, column):
+        return not self.mask & self.top_mask(column)
+
+    def playable_columns(self):
+        return [column for column in range(self.width)
+                if self.can_play(column)]
+
+    def is_full(self):
+        return self.moves == self.width * self.height
+
+    def is_winning_move(self, column):
+        """
+        Returns True if playing chosen column (numbered from 0)
+        wins the game for the player whose turn is next
+        """
+        played = (self.mask + self.bottom_mask(column))
+        played &= self.column_mask(column)
+        return is_winning_mask(self.current | played, self.height,
+                               self.win_count)
+
+    def play(self, column):
+        """
+        Plays chosen column (numbered from 0), afterwards it is
+        the other player's turn
+        """
+        self.current ^= self.mask
+        self.mask |= self.mask + self.bottom_mask(column)
+        self.moves += 1
+
+    def key(self):
+        """
+        Returns integer unique for every position of given board size
+        """
+        return self.current + self.mask
@@ -1,5 +1,6 @@
 from .config import WIDTH, HEIGHT
 from .errors import ColumnIsFullError, ColumnOutOfRangeError
+from .renderer import BoardRenderer
 import numpy as np
 
 
@@ -17,6 +18,13 @@ class Board:
 
     :param board: NumPy object of chosen width and height
     :type board: numpy.ndarray
+
+    :param last_move: row and column of the last inserted sign
+    :type last_move: tuple
+
+    :param renderer: text of the board updated with every inserted sign,
+        created on the first call of str()
+    :type renderer: BoardRenderer
     """
     def __init__(self, array=None):
         if array is not None:
@@ -27,6 +35,8 @@ class Board:
             self._board = np.full((HEIGHT, WIDTH), ' ')
             self._height = HEIGHT
             self._width = WIDTH
+        self._last_move = None
+        self._renderer = None
 
     def height(self):
         return self._height
@@ -37,21 +47,29 @@ class Board:
     def board(self):
         return self._board
 
+    def last_move(self):
+        return self._last_move
+
+    def sign_at(self, row, column):
+        return self._board[row][column]
+
+    def renderer(self):
+        """
+        Returns renderer of the board, creating it on the first call
+        """
+        if self._renderer is None:
+            self._renderer = BoardRenderer.from_board(self)
+        return self._renderer
+
+    def _render_cell(self, row, column):
+        if self._renderer is not None:
+            self._renderer.set_cell(row, column, self.sign_at(row, column))
+
     def __str__(self):
         """
         Prints current state of board
         """
-        board_str = ''
-        board_str += ('-' * (self.width() * 4 + 1))
-        board_str += '\n'
-        for row in self.board():
-            row_str = ''
-            for item in row:
-                row_str += (f'| {item} ')
-            row_str += '|\n'
-            board_str += row_str
-        board_str += ('-' * (self.width() * 4 + 1))
-        return board_str
+        return self.renderer().render()
 
     def insert_player_sign(self, column_number, player_sign):
         """
@@ -65,7 +83,10 @@ class Board:
             chosen_column = self.board()[:, column_number - 1]
             for index, item in enumerate(reversed(chosen_column)):
                 if item == ' ':
-                    self._board[self.height()-index-1][column_number-1] = player_sign
+                    row = self.height()-index-1
+                    self._board[row][column_number-1] = player_sign
+                    self._last_move = (row, column_number-1)
+                    self._render_cell(row, column_number-1)
                     return True
             if ' ' not in chosen_column:
                 raise ColumnIsFullError('Column is full')
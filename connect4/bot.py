@@ -1,5 +1,11 @@
 from .player import Player
-from random import randint
+from .bitboard import Position
+from .search import Negamax
+from .mcts import MonteCarloSearch
+from .parallel import ParallelSearch
+from .transposition import TranspositionTable
+from .config import BOT_TIME_LIMIT, TABLE_MEMORY
+from random import randint, choice
 
 
 class Bot(Player):
@@ -9,13 +15,205 @@ class Bot(Player):
     :param sign: bot's sign
     :type sign: str
 
+    :param game: game played by bot, set by Game
+    :type game: Game
     """
     def __init__(self, sign: str):
         name = 'Bot'
         super().__init__(name, sign)
+        self._game = None
+
+    def game(self):
+        return self._game
+
+    def set_game(self, game):
+        self._game = game
+
+    def opponent(self):
+        """
+        Returns the other player of bot's game
+        """
+        for player in self.game().players():
+            if player is not self:
+                return player
+
+    def free_columns(self):
+        """
+        Returns numbers of columns which are not full
+        """
+        top_row = self.game().board().board()[0]
+        return [index + 1 for index, item in enumerate(top_row)
+                if item == ' ']
 
     def choose_column(self, width):
         """
         Returns random column number
+        Chooses only columns which are not full when bot knows its game
+        """
+        if self.game() is None:
+            return randint(1, width)
+        return choice(self.free_columns())
+
+
+class SearchBot(Bot):
+    """
+    Class SearchBot. Chooses column using negamax search
+    with alpha-beta pruning. Contains attributes:
+
+    :param sign: bot's sign
+    :type sign: str
+
+    :param search: search engine, keeps statistics of the last search
+    :type search: Negamax
+
+    Positions searched for previous moves are kept in transposition
+    table taking up to table_memory bytes, 0 turns the table off.
+    Table is created on the first search
+
+    :param book: opening book checked before searching, None for no book
+    :type book: OpeningBook
+    """
+    def __init__(self, sign: str, time_limit=BOT_TIME_LIMIT,
+                 node_limit=None, max_depth=None, table_memory=TABLE_MEMORY,
+                 book=None):
+        super().__init__(sign)
+        self._table_memory = table_memory
+        self._book = book
+        self._search = Negamax(time_limit, node_limit, max_depth)
+
+    def search(self):
+        return self._search
+
+    def table_memory(self):
+        return self._table_memory
+
+    def set_table_memory(self, table_memory):
+        """
+        Sets bytes of transposition table, table of previous size
+        is dropped
+        """
+        self._table_memory = table_memory
+        self._search.set_table(None)
+
+    def position(self):
+        """
+        Returns Position of bot's game, bot is the player to move
+        """
+        game = self.game()
+        return Position.from_array(game.board().board(), self.sign(),
+                                   game.win_count())
+
+    def choose_column(self, width):
+        """
+        Returns number of the best column found by search
+        """
+        if self.game() is None:
+            return super().choose_column(width)
+        position = self.position()
+        if self._book is not None:
+            entry = self._book.lookup(position)
+            if entry is not None:
+                column, _ = entry
+                return column + 1
+        if self._table_memory and self._search.table() is None:
+            self._search.set_table(TranspositionTable(self._table_memory))
+        result = self._search.search(position)
+        if result is None:
+            return super().choose_column(width)
+        column, _ = result
+        return column + 1
+
+
+class MCTSBot(Bot):
+    """
+    Class MCTSBot. Chooses column using Monte Carlo tree search.
+    Contains attributes:
+
+    :param sign: bot's sign
+    :type sign: str
+
+    :param search: search engine, keeps its tree and statistics
+        of the last search
+    :type search: MonteCarloSearch
+    """
+    def __init__(self, sign: str, simulations=None,
+                 time_limit=BOT_TIME_LIMIT, seed=None):
+        super().__init__(sign)
+        self._search = MonteCarloSearch(simulations, time_limit, seed=seed)
+
+    def search(self):
+        return self._search
+
+    def position(self):
+        """
+        Returns Position of bot's game, bot is the player to move
+        """
+        game = self.game()
+        return Position.from_array(game.board().board(), self.sign(),
+                                   game.win_count())
+
+    def choose_column(self, width):
+        """
+        Returns number of the most visited column
+        """
+        if self.game() is None:
+            return super().choose_column(width)
+        column = self._search.search(self.position())
+        if column is None:
+            return super().choose_column(width)
+        return column + 1
+
+
+class ParallelBot(Bot):
+    """
+    Class ParallelBot. Chooses column searching in many processes.
+    Contains attributes:
+
+    :param sign: bot's sign
+    :type sign: str
+
+    :param search: parallel search engine, see ParallelSearch
+        for its options
+    :type search: ParallelSearch
+
+    Worker processes are shut down by close(), at the end of with block,
+    or when the bot is garbage collected
+    """
+    def __init__(self, sign: str, workers=None, mode='root',
+                 time_limit=BOT_TIME_LIMIT, **options):
+        super().__init__(sign)
+        self._search = ParallelSearch(workers, mode, time_limit, **options)
+
+    def search(self):
+        return self._search
+
+    def close(self):
+        """
+        Shuts the worker processes down
+        """
+        self._search.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def position(self):
+        """
+        Returns Position of bot's game, bot is the player to move
+        """
+        game = self.game()
+        return Position.from_array(game.board().board(), self.sign(),
+                                   game.win_count())
+
+    def choose_column(self, width):
+        """
+        Returns number of the best column found by worker processes
         """
-        return randint(1, width)
+        if self.game() is None:
+            return super().choose_column(width)
+        column = self._search.search(self.position())
+        if column is None:
+            return super().choose_column(width)
+        return column + 1
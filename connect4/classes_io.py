@@ -1,43 +1,85 @@
 from .game import Game
 from .player import Player
-from .bot import Bot
-from .score import Score
+from .bot import Bot, SearchBot
+from .score import Score, PlayerStats
+from .config import JSON_CHUNK_SIZE
 import json
+import struct
 import numpy as np
 from .errors import InvalidDataError
 
 
+def write_game_data(game, id=None):
+    """
+    Function creates ready-to-write, as a json, data of one game
+    Uses id of the game if id is not given
+    """
+    if id is None:
+        id = game.id()
+    player1_name = game.players()[0].name()
+    player1_sign = game.players()[0].sign()
+    player1_is_bot = isinstance(game.players()[0], Bot)
+    player2_name = game.players()[1].name()
+    player2_sign = game.players()[1].sign()
+    player2_is_bot = isinstance(game.players()[1], Bot)
+    current_player = game.current_player().name()
+    board = game.board().board().tolist()
+    game_data = {
+        'id': id,
+        'player1': {
+            'name': player1_name,
+            'sign': player1_sign,
+            'is_bot': player1_is_bot,
+        },
+        'player2': {
+            'name': player2_name,
+            'sign': player2_sign,
+            'is_bot': player2_is_bot,
+        },
+        'current_player': current_player,
+        'board': board
+    }
+    return game_data
+
+
 def write_game(games, data):
     """
     Function creates ready-to-write, as a json, games list
+    Games without id get ids following the greatest id
     """
-    id = 0
+    ids = [game.id() for game in games if game.id() is not None]
+    next_id = max(ids, default=-1) + 1
     for game in games:
-        player1_name = game.players()[0].name()
-        player1_sign = game.players()[0].sign()
-        player1_is_bot = isinstance(game.players()[0], Bot)
-        player2_name = game.players()[1].name()
-        player2_sign = game.players()[1].sign()
-        player2_is_bot = isinstance(game.players()[1], Bot)
-        current_player = game.current_player().name()
-        board = game.board().board().tolist()
-        game_data = {
-            'id': id,
-            'player1': {
-                'name': player1_name,
-                'sign': player1_sign,
-                'is_bot': player1_is_bot,
-            },
-            'player2': {
-                'name': player2_name,
-                'sign': player2_sign,
-                'is_bot': player2_is_bot,
-            },
-            'current_player': current_player,
-            'board': board
-        }
-        data.append(game_data)
-        id += 1
+        id = game.id()
+        if id is None:
+            id = next_id
+            next_id += 1
+        data.append(write_game_data(game, id))
+    return data
+
+
+def write_score_data(score):
+    """
+    Function creates ready-to-write, as a json, data of one score
+    """
+    score_data = {
+        'player_name': score.player_name(),
+        'moves': score.moves()
+    }
+    return score_data
+
+
+def write_player_stats(stats, data):
+    """
+    Function creates ready-to-write, as a json, players' statistics list
+    """
+    for player_stats in stats:
+        data.append({
+            'name': player_stats.name(),
+            'wins': player_stats.wins(),
+            'best': player_stats.best(),
+            'total_moves': player_stats.total_moves()
+        })
     return data
 
 
@@ -46,13 +88,7 @@ def write_highscores(highscores, data):
     Function creates ready-to-write, as a json, highscores list
     """
     for score in highscores:
-        player_name = score.player_name()
-        moves = score.moves()
-        score_data = {
-            'player_name': player_name,
-            'moves': moves
-        }
-        data.append(score_data)
+        data.append(write_score_data(score))
     return data
 
 
@@ -65,6 +101,229 @@ def write_to_json(data_to_write, function, file_handle):
     json.dump(data, file_handle, indent=4)
 
 
+def json_array_item(item):
+    """
+    Function returns text of one item of json array, indented the same
+    way as json.dump(..., indent=4) indents items of a list
+    """
+    text = json.dumps(item, indent=4)
+    return '    ' + text.replace('\n', '\n    ')
+
+
+def stream_to_json(items, function, file_handle):
+    """
+    Function writes items to file handle as json array one by one,
+    converting every item with given function (e.g. write_game_data),
+    so the whole array is never kept in memory. Written text is the same
+    as written by write_to_json
+    Returns count of written items
+    """
+    count = 0
+    for item in items:
+        file_handle.write(',\n' if count else '[\n')
+        file_handle.write(json_array_item(function(item)))
+        count += 1
+    file_handle.write('\n]' if count else '[]')
+    return count
+
+
+BINARY_MAGIC = b'C4G1'
+BINARY_HEADER = struct.Struct('<4sII')
+BINARY_RECORD = np.dtype([('id', '<i4'), ('width', 'u1'), ('height', 'u1'),
+                          ('flags', 'u1'), ('texts', '<u2', 4)])
+BOT_FLAGS = (1, 2)
+SECOND_CURRENT_FLAG = 4
+EMPTY_SIGN = ' '
+
+
+def _mask_size(width, height):
+    return (width * height + 7) // 8
+
+
+def pack_games_data(data):
+    """
+    Function packs data of games, as made by write_game, to bytes:
+    header, table of players' names and signs, fixed size record
+    of every game with id, board's size, flags and indexes of its texts,
+    then two bitmasks of cells taken by first and second player
+    of every game
+    Returns bytes
+    """
+    texts = {}
+    records = np.zeros(len(data), BINARY_RECORD)
+    boards = []
+    for number, item in enumerate(data):
+        try:
+            players = (item['player1'], item['player2'])
+            names = [player['name'] for player in players]
+            signs = [player['sign'] for player in players]
+            flags = 0
+            for player, flag in zip(players, BOT_FLAGS):
+                if player['is_bot']:
+                    flags |= flag
+            if item['current_player'] not in names:
+                raise InvalidDataError('Unknown current player')
+            if item['current_player'] != names[0]:
+                flags |= SECOND_CURRENT_FLAG
+            board = np.array(item['board'])
+            height, width = board.shape
+            known = (board == EMPTY_SIGN) | np.isin(board, signs)
+            if not known.all():
+                raise InvalidDataError('Board contains unknown sign')
+            indexes = [texts.setdefault(text, len(texts))
+                       for text in (names[0], signs[0], names[1], signs[1])]
+            records[number] = (item['id'], width, height, flags, indexes)
+            for sign in signs:
+                cells = (board == sign).ravel()
+                boards.append(np.packbits(cells, bitorder='little').tobytes())
+        except InvalidDataError:
+            raise
+        except Exception as e:
+            raise InvalidDataError from e
+    parts = [BINARY_HEADER.pack(BINARY_MAGIC, len(data), len(texts))]
+    for text in texts:
+        encoded = text.encode()
+        if len(encoded) > 255:
+            raise InvalidDataError('Text is too long')
+        parts.append(bytes([len(encoded)]) + encoded)
+    parts.append(records.tobytes())
+    parts.extend(boards)
+    return b''.join(parts)
+
+
+def _unpack_boards(buffer, offset, records, signs):
+    """
+    Function unpacks bitmasks of boards of given records
+    Returns list of boards as NumPy arrays of signs
+    """
+    shapes = set(zip(records['width'].tolist(), records['height'].tolist()))
+    if len(shapes) == 1:
+        width, height = shapes.pop()
+        size = _mask_size(width, height)
+        masks = np.frombuffer(buffer, np.uint8, len(records) * 2 * size,
+                              offset).reshape(len(records), 2, size)
+        cells = np.unpackbits(masks, axis=2, count=width * height,
+                              bitorder='little').astype(bool)
+        boards = np.where(cells[:, 0], signs[:, 0:1],
+                          np.where(cells[:, 1], signs[:, 1:2], EMPTY_SIGN))
+        return list(boards.reshape(len(records), height, width))
+    boards = []
+    for number, record in enumerate(records):
+        width, height = int(record['width']), int(record['height'])
+        size = _mask_size(width, height)
+        masks = np.frombuffer(buffer, np.uint8, 2 * size, offset)
+        offset += 2 * size
+        cells = np.unpackbits(masks.reshape(2, size), axis=1,
+                              count=width * height,
+                              bitorder='little').astype(bool)
+        board = np.where(cells[0], signs[number, 0],
+                         np.where(cells[1], signs[number, 1], EMPTY_SIGN))
+        boards.append(board.reshape(height, width))
+    return boards
+
+
+def unpack_games_data(buffer):
+    """
+    Function unpacks games packed by pack_games_data
+    Returns list of games' data in the same format as read from json,
+    except boards, which are NumPy arrays instead of nested lists
+    """
+    try:
+        magic, count, text_count = BINARY_HEADER.unpack_from(buffer)
+        if magic != BINARY_MAGIC:
+            raise InvalidDataError('Not a binary games file')
+        offset = BINARY_HEADER.size
+        texts = []
+        for _ in range(text_count):
+            end = offset + 1 + buffer[offset]
+            texts.append(bytes(buffer[offset + 1:end]).decode())
+            offset = end
+        records = np.frombuffer(buffer, BINARY_RECORD, count, offset)
+        offset += count * BINARY_RECORD.itemsize
+        sizes = [_mask_size(width, height) for width, height
+                 in zip(records['width'].tolist(), records['height'].tolist())]
+        if offset + 2 * sum(sizes) != len(buffer):
+            raise InvalidDataError('Invalid size of binary games file')
+        texts = np.array(texts, dtype=object)
+        strings = texts[records['texts']] if count else texts.reshape(0, 4)
+        signs = strings[:, 1::2].astype(str)
+        boards = _unpack_boards(buffer, offset, records, signs)
+    except InvalidDataError:
+        raise
+    except Exception as e:
+        raise InvalidDataError from e
+    data = []
+    for record, (name1, sign1, name2, sign2), board in zip(
+            records.tolist(), strings.tolist(), boards):
+        id, _, _, flags, _ = record
+        data.append({
+            'id': id,
+            'player1': {
+                'name': name1,
+                'sign': sign1,
+                'is_bot': bool(flags & BOT_FLAGS[0]),
+            },
+            'player2': {
+                'name': name2,
+                'sign': sign2,
+                'is_bot': bool(flags & BOT_FLAGS[1]),
+            },
+            'current_player': name2 if flags & SECOND_CURRENT_FLAG else name1,
+            'board': board
+        })
+    return data
+
+
+def write_to_binary(data_to_write, function, file_handle):
+    """
+    Function writes given games to binary file handle in compact format
+    """
+    data = []
+    data = function(data_to_write, data)
+    file_handle.write(pack_games_data(data))
+
+
+def read_from_binary(function, file_handle):
+    """
+    Uses given read function to read games from binary file handle
+    """
+    data = unpack_games_data(file_handle.read())
+    return function(data)
+
+
+def read_game_data(item):
+    """
+    Function reads one game from given data
+    Returns Game object
+    """
+    try:
+        id = item['id']
+        player1_name = item['player1']['name']
+        player1_sign = item['player1']['sign']
+        player1_is_bot = item['player1']['is_bot']
+        player2_name = item['player2']['name']
+        player2_sign = item['player2']['sign']
+        player2_is_bot = item['player2']['is_bot']
+        current_player_name = item['current_player']
+        board = item['board']
+        if player1_is_bot:
+            player1 = SearchBot(player1_sign)
+        else:
+            player1 = Player(player1_name, player1_sign)
+        if player2_is_bot:
+            player2 = SearchBot(player2_sign)
+        else:
+            player2 = Player(player2_name, player2_sign)
+        array = np.array(board)
+        game = Game([player1, player2], array)
+        current_player = game.get_player_by_name(current_player_name)
+        game._current_player = current_player
+        game._id = id
+    except Exception as e:
+        raise InvalidDataError from e
+    return game
+
+
 def read_games(data):
     """
     Function reads games from given data
@@ -72,32 +331,7 @@ def read_games(data):
     """
     games = []
     for item in data:
-        try:
-            id = item['id']
-            player1_name = item['player1']['name']
-            player1_sign = item['player1']['sign']
-            player1_is_bot = item['player1']['is_bot']
-            player2_name = item['player2']['name']
-            player2_sign = item['player2']['sign']
-            player2_is_bot = item['player2']['is_bot']
-            current_player_name = item['current_player']
-            board = item['board']
-            if player1_is_bot:
-                player1 = Bot(player1_sign)
-            else:
-                player1 = Player(player1_name, player1_sign)
-            if player2_is_bot:
-                player2 = Bot(player2_sign)
-            else:
-                player2 = Player(player2_name, player2_sign)
-            array = np.array(board)
-            game = Game([player1, player2], array)
-            current_player = game.get_player_by_name(current_player_name)
-            game._current_player = current_player
-            game._id = id
-        except Exception as e:
-            raise InvalidDataError from e
-        games.append(game)
+        games.append(read_game_data(item))
     return games
 
 
@@ -108,19 +342,114 @@ def read_highscores(data):
     """
     highscores = []
     for item in data:
-        try:
-            player_name = item['player_name']
-            moves = item['moves']
-            score = Score(player_name, moves)
-        except Exception as e:
-            raise InvalidDataError from e
-        highscores.append(score)
+        highscores.append(read_score_data(item))
     return highscores
 
 
+def read_player_stats(data):
+    """
+    Function reads players' statistics from given data
+    Returns dict of PlayerStats objects mapped by players' names
+    """
+    stats = {}
+    try:
+        for item in data:
+            name = item['name']
+            stats[name] = PlayerStats(name, item['wins'], item['best'],
+                                      item['total_moves'])
+    except Exception as e:
+        raise InvalidDataError from e
+    return stats
+
+
+def read_score_data(item):
+    """
+    Function reads one score from given data
+    Returns Score object
+    """
+    try:
+        player_name = item['player_name']
+        moves = item['moves']
+        score = Score(player_name, moves)
+    except Exception as e:
+        raise InvalidDataError from e
+    return score
+
+
 def read_from_json(function, file_handle):
     """
     Uses given read function to read json data from file handle
     """
     data = json.load(file_handle)
     return function(data)
+
+
+def iter_json_array(file_handle, chunk_size=JSON_CHUNK_SIZE):
+    """
+    Function parses json array from file handle in chunks
+    Yields items of the array one by one, so only one item and one
+    chunk of text are kept in memory
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    end_of_file = False
+    state = 'start'
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer) and end_of_file:
+            if state == 'end':
+                return
+            raise InvalidDataError('Unexpected end of json array')
+        if position < len(buffer):
+            char = buffer[position]
+            if state == 'start':
+                if char != '[':
+                    raise InvalidDataError('Json data is not an array')
+                position += 1
+                state = 'first'
+                continue
+            if state == 'end':
+                raise InvalidDataError('Data after end of json array')
+            if state in ('first', 'next') and char == ']':
+                position += 1
+                state = 'end'
+                continue
+            if state == 'next':
+                if char != ',':
+                    raise InvalidDataError('Expected comma in json array')
+                position += 1
+                state = 'item'
+                continue
+            try:
+                item, item_end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if end_of_file:
+                    raise InvalidDataError from e
+                item_end = len(buffer)
+            following = item_end
+            while following < len(buffer) and buffer[following].isspace():
+                following += 1
+            # item is complete only when followed by comma or bracket,
+            # a number at the end of the buffer may continue in next chunk
+            if end_of_file or (following < len(buffer)
+                               and buffer[following] in ',]'):
+                position = item_end
+                state = 'next'
+                yield item
+                continue
+        chunk = file_handle.read(chunk_size)
+        end_of_file = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_from_json(function, file_handle, chunk_size=JSON_CHUNK_SIZE):
+    """
+    Uses given function reading one item (e.g. read_game_data
+    or read_score_data) to read json array from file handle
+    Yields read objects one by one
+    """
+    for item in iter_json_array(file_handle, chunk_size):
+        yield function(item)
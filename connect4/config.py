@@ -1,3 +1,18 @@
 WIDTH = 7
 HEIGHT = 6
 WIN_COUNT = 4
+BOT_TIME_LIMIT = 1.0
+TABLE_MEMORY = 16 * 1024 * 1024
+BOOK_DEPTH = 4
+BOOK_NODE_LIMIT = 20000
+JOURNAL_COMPACT_RATIO = 0.5
+JOURNAL_COMPACT_MINIMUM = 64
+JSON_CHUNK_SIZE = 64 * 1024
+HIGHSCORES_LIMIT = 100
+WRITE_BEHIND_INTERVAL = 0.5
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 4040
+SERVER_TABLE_MEMORY = 1024 * 1024
+SCHEDULER_QUEUE_SIZE = 64
+SCHEDULER_DEADLINE = 5.0
+SERVER_SCHEDULER = 'process'
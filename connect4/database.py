@@ -1,22 +1,114 @@
 from .game import Game
-from .score import Score
+from .score import Score, PlayerStats
 from .errors import (
     DatabasePathIsDirectory,
     DatabasePathNotFound,
     DatabasePermissionError,
-    FileIsEmptyError
+    FileIsEmptyError,
+    InvalidDataError
 )
-from .classes_io import (write_game, write_highscores, write_to_json,
-                         read_games, read_highscores, read_from_json)
+from .classes_io import (write_game, write_game_data, write_highscores,
+                         write_to_json, write_to_binary, read_games,
+                         read_game_data, read_highscores, read_from_json,
+                         read_from_binary, json_array_item, write_score_data,
+                         write_player_stats, read_player_stats)
+from .config import HIGHSCORES_LIMIT, WRITE_BEHIND_INTERVAL
+from .file_lock import FileLock
+from contextlib import contextmanager
+import heapq
+import json
+import os
+import secrets
+import threading
+
+
+def _sync_directory(path):
+    """
+    Flushes directory entry of given file to disk, where it is possible
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        descriptor = os.open(os.path.dirname(os.path.abspath(path)),
+                             os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def _create_temporary(path):
+    """
+    Creates empty file of unique name next to given path, with
+    permissions of the file of given path, or permissions of a new file
+    (limited by umask) if there is no such file
+    Returns tuple of descriptor opened for reading and writing
+    and path of the created file
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        temporary_path = os.path.join(directory,
+                                      f'{name}.{secrets.token_hex(4)}.tmp')
+        try:
+            descriptor = os.open(temporary_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        os.chmod(temporary_path, os.stat(path).st_mode & 0o7777)
+    except FileNotFoundError:
+        pass
+    except BaseException:
+        os.close(descriptor)
+        os.remove(temporary_path)
+        raise
+    return descriptor, temporary_path
+
+
+@contextmanager
+def atomic_open(path, mode='w'):
+    """
+    Opens temporary file of unique name next to given path for writing.
+    When writing ends without error, the file is flushed to disk
+    and renamed to the path, so the path always holds either old or new
+    complete data
+    """
+    descriptor, temporary_path = _create_temporary(path)
+    try:
+        file_handle = os.fdopen(descriptor, mode)
+    except BaseException:
+        os.close(descriptor)
+        os.remove(temporary_path)
+        raise
+    try:
+        with file_handle:
+            yield file_handle
+            file_handle.flush()
+            os.fsync(file_handle.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+    _sync_directory(path)
 
 
 class DatabaseObject:
+    _file_mode = ''
+
     def save_to_file(self, path, data):
         """
-        Writes data from database to file
+        Writes data from database to file atomically
         """
         try:
-            with open(path, 'w') as file_handle:
+            with atomic_open(path, 'w' + self._file_mode) as file_handle:
                 self._write(data, file_handle)
         except FileNotFoundError:
             raise DatabasePathNotFound("Invalid path")
@@ -25,17 +117,41 @@ class DatabaseObject:
         except IsADirectoryError:
             raise DatabasePathIsDirectory("This path is a directory")
 
+    def update_file(self, path, function, timeout=None):
+        """
+        Reads database from file, calls function with the database
+        and saves it, holding lock of the file, so no change saved
+        meanwhile by another process is lost. Missing or empty file
+        is treated as empty database
+        Returns value returned by function
+        """
+        with FileLock(path, timeout):
+            try:
+                self.read_from_file(path)
+            except (DatabasePathNotFound, FileIsEmptyError):
+                self._clear(path)
+            result = function(self)
+            self.save_to_file(path)
+        return result
+
+    def _clear(self, path):
+        """
+        Empties database before missing or empty file of given path
+        is updated, bringing back state of database created
+        without arguments
+        """
+        self.__init__()
+
     def read_from_file(self, path):
         """
         Reads data from file
         """
         try:
-            with open(path, 'r') as file_handle:
-                file_handle.seek(0)
+            with open(path, 'r' + self._file_mode) as file_handle:
                 first_char = file_handle.read(1)
                 if not first_char:
                     raise FileIsEmptyError
-            with open(path, 'r') as file_handle:
+                file_handle.seek(0)
                 return self._read(file_handle)
 
         except FileNotFoundError:
@@ -46,31 +162,65 @@ class DatabaseObject:
             raise DatabasePathIsDirectory("This path is a directory")
 
 
+def next_id_path(path):
+    """
+    Returns path of file keeping next id of games of given games file
+    """
+    return f'{path}.next_id'
+
+
 class Database(DatabaseObject):
     """
-    Class Database. Contains attributes:
+    Class Database. Next id is saved next to the games file, so ids
+    of removed games are not given again after the file is read.
+    Contains attributes:
 
-    :param games: list of games in database
-    :type games: list
+    :param games: games in database mapped by their ids
+    :type games: dict
+
+    :param next_id: id given to the next added game without id,
+        greater than every id used so far
+    :type next_id: int
     """
     def __init__(self, games=None):
-        self._games = games if games else []
+        self._games = {}
+        self._next_id = 0
+        for game in games or []:
+            self.add_game(game)
 
     def games(self):
-        return self._games
+        return list(self._games.values())
+
+    def next_id(self):
+        return self._next_id
+
+    def _id_of(self, item):
+        return item.id()
+
+    def _set_games(self, items):
+        self._games = {}
+        self._next_id = 0
+        for item in items:
+            id = self._id_of(item)
+            self._games[id] = item
+            self._next_id = max(self._next_id, id + 1)
 
     def add_game(self, game: Game):
         """
-        Adds game to database
+        Adds game to database, or overwrites it if it has an id
+        Sets id of new game
         """
-        self.games().append(game)
+        if game.id() is None:
+            game._id = self._next_id
+        self._games[game.id()] = game
+        self._next_id = max(self._next_id, game.id() + 1)
 
     def remove_game(self, game):
         """
         Removes game from database
         """
-        if game in self.games():
-            self.games().remove(game)
+        if game and game.id() in self._games:
+            del self._games[game.id()]
             return True
         else:
             raise ValueError('Cannot find game in games list')
@@ -80,10 +230,7 @@ class Database(DatabaseObject):
         returns game of given id
         returns False if given id is invalid
         """
-        for game in self.games():
-            if game.id() == id:
-                return game
-        return False
+        return self._games.get(id, False)
 
     def print_saved_games(self):
         """
@@ -103,47 +250,575 @@ class Database(DatabaseObject):
     def _write(self, data, file_handle):
         write_to_json(data, write_game, file_handle)
 
+    def _save_next_id(self, path):
+        with atomic_open(next_id_path(path), 'w') as file_handle:
+            json.dump(self._next_id, file_handle)
+
+    def _read_next_id(self, path):
+        """
+        Raises next id to the one saved with games file, if it is greater
+        """
+        try:
+            with open(next_id_path(path), 'r') as file_handle:
+                next_id = int(json.load(file_handle))
+        except (OSError, ValueError, TypeError):
+            return
+        self._next_id = max(self._next_id, next_id)
+
+    def _clear(self, path):
+        self._set_games([])
+        self._read_next_id(path)
+
     def save_to_file(self, path):
         super().save_to_file(path, self.games())
+        self._save_next_id(path)
 
     def read_from_file(self, path):
-        self._games = super().read_from_file(path)
+        self._set_games(super().read_from_file(path))
+        self._read_next_id(path)
+
+
+class BinaryDatabase(Database):
+    """
+    Class BinaryDatabase. Database which saves games in compact binary
+    format of classes_io instead of json
+    """
+    _file_mode = 'b'
+
+    def _read(self, file_handle):
+        return read_from_binary(read_games, file_handle)
+
+    def _write(self, data, file_handle):
+        write_to_binary(data, write_game, file_handle)
+
+
+def read_headers(data):
+    """
+    Function checks that every game in given data has id and players' names
+    Returns data unchanged
+    """
+    for item in data:
+        try:
+            item['id']
+            item['player1']['name']
+            item['player2']['name']
+        except Exception as e:
+            raise InvalidDataError from e
+    return data
+
+
+def index_path(path):
+    """
+    Returns path of index file of given games file
+    """
+    return f'{path}.index'
+
+
+class LazyDatabase(Database):
+    """
+    Class LazyDatabase. Database which creates Game object only when
+    the game is accessed. Saving writes, next to the games file,
+    an index with id, players' names and position in file of every
+    game. When the index matches the file, reading parses only the index
+    and a game is parsed from its own part of the file.
+    Contains attributes:
+
+    :param games: games in database mapped by their ids, games which
+        were not accessed yet are kept as raw data or as index entries
+    :type games: dict
+
+    :param path: path of the file games were read from
+    :type path: str
+
+    :param file: games file opened when the index was read, kept open
+        so games are read from the same file even if the path
+        is replaced meanwhile, None if no game is kept as index entry
+    :type file: file
+    """
+    def __init__(self, games=None):
+        super().__init__(games)
+        self._path = None
+        self._file = None
+
+    def _id_of(self, item):
+        if isinstance(item, tuple):
+            return item[0]
+        if isinstance(item, dict):
+            return item['id']
+        return item.id()
+
+    def _materialize(self, id):
+        item = self._games[id]
+        if isinstance(item, tuple):
+            item = self._read_record(item)
+        if isinstance(item, dict):
+            item = read_game_data(item)
+            self._games[id] = item
+        return item
+
+    def _read_record(self, entry):
+        _, _, _, offset, length = entry
+        try:
+            self._file.seek(offset)
+            return json.loads(self._file.read(length))
+        except (OSError, ValueError) as e:
+            raise InvalidDataError from e
+
+    def close(self):
+        """
+        Closes games file kept open for games not accessed yet
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def games(self):
+        return [self._materialize(id) for id in self._games]
+
+    def headers(self):
+        """
+        Returns list of tuples of id and players' names of every game
+        """
+        headers = []
+        for item in self._games.values():
+            if isinstance(item, tuple):
+                headers.append(item[:3])
+            elif isinstance(item, dict):
+                headers.append((item['id'], item['player1']['name'],
+                                item['player2']['name']))
+            else:
+                players = item.players()
+                headers.append((item.id(), players[0].name(),
+                                players[1].name()))
+        return headers
+
+    def get_game_by_id(self, id):
+        """
+        returns game of given id
+        returns False if given id is invalid
+        """
+        if id not in self._games:
+            return False
+        return self._materialize(id)
+
+    def print_saved_games(self):
+        """
+        Prints games in database
+        """
+        print('Saved games:')
+        for id, player1_name, player2_name in self.headers():
+            print(f'{id} : {player1_name} vs {player2_name}')
+        return
+
+    def _read(self, file_handle):
+        return read_from_json(read_headers, file_handle)
+
+    def _read_index(self, path, source):
+        """
+        Returns index entries of games file opened as source
+        Returns None if there is no index or it does not match the file
+        """
+        try:
+            with open(index_path(path), 'r') as file_handle:
+                index = json.load(file_handle)
+            stat = os.fstat(source.fileno())
+            if (index['size'], index['mtime_ns']) != (stat.st_size,
+                                                      stat.st_mtime_ns):
+                return None
+            return [tuple(entry) for entry in index['games']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def read_from_file(self, path):
+        self.close()
+        try:
+            source = open(path, 'rb')
+        except OSError:
+            source = None
+        entries = None
+        if source is not None:
+            entries = self._read_index(path, source)
+        if entries is None:
+            if source is not None:
+                source.close()
+            super().read_from_file(path)
+        else:
+            self._set_games(entries)
+            self._read_next_id(path)
+            self._file = source
+        self._path = path
+
+    def _record_text(self, item, source):
+        """
+        Returns text of one game, indented like json.dump(..., indent=4)
+        writes items of a list. Games kept as index entries are copied
+        from source file without parsing
+        """
+        if isinstance(item, tuple):
+            source.seek(item[3])
+            return source.read(item[4]).decode()
+        if not isinstance(item, dict):
+            item = write_game_data(item)
+        return json_array_item(item)
+
+    def save_to_file(self, path):
+        """
+        Writes games to file without parsing games which were not
+        accessed and writes index of the file
+        """
+        items = list(self._games.values())
+        headers = self.headers()
+        entries = []
+        reader = None
+        try:
+            try:
+                with atomic_open(path, 'wb') as file_handle:
+                    file_handle.write(b'[' if items else b'[]')
+                    for number, item in enumerate(items):
+                        file_handle.write(b',\n' if number else b'\n')
+                        text = self._record_text(item, self._file).encode()
+                        entries.append(headers[number]
+                                       + (file_handle.tell(), len(text)))
+                        file_handle.write(text)
+                    if items:
+                        file_handle.write(b'\n]')
+                    reader = os.fdopen(os.dup(file_handle.fileno()), 'rb')
+            except BaseException:
+                if reader is not None:
+                    reader.close()
+                raise
+        except FileNotFoundError:
+            raise DatabasePathNotFound("Invalid path")
+        except PermissionError:
+            raise DatabasePermissionError("No permission to open database")
+        except IsADirectoryError:
+            raise DatabasePathIsDirectory("This path is a directory")
+        self.close()
+        self._file = reader
+        self._games = {entry[0]: item if isinstance(item, Game) else entry
+                       for item, entry in zip(items, entries)}
+        self._path = path
+        stat = os.fstat(reader.fileno())
+        index = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                 'games': entries}
+        with atomic_open(index_path(path)) as file_handle:
+            json.dump(index, file_handle)
+        self._save_next_id(path)
+
+
+def stats_path(path):
+    """
+    Returns path of players' statistics file of given highscores file
+    """
+    base, extension = os.path.splitext(path)
+    return f'{base}_stats{extension or ".json"}'
+
+
+class PlayerStatsDatabase(DatabaseObject):
+    """
+    Class PlayerStatsDatabase. Contains attributes:
+
+    :param stats: players' statistics mapped by players' names
+    :type stats: dict
+    """
+    def __init__(self, stats=None):
+        self._stats = stats if stats else {}
+
+    def stats(self):
+        return self._stats
+
+    def player_stats(self, name):
+        """
+        Returns statistics of player of given name
+        Returns None if player has no scores
+        """
+        return self._stats.get(name)
+
+    def add_score(self, score: Score):
+        """
+        Adds score to statistics of its player
+        """
+        name = score.player_name()
+        if name not in self._stats:
+            self._stats[name] = PlayerStats(name)
+        self._stats[name].add(score.moves())
+
+    def save_to_file(self, path):
+        super().save_to_file(path, list(self._stats.values()))
+
+    def read_from_file(self, path):
+        self._stats = super().read_from_file(path)
+
+    def _read(self, file_handle):
+        return read_from_json(read_player_stats, file_handle)
+
+    def _write(self, data, file_handle):
+        write_to_json(data, write_player_stats, file_handle)
 
 
 class HighscoresDatabase(DatabaseObject):
     """
-    Class HighscoresDatabase. Contains attributes:
+    Class HighscoresDatabase. Keeps only the best scores in a heap,
+    with the worst kept score on its top, so adding a score costs
+    O(log limit). Contains attributes:
 
-    :param scores: list of players' scores
+    :param scores: heap of tuples of negated moves, negated number
+        of added score and the score
     :type scores: list
+
+    :param sorted: scores from the best one, None if a score has been
+        added since they were sorted
+    :type sorted: list
+
+    :param limit: count of kept scores, None keeps all of them.
+        Reading a file with more scores drops the worst ones
+    :type limit: int
+
+    :param archive: path of file, to which scores dropped from
+        highscores are appended as json lines when saving,
+        None drops them
+    :type archive: str
+
+    :param stats: statistics of every added score, also dropped ones,
+        saved next to the scores
+    :type stats: PlayerStatsDatabase
     """
-    def __init__(self, scores=None):
-        self._scores = scores if scores else []
+    def __init__(self, scores=None, limit=HIGHSCORES_LIMIT, archive=None):
+        self._limit = limit
+        self._archive = archive
+        self._scores = []
+        self._sorted = None
+        self._dropped = []
+        self._count = 0
+        self._stats = PlayerStatsDatabase()
+        for score in scores or []:
+            self.add_score(score)
+
+    def limit(self):
+        return self._limit
+
+    def stats(self):
+        return self._stats
+
+    def player_stats(self, name):
+        """
+        Returns statistics of player of given name
+        Returns None if player has no scores
+        """
+        return self._stats.player_stats(name)
 
     def scores(self):
-        return self._scores
+        """
+        Returns list of scores from the best one, sorted once
+        until the next score is added
+        """
+        if self._sorted is None:
+            self.sort_scores()
+        return self._sorted
+
+    def dropped(self):
+        """
+        Returns scores dropped from highscores since the last save
+        """
+        return self._dropped
 
     def add_score(self, score: Score):
         """
-        Adds score to scores list
+        Adds score to highscores, dropping the worst score if there
+        are more scores than limit. Score with the same moves as a kept
+        one is worse than it
+        Returns True if score is kept
         """
-        self.scores().append(score)
+        self._stats.add_score(score)
+        return self._push(score)
+
+    def _entry(self, score):
+        entry = (-score.moves(), -self._count, score)
+        self._count += 1
+        self._sorted = None
+        return entry
+
+    def _push(self, score):
+        entry = self._entry(score)
+        if self._limit is None or len(self._scores) < self._limit:
+            heapq.heappush(self._scores, entry)
+            return True
+        if self._limit and entry[:2] > self._scores[0][:2]:
+            entry = heapq.heapreplace(self._scores, entry)
+            kept = True
+        else:
+            kept = False
+        self._dropped.append(entry[2])
+        return kept
 
     def sort_scores(self):
         """
-        Sorts scores
+        Sorts scores from the best one
         """
-        self._scores.sort(key=lambda score: score.moves())
+        self._sorted = [entry[2]
+                        for entry in sorted(self._scores, reverse=True)]
 
     def save_to_file(self, path):
-        self.sort_scores()
+        """
+        Writes scores to file and players' statistics next to it
+        """
         super().save_to_file(path, self.scores())
+        self.save_stats_to_file(path)
+        if self._archive is not None and self._dropped:
+            with open(self._archive, 'a') as file_handle:
+                for score in self._dropped:
+                    file_handle.write(json.dumps(write_score_data(score)))
+                    file_handle.write('\n')
+        self._dropped = []
+
+    def _clear(self, path):
+        """
+        Removes all scores, keeps players' statistics saved next to
+        given highscores file
+        """
+        self._scores = []
+        self._sorted = None
+        self._dropped = []
+        self._count = 0
+        self._stats = PlayerStatsDatabase()
+        try:
+            self._stats.read_from_file(stats_path(path))
+        except (DatabasePathNotFound, FileIsEmptyError):
+            pass
+
+    def save_stats_to_file(self, path):
+        """
+        Writes only players' statistics of given highscores file
+        """
+        self._stats.save_to_file(stats_path(path))
 
     def read_from_file(self, path):
-        self._scores = super().read_from_file(path)
+        """
+        Reads scores from file and players' statistics saved next to it,
+        statistics missing in older files are counted from the scores.
+        Scores over the limit are dropped, the worst first
+        """
+        scores = super().read_from_file(path)
+        self._clear(path)
+        if not self._stats.stats():
+            for score in scores:
+                self._stats.add_score(score)
+        self._scores = [self._entry(score) for score in scores]
+        heapq.heapify(self._scores)
+        while self._limit is not None and len(self._scores) > self._limit:
+            self._dropped.append(heapq.heappop(self._scores)[2])
 
     def _read(self, file_handle):
         return read_from_json(read_highscores, file_handle)
 
     def _write(self, data, file_handle):
         write_to_json(data, write_highscores, file_handle)
+
+
+def read_player_stats_from_file(path):
+    """
+    Reads only players' statistics of given highscores file,
+    without parsing the scores
+    Returns PlayerStatsDatabase object
+    """
+    stats = PlayerStatsDatabase()
+    stats.read_from_file(stats_path(path))
+    return stats
+
+
+class WriteBehind:
+    """
+    Class WriteBehind. Merges saves of a database requested within
+    the interval into one write, done by a timer thread.
+    Contains attributes:
+
+    :param database: database with save_to_file(path) method
+    :type database: DatabaseObject
+
+    :param path: path of database file
+    :type path: str
+
+    :param interval: seconds between a save request and the write
+    :type interval: float
+
+    :param writes: count of done writes
+    :type writes: int
+    """
+    def __init__(self, database, path, interval=WRITE_BEHIND_INTERVAL):
+        self._database = database
+        self._path = path
+        self._interval = interval
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._writes = 0
+        self._error = None
+
+    def database(self):
+        return self._database
+
+    def lock(self):
+        """
+        Returns lock held while database is written, changes of database
+        made from other threads should hold it too
+        """
+        return self._lock
+
+    def writes(self):
+        return self._writes
+
+    def pending(self):
+        return self._dirty
+
+    def save(self):
+        """
+        Requests save of database, writing it at most interval later
+        Raises error of the previous failed write, after the next write
+        is scheduled
+        """
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self._interval, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+    def _run(self):
+        try:
+            self.flush()
+        except Exception as e:
+            with self._lock:
+                self._error = e
+
+    def flush(self):
+        """
+        Writes requested save at once
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            try:
+                self._database.save_to_file(self._path)
+            except Exception:
+                self._dirty = True
+                raise
+            self._writes += 1
+
+    def close(self):
+        """
+        Writes requested save and stops the timer
+        """
+        self.flush()
@@ -0,0 +1,68 @@
+from .config import WIN_COUNT
+import numpy as np
+
+
+# Steps (row, column) between cells of every line type, in the order
+# Game checks them. Lines 'diag_right' (/) go up from their first cell.
+DIRECTIONS = {
+    'horizontal': (0, 1),
+    'vertical': (1, 0),
+    'diag_right': (-1, 1),
+    'diag_left': (1, 1),
+}
+
+
+def line_windows(mask, type, count=WIN_COUNT):
+    """
+    Returns boolean array which is True for every first cell of count
+    True cells of mask lying in one line of given type.
+    Uses count whole-array ANDs of shifted mask, no Python loops
+    over cells
+    """
+    row_step, column_step = DIRECTIONS[type]
+    height, width = mask.shape
+    rows = height - abs(row_step) * (count - 1)
+    columns = width - abs(column_step) * (count - 1)
+    if rows <= 0 or columns <= 0:
+        return np.zeros((max(rows, 0), max(columns, 0)), dtype=bool)
+    windows = np.ones((rows, columns), dtype=bool)
+    for index in range(count):
+        row = (count - 1) * (row_step < 0) + index * row_step
+        column = index * column_step
+        windows &= mask[row:row + rows, column:column + columns]
+    return windows
+
+
+def check_line(array, signs, type, count=WIN_COUNT):
+    """
+    Checks if there are count same signs next to each other
+    in lines of given type
+    Returns sign of the first such line, scanning the board row by row
+    (column by column for vertical lines)
+    Else returns False
+    """
+    codes = None
+    for index, sign in enumerate(signs):
+        windows = line_windows(array == sign, type, count)
+        if codes is None:
+            codes = np.zeros(windows.shape, dtype=np.int8)
+        codes[windows & (codes == 0)] = index + 1
+    if type == 'vertical':
+        codes = codes.transpose()
+    found = np.flatnonzero(codes)
+    if found.size == 0:
+        return False
+    return signs[codes.flat[found[0]] - 1]
+
+
+def winning_sign(array, signs, count=WIN_COUNT):
+    """
+    Checks all line types
+    Returns sign which has count signs next to each other
+    Else returns False
+    """
+    for type in DIRECTIONS:
+        sign = check_line(array, signs, type, count)
+        if sign:
+            return sign
+    return False
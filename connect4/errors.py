@@ -36,3 +36,19 @@ class ColumnIsFullError(Exception):
 
 class ColumnOutOfRangeError(Exception):
     pass
+
+
+class InvalidSignError(Exception):
+    pass
+
+
+class InvalidRequestError(Exception):
+    pass
+
+
+class SchedulerQueueFullError(Exception):
+    pass
+
+
+class MoveCancelledError(Exception):
+    pass
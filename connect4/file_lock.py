@@ -0,0 +1,98 @@
+from .errors import DatabasePathNotFound, DatabasePermissionError
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def lock_path(path):
+    """
+    Returns path of lock file of given database file
+    """
+    return f'{path}.lock'
+
+
+class FileLock:
+    """
+    Class FileLock. Exclusive lock of a database file shared by many
+    processes. Lock is taken on a separate lock file, because saving
+    replaces the database file itself. Can be used as context manager.
+    Contains attributes:
+
+    :param path: path of locked database file
+    :type path: str
+
+    :param timeout: seconds of waiting for the lock, None waits forever
+    :type timeout: float
+    """
+    def __init__(self, path, timeout=None):
+        self._path = path
+        self._timeout = timeout
+        self._descriptor = None
+
+    def path(self):
+        return self._path
+
+    def locked(self):
+        return self._descriptor is not None
+
+    def acquire(self):
+        """
+        Waits for and takes the lock
+        Raises TimeoutError if lock is not taken within timeout
+        """
+        try:
+            descriptor = os.open(lock_path(self._path),
+                                 os.O_RDWR | os.O_CREAT, 0o666)
+        except FileNotFoundError:
+            raise DatabasePathNotFound("Invalid path")
+        except PermissionError:
+            raise DatabasePermissionError("No permission to open database")
+        start = time.monotonic()
+        delay = 0.001
+        while True:
+            try:
+                self._lock(descriptor, self._timeout is None)
+                break
+            except OSError:
+                waited = time.monotonic() - start
+                if self._timeout is not None and waited >= self._timeout:
+                    os.close(descriptor)
+                    raise TimeoutError('Cannot lock database')
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        self._descriptor = descriptor
+
+    def _lock(self, descriptor, blocking):
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            fcntl.flock(descriptor, flags)
+        else:
+            msvcrt.locking(descriptor, msvcrt.LK_NBLCK, 1)
+
+    def release(self):
+        """
+        Releases the lock
+        """
+        if self._descriptor is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._descriptor, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._descriptor, 0, os.SEEK_SET)
+            msvcrt.locking(self._descriptor, msvcrt.LK_UNLCK, 1)
+        os.close(self._descriptor)
+        self._descriptor = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
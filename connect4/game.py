@@ -1,6 +1,8 @@
 from .board import Board
+from .bot import Bot
 from .config import WIN_COUNT, WIDTH, HEIGHT
 from .errors import InvalidPlayerCount
+from .detection import check_line, winning_sign
 import random
 import numpy as np
 
@@ -25,13 +27,24 @@ class Game:
 
     :param id: id of the game (only when game is being saved)
     :type id: int
+
+    :param win_count: count of signs in line needed to win
+    :type win_count: int
+
+    Instead of NumPy array, ready board object (e.g. BitBoard)
+    can be passed as board
     """
-    def __init__(self, players: list, array=None):
+    def __init__(self, players: list, array=None, board=None,
+                 win_count=WIN_COUNT):
         if len(players) == 2:
             self._players = players
         else:
             raise InvalidPlayerCount('Too many players')
-        if array is not None:
+        if board is not None:
+            self._board = board
+            self._height = board.height()
+            self._width = board.width()
+        elif array is not None:
             self._board = Board(array)
             self._height = self._board.height()
             self._width = self._board.width()
@@ -41,6 +54,10 @@ class Game:
             self._board = Board()
         self._current_player = None
         self._id = None
+        self._win_count = win_count
+        for player in players:
+            if isinstance(player, Bot):
+                player.set_game(self)
 
     def id(self):
         return self._id
@@ -51,9 +68,15 @@ class Game:
     def width(self):
         return self._width
 
+    def win_count(self):
+        return self._win_count
+
     def players(self):
         return self._players
 
+    def signs(self):
+        return [player.sign() for player in self.players()]
+
     def board(self):
         return self._board
 
@@ -97,47 +120,14 @@ class Game:
         else:
             self._current_player = self.players()[0]
 
-    def check_function(self, x_range_start, x_range_stop,
-                       y_range_start, y_range_stop, type):
-        """
-        General figure to check if there are WIN_COUNT signs next to each other
-        """
-        first_sign = self.players()[0].sign()
-        second_sign = self.players()[1].sign()
-        board = self.board().board()
-        for x in range(x_range_start, x_range_stop):
-            for y in range(y_range_start, y_range_stop):
-                signs_list = []
-                index = 0
-                for _ in range(WIN_COUNT):
-                    if type == 'horizontal':
-                        signs_list.append(board[x][y+index])
-                    if type == 'diag_right':
-                        signs_list.append(board[x-index][y+index])
-                    if type == 'diag_left':
-                        signs_list.append(board[x+index][y+index])
-                    index += 1
-                if len(set(signs_list)) == 1:
-                    if signs_list[0] == first_sign:
-                        return first_sign
-                    if signs_list[0] == second_sign:
-                        return second_sign
-        return False
-
     def check_horizontal(self):
         """
         Checks if there are WIN_COUNT signs next to each other horizontally
         Returns sign if there are
         Else returns False
         """
-        x_range_start = 0
-        x_range_stop = self.height()
-        y_range_stop = self.width()-WIN_COUNT+1
-        y_range_start = 0
-        type = 'horizontal'
-        winner = self.check_function(x_range_start, x_range_stop,
-                                     y_range_start, y_range_stop, type)
-        return winner
+        return check_line(self.board().board(), self.signs(),
+                          'horizontal', self.win_count())
 
     def check_vertical(self):
         """
@@ -145,16 +135,8 @@ class Game:
         Returns sign if there are
         Else returns False
         """
-        height = self._height
-        width = self._width
-        self._board._board = self.board().board().transpose()
-        self._width = height
-        self._height = width
-        winning = self.check_horizontal()
-        self._board._board = self.board().board().transpose()
-        self._width = width
-        self._height = height
-        return winning
+        return check_line(self.board().board(), self.signs(),
+                          'vertical', self.win_count())
 
     def check_diagonal_right(self):
         """
@@ -163,14 +145,8 @@ class Game:
         Returns sign if there are
         Else returns False
         """
-        x_range_start = WIN_COUNT-1
-        x_range_stop = self.height()
-        y_range_start = 0
-        y_range_stop = self.width()-WIN_COUNT+1
-        type = 'diag_right'
-        winner = self.check_function(x_range_start, x_range_stop,
-                                     y_range_start, y_range_stop, type)
-        return winner
+        return check_line(self.board().board(), self.signs(),
+                          'diag_right', self.win_count())
 
     def check_diagonal_left(self):
         """
@@ -179,37 +155,58 @@ class Game:
         Returns sign if there are
         Else returns False
         """
-        x_range_start = 0
-        x_range_stop = self.height()-WIN_COUNT+1
-        y_range_start = 0
-        y_range_stop = self.width()-WIN_COUNT+1
-        type = 'diag_left'
-        winner = self.check_function(x_range_start, x_range_stop,
-                                     y_range_start, y_range_stop, type)
-        return winner
+        return check_line(self.board().board(), self.signs(),
+                          'diag_left', self.win_count())
 
-    def check_winner(self):
+    def check_last_move(self):
+        """
+        Checks if the last inserted sign has WIN_COUNT signs next to each
+        other in any of four lines going through it
+        Returns sign if there are
+        Else returns False
+        """
+        board = self.board()
+        last_move = board.last_move()
+        if last_move is None:
+            return False
+        row, column = last_move
+        sign = board.sign_at(row, column)
+        if not self.get_player_by_sign(sign):
+            return False
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for direction in (1, -1):
+                x = row + row_step * direction
+                y = column + column_step * direction
+                while (count < self.win_count() and 0 <= x < self.height()
+                       and 0 <= y < self.width()
+                       and board.sign_at(x, y) == sign):
+                    count += 1
+                    x += row_step * direction
+                    y += column_step * direction
+            if count >= self.win_count():
+                return sign
+        return False
+
+    def check_winner(self, full=False):
         """
         Checks if there is a winner
         Returns a tuple of object Player and it's count of moves
         Returns False if there is no winner
-        """
-        hor = self.check_horizontal()
-        ver = self.check_vertical()
-        diag_right = self.check_diagonal_right()
-        diag_left = self.check_diagonal_left()
+        Checks only lines going through the last inserted sign, unless
+        full is True or the board does not know its last move
+        (e.g. board loaded from database)
+        """
+        if not full and self.board().last_move() is not None:
+            sign = self.check_last_move()
+            if not sign:
+                return False
+            count = int(np.count_nonzero(
+                np.char.count(self.board().board(), sign)))
+            return self.get_player_by_sign(sign), count
         board = self.board().board()
-        if hor:
-            count = np.count_nonzero(np.char.count(board, hor))
-            return self.get_player_by_sign(hor), count
-        elif ver:
-            count = np.count_nonzero(np.char.count(board, ver))
-            return self.get_player_by_sign(ver), count
-        elif diag_right:
-            count = np.count_nonzero(np.char.count(board, diag_right))
-            return self.get_player_by_sign(diag_right), count
-        elif diag_left:
-            count = np.count_nonzero(np.char.count(board, diag_left))
-            return self.get_player_by_sign(diag_left), count
-        else:
+        sign = winning_sign(board, self.signs(), self.win_count())
+        if not sign:
             return False
+        count = int(np.count_nonzero(np.char.count(board, sign)))
+        return self.get_player_by_sign(sign), count
@@ -0,0 +1,379 @@
+from .board import Board
+from .bitboard import BitBoard
+from .game import Game
+from .bot import Bot, SearchBot, MCTSBot, ParallelBot
+from .database import (DatabaseObject, Database, LazyDatabase,
+                       PlayerStatsDatabase, HighscoresDatabase)
+from .sqlite_database import SqliteDatabase
+from .journal_database import JournalDatabase
+from .scheduler import BotMoveScheduler
+from bisect import bisect_left
+import functools
+import inspect
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01,
+                   0.05, 0.1, 0.5, 1.0, 5.0)
+FORMATS = ('prometheus', 'json')
+BOARDS = (Board, BitBoard)
+GAMES = (Game,)
+BOTS = (Bot, SearchBot, MCTSBot, ParallelBot)
+DATABASES = (DatabaseObject, Database, LazyDatabase, PlayerStatsDatabase,
+             HighscoresDatabase)
+GAME_STORES = (SqliteDatabase, JournalDatabase)
+SCHEDULERS = (BotMoveScheduler,)
+
+
+class Counter:
+    """
+    Class Counter. Value which only grows.
+    Contains attributes:
+
+    :param name: name of the metric
+    :type name: str
+
+    :param help: description of the metric
+    :type help: str
+
+    :param value: current value
+    :type value: float
+    """
+    def __init__(self, name, help=''):
+        self._name = name
+        self._help = help
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def name(self):
+        return self._name
+
+    def help(self):
+        return self._help
+
+    def value(self):
+        return self._value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def snapshot(self):
+        return {'type': 'counter', 'help': self._help, 'value': self._value}
+
+    def prometheus(self):
+        return [f'{self._name} {self._value}']
+
+
+class Histogram:
+    """
+    Class Histogram. Counts observed values falling into buckets.
+    Contains attributes:
+
+    :param name: name of the metric
+    :type name: str
+
+    :param help: description of the metric
+    :type help: str
+
+    :param buckets: sorted upper bounds of buckets
+    :type buckets: tuple
+
+    :param counts: count of values of every bucket, the last one
+        counts values greater than all bounds
+    :type counts: list
+    """
+    def __init__(self, name, help='', buckets=LATENCY_BUCKETS):
+        self._name = name
+        self._help = help
+        self._buckets = tuple(buckets)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def name(self):
+        return self._name
+
+    def help(self):
+        return self._help
+
+    def count(self):
+        return self._count
+
+    def sum(self):
+        return self._sum
+
+    def observe(self, value):
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def cumulative(self):
+        """
+        Returns list of tuples of bucket's bound and count of values
+        not greater than it, the last bound is '+Inf'
+        """
+        bounds = [str(bound) for bound in self._buckets] + ['+Inf']
+        total = 0
+        buckets = []
+        for bound, count in zip(bounds, self._counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def snapshot(self):
+        return {'type': 'histogram', 'help': self._help,
+                'count': self._count, 'sum': self._sum,
+                'buckets': dict(self.cumulative())}
+
+    def prometheus(self):
+        lines = [f'{self._name}_bucket{{le="{bound}"}} {count}'
+                 for bound, count in self.cumulative()]
+        lines.append(f'{self._name}_sum {self._sum}')
+        lines.append(f'{self._name}_count {self._count}')
+        return lines
+
+
+class Registry:
+    """
+    Class Registry. Keeps metrics by their names.
+    Contains attributes:
+
+    :param metrics: metrics mapped by names
+    :type metrics: dict
+    """
+    def __init__(self):
+        self._metrics = {}
+
+    def metrics(self):
+        return self._metrics
+
+    def counter(self, name, help=''):
+        """
+        Returns counter of given name, creating it if there is none
+        """
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, help)
+        return self._metrics[name]
+
+    def histogram(self, name, help='', buckets=LATENCY_BUCKETS):
+        """
+        Returns histogram of given name, creating it if there is none
+        """
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, help, buckets)
+        return self._metrics[name]
+
+    def clear(self):
+        self._metrics = {}
+
+    def snapshot(self):
+        """
+        Returns dict of states of all metrics
+        """
+        return {name: metric.snapshot()
+                for name, metric in self._metrics.items()}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=4)
+
+    def to_prometheus(self):
+        """
+        Returns metrics in Prometheus text exposition format
+        """
+        lines = []
+        for name, metric in self._metrics.items():
+            kind = metric.snapshot()['type']
+            lines.append(f'# HELP {name} {metric.help()}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(metric.prometheus())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+_local = threading.local()
+_patched = []
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+def _wrap(function, histogram, counter=None):
+    """
+    Returns function measuring time of given function. Calls nested
+    in another call measured by the same histogram (e.g. overriding
+    method calling super()) are measured only once. If counter is given,
+    size of file given as the first argument is added to it
+    """
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        active = _local.__dict__.setdefault('active', set())
+        if histogram in active:
+            return function(self, *args, **kwargs)
+        active.add(histogram)
+        start = time.perf_counter()
+        try:
+            result = function(self, *args, **kwargs)
+        finally:
+            active.discard(histogram)
+            histogram.observe(time.perf_counter() - start)
+        if counter is not None and args:
+            counter.inc(_file_size(args[0]))
+        return result
+    return wrapper
+
+
+def _wrap_coroutine(function, histogram):
+    """
+    Returns coroutine function measuring time of given one, from its
+    call until it returns. Other coroutines run meanwhile, so nested
+    calls are not detected
+    """
+    @functools.wraps(function)
+    async def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await function(self, *args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+    return wrapper
+
+
+def _patch(classes, name, histogram, counter=None):
+    for cls in classes:
+        if name in cls.__dict__:
+            original = cls.__dict__[name]
+            if inspect.iscoroutinefunction(original):
+                wrapper = _wrap_coroutine(original, histogram)
+            else:
+                wrapper = _wrap(original, histogram, counter)
+            setattr(cls, name, wrapper)
+            _patched.append((cls, name, original))
+
+
+def enabled():
+    return bool(_patched)
+
+
+def enable(registry=REGISTRY):
+    """
+    Starts measuring moves, win checks, bots' decisions and database
+    reads and writes, replacing methods of classes listed in BOARDS,
+    GAMES, BOTS, SCHEDULERS, DATABASES and GAME_STORES with measuring
+    ones. Subclasses which override these methods and are not listed
+    are not measured. Moves chosen by bots in worker processes
+    of a scheduler are measured only as scheduled moves.
+    Until it is called nothing is measured and nothing costs anything
+    """
+    if enabled():
+        return
+    moves = registry.histogram('connect4_move_seconds',
+                               'Time of inserting a sign into board')
+    checks = registry.histogram('connect4_win_check_seconds',
+                                'Time of checking for a winner')
+    decisions = registry.histogram('connect4_bot_decision_seconds',
+                                   'Time of choosing a column by bot')
+    scheduled = registry.histogram('connect4_scheduled_move_seconds',
+                                   'Time of getting a bot\'s move from '
+                                   'scheduler, with waiting in its queue')
+    reads = registry.histogram('connect4_database_read_seconds',
+                               'Time of reading database file')
+    writes = registry.histogram('connect4_database_write_seconds',
+                                'Time of saving database file')
+    read_bytes = registry.counter('connect4_database_read_bytes_total',
+                                  'Bytes of read database files')
+    written_bytes = registry.counter('connect4_database_written_bytes_total',
+                                     'Bytes of saved database files')
+    _patch(BOARDS, 'insert_player_sign', moves)
+    _patch(GAMES, 'check_winner', checks)
+    _patch(BOTS, 'choose_column', decisions)
+    _patch(SCHEDULERS, 'choose_column', scheduled)
+    _patch(DATABASES, 'read_from_file', reads, read_bytes)
+    _patch(DATABASES, 'save_to_file', writes, written_bytes)
+    for name in ('games', 'get_game_by_id'):
+        _patch(GAME_STORES, name, reads)
+    for name in ('add_game', 'remove_game'):
+        _patch(GAME_STORES, name, writes)
+
+
+def disable():
+    """
+    Stops measuring, bringing back original methods
+    """
+    while _patched:
+        cls, name, original = _patched.pop()
+        setattr(cls, name, original)
+
+
+def snapshot(format='json', registry=REGISTRY):
+    """
+    Returns text of current state of metrics, format is 'json'
+    or 'prometheus'
+    """
+    if format == 'prometheus':
+        return registry.to_prometheus()
+    if format == 'json':
+        return registry.to_json()
+    raise ValueError('Format has to be json or prometheus')
+
+
+def install_signal_handler(signum=None, path=None, format='prometheus',
+                           registry=REGISTRY):
+    """
+    Makes the process write snapshot of metrics when it gets the signal
+    (SIGUSR1 by default), to file of given path or to standard error
+    Returns previous handler of the signal
+    """
+    if signum is None:
+        signum = signal.SIGUSR1
+
+    def handler(received, frame):
+        text = snapshot(format, registry)
+        if path is None:
+            sys.stderr.write(text)
+            sys.stderr.flush()
+        else:
+            with open(path, 'w') as file_handle:
+                file_handle.write(text)
+    return signal.signal(signum, handler)
+
+
+def add_arguments(parser):
+    """
+    Adds --metrics and --metrics-file options to argument parser,
+    their defaults are taken from CONNECT4_METRICS and
+    CONNECT4_METRICS_FILE environment variables
+    """
+    parser.add_argument('--metrics', choices=FORMATS,
+                        default=os.environ.get('CONNECT4_METRICS'),
+                        help='measure game and database operations and '
+                             'write metrics in this format on SIGUSR1')
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        default=os.environ.get('CONNECT4_METRICS_FILE'),
+                        help='file metrics are written to, '
+                             'standard error by default')
+
+
+def start(format='prometheus', path=None):
+    """
+    Starts measuring and makes the process write snapshot of metrics
+    in given format when it gets SIGUSR1, used by --metrics option
+    Raises ValueError if format is not one of FORMATS
+    """
+    if format not in FORMATS:
+        raise ValueError('Format has to be json or prometheus')
+    enable()
+    install_signal_handler(path=path, format=format)
@@ -1,8 +1,9 @@
 from .player import Player
 from .game import Game
-from .bot import Bot
+from .bot import Bot, SearchBot
 from .score import Score
-from .database import Database, HighscoresDatabase
+from .database import LazyDatabase, HighscoresDatabase
+from .file_lock import FileLock
 from .errors import (DatabasePathNotFound, FileIsEmptyError,
                      ColumnIsFullError, ColumnOutOfRangeError)
 import numpy as np
@@ -15,13 +16,21 @@ class Interface:
 
     :param game: current game
     :type game: Game
+
+    :param database: database saving every game separately
+        (SqliteDatabase or JournalDatabase), None for 'database.json' file
+    :type database: SqliteDatabase
     """
-    def __init__(self, game=None):
+    def __init__(self, game=None, database=None):
         self._game = game
+        self._database = database
 
     def game(self):
         return self._game
 
+    def database(self):
+        return self._database
+
     def _greet(self):
         message = 'Welcome to Connect4 game'
         print('-' * len(message))
@@ -120,7 +129,7 @@ class Interface:
             print('Bot and player\'s signs cannot be the same')
             bot_sign = self._get_bot_sign()
         player = Player(name, sign.strip())
-        bot = Bot(bot_sign.strip())
+        bot = SearchBot(bot_sign.strip())
         game = Game([player, bot])
         game.choose_first_player()
         return game
@@ -187,6 +196,10 @@ class Interface:
                 width = self.game().width()
                 column = self.game().current_player().choose_column(width)
                 board.insert_player_sign(column, current_player.sign())
+                if isinstance(current_player, SearchBot):
+                    stats = current_player.search().stats()
+                    print(f'Bot searched {stats["nodes"]} nodes '
+                          f'({stats["nodes_per_second"]:.0f} nodes/s)')
             else:
                 print('It\'s your turn')
                 correct_choice = False
@@ -223,33 +236,46 @@ class Interface:
         """
         Saves game to database file named 'database.json'
         """
-        db = Database()
+        if self.database() is not None:
+            self.database().add_game(self.game())
+            return
+        with LazyDatabase() as db:
+            db.update_file('database.json',
+                           lambda db: db.add_game(self.game()))
+
+    def _choose_saved_game(self):
+        """
+        Asks for id of a game saved in database given with --sqlite
+        or --journal option
+        Returns the game, False if there is no game of given id
+        """
         try:
-            db.read_from_file('database.json')
-        except DatabasePathNotFound:
-            pass
-        except FileIsEmptyError:
-            pass
-        if self.game().id() is None:
-            db.add_game(self.game())
-            db.save_to_file('database.json')
-        else:
-            db.remove_game(db.get_game_by_id(self.game().id()))
-            db.add_game(self.game())
-            db.save_to_file('database.json')
+            id = int(self._get_game_id())
+        except ValueError:
+            return False
+        return self.database().get_game_by_id(id)
 
     def load_game(self):
         """
         Loads game from database named 'database.json'
         returns game object
         """
+        if self.database() is not None:
+            self.database().print_saved_games()
+            game = self._choose_saved_game()
+            if not game:
+                print('No such game')
+                return None
+            return game
         try:
-            db = Database()
-            db.read_from_file('database.json')
-            db.print_saved_games()
-            id = self._get_game_id()
-            id = int(id)
-            game = db.get_game_by_id(id)
+            with LazyDatabase() as db:
+                db.read_from_file('database.json')
+                if not db.headers():
+                    raise FileIsEmptyError
+                db.print_saved_games()
+                id = self._get_game_id()
+                id = int(id)
+                game = db.get_game_by_id(id)
             return game
         except DatabasePathNotFound:
             print('No games to load from database')
@@ -262,19 +288,28 @@ class Interface:
         """
         Deletes a game, chosen by user, from database
         """
+        if self.database() is not None:
+            self.database().print_saved_games()
+            game = self._choose_saved_game()
+            if not game:
+                print('No such game')
+                return
+            self.database().remove_game(game)
+            print('Game has been removed')
+            return
         try:
-            db = Database()
-            db.read_from_file('database.json')
-            db.print_saved_games()
-            id = self._get_game_id()
-            id = int(id)
-            game = db.get_game_by_id(id)
-            db.remove_game(game)
-            if len(db.games()) == 0:
-                with open('database.json', 'w'):
-                    pass
-            else:
-                db.save_to_file('database.json')
+            with LazyDatabase() as db:
+                db.read_from_file('database.json')
+                if not db.headers():
+                    raise FileIsEmptyError
+                db.print_saved_games()
+                id = self._get_game_id()
+                id = int(id)
+                with FileLock('database.json'):
+                    db.read_from_file('database.json')
+                    game = db.get_game_by_id(id)
+                    db.remove_game(game)
+                    db.save_to_file('database.json')
             print('Game has been removed')
         except DatabasePathNotFound:
             print('No games to load from database')
@@ -313,15 +348,9 @@ class Interface:
         """
         Adds score to database
         """
-        try:
-            highscores = HighscoresDatabase()
-            highscores.read_from_file('highscores.json')
-        except FileNotFoundError:
-            pass
-        except FileIsEmptyError:
-            pass
-        highscores.add_score(score)
-        highscores.save_to_file('highscores.json')
+        highscores = HighscoresDatabase()
+        highscores.update_file('highscores.json',
+                               lambda db: db.add_score(score))
 
     def play(self):
         """
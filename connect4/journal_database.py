@@ -0,0 +1,250 @@
+from .game import Game
+from .classes_io import write_game_data, read_game_data
+from .config import JOURNAL_COMPACT_RATIO, JOURNAL_COMPACT_MINIMUM
+from .errors import InvalidDataError
+import json
+import os
+import threading
+
+
+class JournalDatabase:
+    """
+    Class JournalDatabase. Appends every saved or removed game as one
+    JSON line to a journal file, so saving costs the same no matter
+    how many games are stored. Has the same interface as Database.
+    Contains attributes:
+
+    :param path: path of the journal file
+    :type path: str
+
+    :param index: id of every stored game mapped to tuple of record's
+        offset in the file and players' names
+    :type index: dict
+
+    :param compact_ratio: part of dead records which starts compaction,
+        None turns automatic compaction off
+    :type compact_ratio: float
+
+    :param background: True runs automatic compaction in another thread
+    :type background: bool
+
+    :param sync: True makes every record reach the disk (fsync) before
+        saving returns. Otherwise records are only flushed to the
+        system, so the newest ones may be lost on power failure,
+        but never on crash of the process
+    :type sync: bool
+    """
+    def __init__(self, path, compact_ratio=JOURNAL_COMPACT_RATIO,
+                 background=False, sync=False):
+        self._path = path
+        self._sync = sync
+        self._compact_ratio = compact_ratio
+        self._background = background
+        self._lock = threading.RLock()
+        self._compaction = None
+        self._index = {}
+        self._records = 0
+        self._next_id = 0
+        self._open()
+
+    def _open(self):
+        self._writer = open(self._path, 'ab')
+        self._reader = open(self._path, 'rb')
+        self._index = {}
+        self._records = 0
+        self._replay(self._reader, 0, self._index)
+
+    def _replay(self, file_handle, offset, index):
+        """
+        Reads records from file handle starting at offset into index
+        Returns count of read records
+        Unfinished last record (written only partly when the process
+        crashed) is cut off the file
+        Raises InvalidDataError if a finished record is invalid
+        """
+        file_handle.seek(offset)
+        count = 0
+        for line in iter(file_handle.readline, b''):
+            try:
+                record = json.loads(line)
+                if record['op'] == 'meta':
+                    self._next_id = max(self._next_id, record['next_id'])
+                    offset += len(line)
+                    continue
+                if record['op'] == 'put':
+                    data = record['game']
+                    entry = (offset, data['player1']['name'],
+                             data['player2']['name'])
+                    index[data['id']] = entry
+                    self._next_id = max(self._next_id, data['id'] + 1)
+                else:
+                    index.pop(record['id'], None)
+            except (ValueError, KeyError, TypeError) as e:
+                if line.endswith(b'\n'):
+                    raise InvalidDataError('Invalid journal record') from e
+                self._truncate(offset)
+                break
+            offset += len(line)
+            count += 1
+        self._records += count
+        return count
+
+    def _truncate(self, offset):
+        """
+        Cuts the journal file at given offset
+        """
+        self._writer.flush()
+        os.truncate(self._path, offset)
+        self._writer.seek(0, os.SEEK_END)
+
+    def path(self):
+        return self._path
+
+    def records(self):
+        """
+        Returns count of records in the journal file
+        """
+        return self._records
+
+    def dead_records(self):
+        """
+        Returns count of records of overwritten or removed games
+        """
+        return self._records - len(self._index)
+
+    def _append(self, record):
+        line = json.dumps(record, separators=(',', ':')).encode() + b'\n'
+        offset = self._writer.tell()
+        self._writer.write(line)
+        self._writer.flush()
+        if self._sync:
+            os.fsync(self._writer.fileno())
+        self._records += 1
+        return offset
+
+    def _read(self, offset):
+        """
+        Returns data of game saved at given offset, has to be called
+        holding the lock, so compaction cannot move the record meanwhile
+        """
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())['game']
+
+    def games(self):
+        """
+        Returns list of all games
+        """
+        with self._lock:
+            data = [self._read(entry[0]) for entry in self._index.values()]
+        return [read_game_data(game_data) for game_data in data]
+
+    def add_game(self, game: Game):
+        """
+        Adds game to database, or overwrites it if it has an id
+        Sets id of new game
+        """
+        with self._lock:
+            if game.id() is None:
+                game._id = self._next_id
+            self._next_id = max(self._next_id, game.id() + 1)
+            data = write_game_data(game, game.id())
+            offset = self._append({'op': 'put', 'game': data})
+            self._index[game.id()] = (offset, data['player1']['name'],
+                                      data['player2']['name'])
+        self._compact_if_needed()
+
+    def remove_game(self, game):
+        """
+        Removes game from database
+        """
+        with self._lock:
+            if not game or game.id() not in self._index:
+                raise ValueError('Cannot find game in games list')
+            self._append({'op': 'del', 'id': game.id()})
+            del self._index[game.id()]
+        self._compact_if_needed()
+        return True
+
+    def get_game_by_id(self, id):
+        """
+        returns game of given id
+        returns False if given id is invalid
+        """
+        with self._lock:
+            entry = self._index.get(id)
+            if entry is None:
+                return False
+            data = self._read(entry[0])
+        return read_game_data(data)
+
+    def print_saved_games(self):
+        """
+        Prints games in database
+        """
+        print('Saved games:')
+        with self._lock:
+            entries = sorted(self._index.items())
+        for id, (_, player1_name, player2_name) in entries:
+            print(f'{id} : {player1_name} vs {player2_name}')
+
+    def _compact_if_needed(self):
+        if self._compact_ratio is None:
+            return
+        if self._records < JOURNAL_COMPACT_MINIMUM:
+            return
+        if self.dead_records() / self._records <= self._compact_ratio:
+            return
+        if not self._background:
+            self.compact()
+        elif self._compaction is None or not self._compaction.is_alive():
+            self._compaction = threading.Thread(target=self.compact,
+                                                daemon=True)
+            self._compaction.start()
+
+    def compact(self):
+        """
+        Rewrites journal keeping only the newest record of every stored
+        game. Games can be saved while live records are copied,
+        records appended meanwhile are copied at the end. The first
+        record keeps the next id, so ids of removed games are not reused
+        """
+        temporary_path = self._path + '.compact'
+        with self._lock:
+            end = self._writer.tell()
+            entries = sorted(self._index.items())
+            meta = {'op': 'meta', 'next_id': self._next_id}
+        index = {}
+        with open(self._path, 'rb') as source, \
+                open(temporary_path, 'wb') as target:
+            target.write(json.dumps(meta, separators=(',', ':')).encode())
+            target.write(b'\n')
+            for id, (offset, player1_name, player2_name) in entries:
+                source.seek(offset)
+                line = source.readline()
+                index[id] = (target.tell(), player1_name, player2_name)
+                target.write(line)
+            with self._lock:
+                source.seek(end)
+                tail = source.read()
+                tail_offset = target.tell()
+                target.write(tail)
+                target.flush()
+                os.fsync(target.fileno())
+                self._writer.close()
+                self._reader.close()
+                os.replace(temporary_path, self._path)
+                self._writer = open(self._path, 'ab')
+                self._reader = open(self._path, 'rb')
+                self._records = len(entries)
+                self._replay(self._reader, tail_offset, index)
+                self._index = index
+
+    def close(self):
+        """
+        Waits for running compaction and closes the journal
+        """
+        if self._compaction is not None:
+            self._compaction.join()
+        with self._lock:
+            self._writer.close()
+            self._reader.close()
@@ -0,0 +1,235 @@
+from .bitboard import is_winning_mask
+import math
+import random
+import time
+
+
+class _Node:
+    """
+    Node of the search tree. Wins are counted for the player who
+    made the move leading to the node
+    """
+    __slots__ = ('column', 'parent', 'children', 'untried', 'visits', 'wins',
+                 'current', 'mask', 'moves', 'reward')
+
+    def __init__(self, column, parent, current, mask, moves, reward=None):
+        self.column = column
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.wins = 0.0
+        self.current = current
+        self.mask = mask
+        self.moves = moves
+        self.reward = reward
+
+
+class MonteCarloSearch:
+    """
+    Class MonteCarloSearch. Chooses moves with Monte Carlo tree search
+    (UCT). Playouts play random moves straight on bitboard integers.
+    Tree is kept between searches, so the part of it below the moves
+    played meanwhile is reused.
+    Contains attributes:
+
+    :param simulations: playouts for one search, None for no limit
+    :type simulations: int
+
+    :param time_limit: seconds for one search, None for no limit
+    :type time_limit: float
+
+    :param exploration: exploration constant of UCT
+    :type exploration: float
+
+    :param seed: seed of random generator, None for random seed
+    :type seed: int
+    """
+    def __init__(self, simulations=None, time_limit=1.0,
+                 exploration=math.sqrt(2), seed=None):
+        if simulations is None and time_limit is None:
+            raise ValueError('Simulations or time limit has to be set')
+        self._simulations = simulations
+        self._time_limit = time_limit
+        self._exploration = exploration
+        self._random = random.Random(seed)
+        self._root = None
+        self._playouts = 0
+        self._elapsed = 0.0
+        self._reused = 0
+
+    def root(self):
+        return self._root
+
+    def __getstate__(self):
+        """
+        Tree is not copied when search is pickled
+        (e.g. sent to worker process)
+        """
+        state = self.__dict__.copy()
+        state['_root'] = None
+        return state
+
+    def playouts(self):
+        return self._playouts
+
+    def elapsed(self):
+        return self._elapsed
+
+    def playouts_per_second(self):
+        if not self._elapsed:
+            return 0.0
+        return self._playouts / self._elapsed
+
+    def reused(self):
+        """
+        Returns count of root visits kept from previous search
+        """
+        return self._reused
+
+    def stats(self):
+        """
+        Returns statistics of the last search
+        """
+        return {
+            'playouts': self.playouts(),
+            'reused': self.reused(),
+            'elapsed': self.elapsed(),
+            'playouts_per_second': self.playouts_per_second(),
+        }
+
+    def _prepare(self, position):
+        width = position.width
+        self._height = position.height
+        self._win_count = position.win_count
+        self._cells = width * position.height
+        self._bottoms = [position.bottom_mask(c) for c in range(width)]
+        self._tops = [position.top_mask(c) for c in range(width)]
+        self._columns = [position.column_mask(c) for c in range(width)]
+
+    def _find_root(self, position):
+        """
+        Returns node of given position from the previous tree,
+        looking up to two moves below the old root
+        Returns new node if there is no such node
+        """
+        key = (position.current, position.mask)
+        old_root = self._root
+        if old_root is not None:
+            nodes = [old_root] + old_root.children
+            for child in old_root.children:
+                nodes.extend(child.children)
+            for node in nodes:
+                if (node.current, node.mask) == key:
+                    node.parent = None
+                    return node
+        return _Node(None, None, position.current, position.mask,
+                     position.moves)
+
+    def search(self, position):
+        """
+        Searches given position
+        Returns the most visited column (numbered from 0)
+        Returns None if there is no playable column
+        """
+        self._prepare(position)
+        self._root = self._find_root(position)
+        self._reused = self._root.visits
+        self._playouts = 0
+        start = time.perf_counter()
+        while True:
+            if (self._simulations is not None
+                    and self._playouts >= self._simulations):
+                break
+            if (self._time_limit is not None and not self._playouts & 63
+                    and time.perf_counter() - start >= self._time_limit):
+                break
+            if not self._iterate():
+                break
+        self._elapsed = time.perf_counter() - start
+        if not self._root.children:
+            return None
+        best = max(self._root.children, key=lambda node: node.visits)
+        return best.column
+
+    def _untried(self, node):
+        columns = [column for column in range(len(self._tops))
+                   if not node.mask & self._tops[column]]
+        self._random.shuffle(columns)
+        return columns
+
+    def _select(self, node):
+        logarithm = math.log(node.visits)
+        exploration = self._exploration
+        best = None
+        best_value = -1.0
+        for child in node.children:
+            value = (child.wins / child.visits
+                     + exploration * math.sqrt(logarithm / child.visits))
+            if value > best_value:
+                best = child
+                best_value = value
+        return best
+
+    def _iterate(self):
+        """
+        Runs one selection, expansion, playout and backpropagation
+        Returns False if root has no moves
+        """
+        node = self._root
+        if node.untried is None:
+            node.untried = self._untried(node)
+        if not node.untried and not node.children:
+            return False
+        while node.reward is None and not node.untried and node.children:
+            node = self._select(node)
+            if node.untried is None:
+                node.untried = self._untried(node)
+        if node.reward is None and node.untried:
+            column = node.untried.pop()
+            played = (node.mask + self._bottoms[column])
+            played &= self._columns[column]
+            reward = None
+            if is_winning_mask(node.current | played, self._height,
+                               self._win_count):
+                reward = 1.0
+            elif node.moves + 1 == self._cells:
+                reward = 0.5
+            child = _Node(column, node, node.current ^ node.mask,
+                          node.mask | played, node.moves + 1, reward)
+            node.children.append(child)
+            node = child
+        if node.reward is not None:
+            reward = node.reward
+        else:
+            reward = self._playout(node.current, node.mask, node.moves)
+        self._playouts += 1
+        while node is not None:
+            node.visits += 1
+            node.wins += reward
+            reward = 1.0 - reward
+            node = node.parent
+        return True
+
+    def _playout(self, current, mask, moves):
+        """
+        Plays random moves until the end of the game
+        Returns 1 if the player who moved last before playout wins,
+        0 if he loses and 0.5 for draw
+        """
+        tops = self._tops
+        bottoms = self._bottoms
+        columns = self._columns
+        choice = self._random.choice
+        reward = 0.0
+        width = range(len(tops))
+        while moves < self._cells:
+            column = choice([c for c in width if not mask & tops[c]])
+            played = (mask + bottoms[column]) & columns[column]
+            if is_winning_mask(current | played, self._height,
+                               self._win_count):
+                return reward
+            current, mask = current ^ mask, mask | played
+            moves += 1
+            reward = 1.0 - reward
+        return 0.5
@@ -0,0 +1,215 @@
+from .bitboard import Position, is_winning_mask
+from .search import Negamax
+from .transposition import TranspositionTable
+from .config import WIDTH, HEIGHT, WIN_COUNT, BOOK_DEPTH, BOOK_NODE_LIMIT
+from .errors import InvalidDataError
+import argparse
+import mmap
+import struct
+
+
+MAGIC = b'C4OB'
+HEADER = struct.Struct('<4sBBBxI')
+RECORD = struct.Struct('<QBb')
+
+
+def mirror_key(key, width, height):
+    """
+    Returns key of position mirrored left to right.
+    Every column of a key takes its own height+1 bits,
+    so columns can be swapped independently
+    """
+    size = height + 1
+    column_bits = (1 << size) - 1
+    mirrored = 0
+    for column in range(width):
+        bits = key >> (column * size) & column_bits
+        mirrored |= bits << ((width - 1 - column) * size)
+    return mirrored
+
+
+def canonical_key(position):
+    """
+    Returns tuple of smaller of position's and its mirror's keys
+    and True if the mirror's key was chosen
+    """
+    key = position.key()
+    mirrored = mirror_key(key, position.width, position.height)
+    if mirrored < key:
+        return mirrored, True
+    return key, False
+
+
+def canonical_position(position):
+    """
+    Returns position whose key is the canonical key
+    """
+    key, mirrored = canonical_key(position)
+    if not mirrored:
+        return position
+    mirrored_position = position.copy()
+    mirrored_position.current = mirror_key(position.current,
+                                           position.width, position.height)
+    mirrored_position.mask = mirror_key(position.mask,
+                                        position.width, position.height)
+    return mirrored_position
+
+
+def book_positions(depth, width=WIDTH, height=HEIGHT, win_count=WIN_COUNT):
+    """
+    Returns dict of canonical key and Position of every position
+    reachable in at most depth moves, which is not finished yet
+    """
+    positions = {}
+    layer = [Position(width, height, win_count)]
+    for ply in range(depth + 1):
+        next_layer = []
+        for position in layer:
+            key, _ = canonical_key(position)
+            if key in positions:
+                continue
+            opponent = position.current ^ position.mask
+            if position.is_full() or is_winning_mask(opponent, height,
+                                                     win_count):
+                continue
+            positions[key] = position
+            if ply == depth:
+                continue
+            for column in position.playable_columns():
+                child = position.copy()
+                child.play(column)
+                next_layer.append(child)
+        layer = next_layer
+    return positions
+
+
+def generate_book(path, depth=BOOK_DEPTH, node_limit=BOOK_NODE_LIMIT,
+                  width=WIDTH, height=HEIGHT, win_count=WIN_COUNT):
+    """
+    Searches every position up to depth moves and writes best moves
+    to a binary file sorted by position key
+    Returns count of written positions
+    """
+    if width * (height + 1) > 64:
+        raise ValueError('Board is too big for 64-bit book keys')
+    table = TranspositionTable()
+    search = Negamax(time_limit=None, node_limit=node_limit, table=table)
+    records = []
+    positions = book_positions(depth, width, height, win_count)
+    for key, position in positions.items():
+        column, score = search.search(canonical_position(position))
+        records.append((key, column, max(-128, min(127, score))))
+    records.sort()
+    with open(path, 'wb') as file_handle:
+        file_handle.write(HEADER.pack(MAGIC, width, height, win_count,
+                                      len(records)))
+        for record in records:
+            file_handle.write(RECORD.pack(*record))
+    return len(records)
+
+
+class OpeningBook:
+    """
+    Class OpeningBook. Reads book written by generate_book using mmap,
+    so processes share one copy of the file through the page cache and
+    nothing is loaded before the first lookup.
+    Contains attributes:
+
+    :param path: path of the book file
+    :type path: str
+
+    :param width: width of the board
+    :type width: int
+
+    :param height: height of the board
+    :type height: int
+
+    :param win_count: count of signs in line needed to win
+    :type win_count: int
+    """
+    def __init__(self, path):
+        self._path = path
+        with open(path, 'rb') as file_handle:
+            try:
+                self._map = mmap.mmap(file_handle.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise InvalidDataError('File is not an opening book') from e
+        try:
+            magic, width, height, win_count, count = HEADER.unpack_from(
+                self._map, 0)
+        except struct.error as e:
+            self._map.close()
+            raise InvalidDataError('File is not an opening book') from e
+        if (magic != MAGIC
+                or len(self._map) != HEADER.size + count * RECORD.size):
+            self._map.close()
+            raise InvalidDataError('File is not an opening book')
+        self._width = width
+        self._height = height
+        self._win_count = win_count
+        self._count = count
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def win_count(self):
+        return self._win_count
+
+    def __len__(self):
+        return self._count
+
+    def _record(self, index):
+        return RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+
+    def lookup(self, position):
+        """
+        Returns tuple of best column (numbered from 0) and score
+        of given position
+        Returns None if position is not in the book
+        """
+        if (position.width, position.height, position.win_count) != (
+                self._width, self._height, self._win_count):
+            return None
+        key, mirrored = canonical_key(position)
+        low = 0
+        high = self._count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, column, score = self._record(middle)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                if mirrored:
+                    column = self._width - 1 - column
+                return column, score
+        return None
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description='Generates opening book for the default board')
+    parser.add_argument('path')
+    parser.add_argument('--depth', type=int, default=BOOK_DEPTH)
+    parser.add_argument('--nodes', type=int, default=BOOK_NODE_LIMIT)
+    args = parser.parse_args(arguments)
+    count = generate_book(args.path, args.depth, args.nodes)
+    print(f'Saved {count} positions to {args.path}')
+
+
+if __name__ == '__main__':
+    main()
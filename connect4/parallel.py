@@ -0,0 +1,216 @@
+from .bitboard import Position
+from .search import Negamax, centre_order
+from .mcts import MonteCarloSearch
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+import weakref
+
+
+def pack_position(position):
+    """
+    Returns position as a tuple of integers, sent to worker processes
+    instead of Game, Board or Player objects
+    """
+    return (position.width, position.height, position.win_count,
+            position.current, position.mask, position.moves)
+
+
+def unpack_position(packed):
+    """
+    Returns Position created from tuple made by pack_position
+    """
+    return Position(*packed)
+
+
+def search_root_move(packed, column, time_limit, node_limit, max_depth):
+    """
+    Searches position after playing given column (numbered from 0),
+    the played column counts as one ply of max_depth
+    Returns tuple of column, its score and count of searched nodes
+    """
+    position = unpack_position(packed)
+    cells = position.width * position.height
+    if position.is_winning_move(column):
+        return column, cells - position.moves, 0
+    position.play(column)
+    if max_depth is not None:
+        max_depth -= 1
+    search = Negamax(time_limit, node_limit, max_depth)
+    result = search.search(position)
+    if result is None:
+        return column, 0, search.nodes()
+    return column, -result[1], search.nodes()
+
+
+def search_tree(packed, simulations, time_limit, seed):
+    """
+    Builds independent Monte Carlo tree of given position
+    Returns tuple of visits of every root move and count of playouts
+    """
+    search = MonteCarloSearch(simulations, time_limit, seed=seed)
+    search.search(unpack_position(packed))
+    visits = {child.column: child.visits for child in search.root().children}
+    return visits, search.playouts()
+
+
+class ParallelSearch:
+    """
+    Class ParallelSearch. Searches positions in a pool of worker processes.
+    In 'root' mode every playable column is searched with Negamax
+    by a separate task, in 'mcts' mode every worker builds its own
+    Monte Carlo tree and visits of root moves are summed.
+    Contains attributes:
+
+    :param workers: count of worker processes, None for count of CPUs
+    :type workers: int
+
+    :param mode: 'root' or 'mcts'
+    :type mode: str
+
+    :param time_limit: seconds for one task, None for no limit
+    :type time_limit: float
+
+    :param node_limit: nodes for one root move ('root' mode)
+    :type node_limit: int
+
+    :param max_depth: maximal searched depth ('root' mode), counted
+        with the root move
+    :type max_depth: int
+
+    :param simulations: playouts of one tree ('mcts' mode)
+    :type simulations: int
+
+    Worker processes are shut down by close(), at the end of with block,
+    or when the search is garbage collected
+    """
+    def __init__(self, workers=None, mode='root', time_limit=1.0,
+                 node_limit=None, max_depth=None, simulations=None,
+                 seed=None):
+        if mode not in ('root', 'mcts'):
+            raise ValueError('Mode has to be root or mcts')
+        self._workers = workers
+        self._mode = mode
+        self._time_limit = time_limit
+        self._node_limit = node_limit
+        self._max_depth = max_depth
+        self._simulations = simulations
+        self._seed = seed
+        self._executor = None
+        self._finalizer = None
+        self._work = 0
+        self._elapsed = 0.0
+
+    def mode(self):
+        return self._mode
+
+    def __getstate__(self):
+        """
+        Process pool is not copied when search is pickled
+        """
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_finalizer'] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def executor(self):
+        """
+        Returns process pool, creating it on the first call
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers())
+            self._finalizer = weakref.finalize(
+                self, self._executor.shutdown, wait=False)
+        return self._executor
+
+    def workers(self):
+        return self._workers or os.cpu_count() or 1
+
+    def work(self):
+        """
+        Returns nodes ('root' mode) or playouts ('mcts' mode)
+        of the last search
+        """
+        return self._work
+
+    def elapsed(self):
+        return self._elapsed
+
+    def stats(self):
+        """
+        Returns statistics of the last search
+        """
+        rate = self._work / self._elapsed if self._elapsed else 0.0
+        return {
+            'mode': self.mode(),
+            'work': self.work(),
+            'elapsed': self.elapsed(),
+            'work_per_second': rate,
+        }
+
+    def search(self, position):
+        """
+        Searches given position
+        Returns the best column (numbered from 0)
+        Returns None if there is no playable column
+        """
+        start = time.perf_counter()
+        if self._mode == 'root':
+            column = self._search_root(position)
+        else:
+            column = self._search_trees(position)
+        self._elapsed = time.perf_counter() - start
+        return column
+
+    def _search_root(self, position):
+        packed = pack_position(position)
+        order = [column for column in centre_order(position.width)
+                 if position.can_play(column)]
+        if not order:
+            return None
+        futures = [self.executor().submit(
+                       search_root_move, packed, column, self._time_limit,
+                       self._node_limit, self._max_depth)
+                   for column in order]
+        scores = {}
+        self._work = 0
+        for future in futures:
+            column, score, nodes = future.result()
+            scores[column] = score
+            self._work += nodes
+        return max(order, key=lambda column: scores[column])
+
+    def _search_trees(self, position):
+        packed = pack_position(position)
+        if not position.playable_columns():
+            return None
+        futures = []
+        for index in range(self.workers()):
+            seed = None if self._seed is None else self._seed + index
+            futures.append(self.executor().submit(
+                search_tree, packed, self._simulations,
+                self._time_limit, seed))
+        visits = {}
+        self._work = 0
+        for future in futures:
+            tree_visits, playouts = future.result()
+            for column, count in tree_visits.items():
+                visits[column] = visits.get(column, 0) + count
+            self._work += playouts
+        return max(visits, key=lambda column: visits[column])
+
+    def close(self):
+        """
+        Shuts the worker processes down
+        """
+        if self._executor is not None:
+            self._finalizer.detach()
+            self._executor.shutdown()
+            self._executor = None
+            self._finalizer = None
@@ -0,0 +1,84 @@
+class BoardRenderer:
+    """
+    Class BoardRenderer. Keeps text of the board as a list of pieces,
+    so inserted sign replaces only its own piece instead of building
+    whole text again. Every change is also logged, so clients which
+    already know the board can get only cells changed since then.
+    Contains attributes:
+
+    :param height: height of the board
+    :type height: int
+
+    :param width: width of the board
+    :type width: int
+
+    :param buffer: pieces of text of the board, one piece for every cell
+        and one for every border line
+    :type buffer: list
+
+    :param text: joined buffer, None if a cell has changed since it
+        was joined
+    :type text: str
+
+    :param changes: row, column and sign of every changed cell,
+        in order of changes
+    :type changes: list
+    """
+    def __init__(self, height, width, array=None):
+        self._height = height
+        self._width = width
+        border = '-' * (width * 4 + 1)
+        self._buffer = [border + '\n']
+        for row in range(height):
+            for column in range(width):
+                item = ' ' if array is None else array[row][column]
+                self._buffer.append(f'| {item} ')
+            self._buffer.append('|\n')
+        self._buffer.append(border)
+        self._text = None
+        self._changes = []
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Returns renderer of current state of given board
+        """
+        return cls(board.height(), board.width(), board.board())
+
+    def height(self):
+        return self._height
+
+    def width(self):
+        return self._width
+
+    def _slot(self, row, column):
+        return 1 + row * (self._width + 1) + column
+
+    def set_cell(self, row, column, sign):
+        """
+        Changes sign shown in given cell (row counted from the top)
+        """
+        self._buffer[self._slot(row, column)] = f'| {sign} '
+        self._text = None
+        self._changes.append((row, column, sign))
+
+    def render(self):
+        """
+        Returns text of the board, the same as str() of Board
+        """
+        if self._text is None:
+            self._text = ''.join(self._buffer)
+        return self._text
+
+    def version(self):
+        """
+        Returns count of changes made so far
+        """
+        return len(self._changes)
+
+    def changes(self, since=0):
+        """
+        Returns list of tuples of row, column and sign of cells changed
+        after given version, in order of changes
+        """
+        return self._changes[since:]
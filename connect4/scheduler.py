@@ -0,0 +1,204 @@
+from .bot import Bot
+from .config import SCHEDULER_QUEUE_SIZE, SCHEDULER_DEADLINE
+from .errors import SchedulerQueueFullError, MoveCancelledError
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import random
+
+
+def compute_column(game):
+    """
+    Returns column (numbered from 1) chosen by current player of game,
+    which has to be a bot. Runs in worker thread or process
+    """
+    bot = game.current_player()
+    return bot.choose_column(game.width())
+
+
+def fallback_column(game):
+    """
+    Returns random column which is not full
+    """
+    return random.choice(game.current_player().free_columns())
+
+
+class BotMoveScheduler:
+    """
+    Class BotMoveScheduler. Computes bots' moves in a pool of worker
+    threads or processes, so event loop stays free for other games.
+    Move, which is not computed before its deadline, is replaced
+    by random column.
+    Contains attributes:
+
+    :param kind: 'thread' or 'process', in 'process' mode game
+        with its bots is pickled and sent to worker process for every
+        move. Bot's transposition table is not pickled, so the worker
+        builds a new table for every move and positions searched for
+        previous moves are not reused, as they are in 'thread' mode
+    :type kind: str
+
+    :param workers: count of workers, None for default of the pool
+    :type workers: int
+
+    :param queue_size: count of requests computed or waiting in the pool,
+        more requests wait for free place (or are refused)
+    :type queue_size: int
+
+    :param deadline: seconds for one move, None for no deadline
+    :type deadline: float
+
+    :param pending: futures of not finished requests mapped by keys
+        given with requests (e.g. session ids), requests waiting
+        for free place in the queue have futures too
+    :type pending: dict
+
+    :param running: worker tasks mapped by keys, a task can still run
+        after its deadline, then next request of the same key gets
+        random column at once, so one bot never searches twice at a time
+    :type running: dict
+    """
+    def __init__(self, kind='thread', workers=None,
+                 queue_size=SCHEDULER_QUEUE_SIZE,
+                 deadline=SCHEDULER_DEADLINE):
+        if kind not in ('thread', 'process'):
+            raise ValueError('Kind has to be thread or process')
+        self._kind = kind
+        self._workers = workers
+        self._queue_size = queue_size
+        self._deadline = deadline
+        self._executor = None
+        self._slots = None
+        self._queued = 0
+        self._pending = {}
+        self._running = {}
+        self._completed = 0
+        self._timeouts = 0
+        self._cancelled = 0
+
+    def kind(self):
+        return self._kind
+
+    def queued(self):
+        """
+        Returns count of requests computed or waiting in the pool
+        """
+        return self._queued
+
+    def stats(self):
+        """
+        Returns counts of computed, late and cancelled moves
+        """
+        return {
+            'queued': self._queued,
+            'completed': self._completed,
+            'timeouts': self._timeouts,
+            'cancelled': self._cancelled,
+        }
+
+    def executor(self):
+        """
+        Returns pool of workers, creating it on the first call
+        """
+        if self._executor is None:
+            if self._kind == 'thread':
+                self._executor = ThreadPoolExecutor(self._workers)
+            else:
+                self._executor = ProcessPoolExecutor(self._workers)
+        return self._executor
+
+    def _release(self, loop, key):
+        def release(task):
+            try:
+                loop.call_soon_threadsafe(self._free_slot, key, task)
+            except RuntimeError:
+                pass
+        return release
+
+    def _free_slot(self, key=None, task=None):
+        self._queued -= 1
+        self._slots.release()
+        if task is not None and self._running.get(key) is task:
+            del self._running[key]
+
+    async def choose_column(self, game, key=None, deadline=None,
+                            wait=True):
+        """
+        Computes move of current player of game, which has to be a bot
+        Returns column numbered from 1, random column if deadline passes
+        Waits for free place in the queue, or raises
+        SchedulerQueueFullError if wait is False and the queue is full
+        Raises MoveCancelledError if request is cancelled with cancel()
+        """
+        if not isinstance(game.current_player(), Bot):
+            raise ValueError('Current player is not a bot')
+        if key is not None and key in self._running:
+            self._timeouts += 1
+            return fallback_column(game)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._queue_size)
+        if not wait and self._slots.locked():
+            raise SchedulerQueueFullError('Too many bots are thinking')
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._pending.setdefault(key, set()).add(waiter)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._forget(key, waiter)
+        if waiter.cancelled():
+            self._slots.release()
+            self._cancelled += 1
+            raise MoveCancelledError('Move has been cancelled')
+        self._queued += 1
+        try:
+            task = self.executor().submit(compute_column, game)
+        except BaseException:
+            self._free_slot()
+            raise
+        if key is not None:
+            self._running[key] = task
+        task.add_done_callback(self._release(loop, key))
+        future = asyncio.wrap_future(task)
+        self._pending.setdefault(key, set()).add(future)
+        deadline = self._deadline if deadline is None else deadline
+        try:
+            column = await asyncio.wait_for(asyncio.shield(future), deadline)
+            self._completed += 1
+            return column
+        except asyncio.TimeoutError:
+            future.cancel()
+            self._timeouts += 1
+            return fallback_column(game)
+        except asyncio.CancelledError:
+            self._cancelled += 1
+            if future.cancelled():
+                raise MoveCancelledError('Move has been cancelled')
+            future.cancel()
+            raise
+        finally:
+            self._forget(key, future)
+
+    def _forget(self, key, future):
+        futures = self._pending.get(key)
+        futures.discard(future)
+        if not futures:
+            del self._pending[key]
+
+    def cancel(self, key):
+        """
+        Cancels requests of given key (e.g. of an abandoned game),
+        also the ones still waiting for free place in the queue
+        Returns count of cancelled requests
+        """
+        futures = self._pending.get(key, set())
+        for future in futures:
+            future.cancel()
+        return len(futures)
+
+    def close(self):
+        """
+        Shuts the workers down, not started requests are cancelled
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -22,3 +22,64 @@ class Score:
         player = self.player_name()
         moves = self.moves()
         return f'Winner: {player}, Moves count: {moves}'
+
+
+class PlayerStats:
+    """
+    Class PlayerStats. Aggregated scores of one player.
+    Contains attributes:
+
+    :param name: player's name
+    :type name: str
+
+    :param wins: count of won games
+    :type wins: int
+
+    :param best: the lowest count of moves of a won game
+    :type best: int
+
+    :param total_moves: sum of moves of all won games
+    :type total_moves: int
+    """
+    def __init__(self, name, wins=0, best=None, total_moves=0):
+        self._name = name
+        self._wins = wins
+        self._best = best
+        self._total_moves = total_moves
+
+    def name(self):
+        return self._name
+
+    def wins(self):
+        return self._wins
+
+    def best(self):
+        return self._best
+
+    def total_moves(self):
+        return self._total_moves
+
+    def average(self):
+        """
+        Returns average count of moves of won games
+        Returns None if player has not won any game
+        """
+        if not self._wins:
+            return None
+        return self._total_moves / self._wins
+
+    def add(self, moves):
+        """
+        Adds won game with given count of moves
+        """
+        self._wins += 1
+        self._total_moves += moves
+        if self._best is None or moves < self._best:
+            self._best = moves
+
+    def __str__(self):
+        name = self.name()
+        if not self.wins():
+            return f'{name}: wins: 0, best: -, average: -'
+        return (f'{name}: wins: {self.wins()}, best: {self.best()}, '
+                f'average: {self.average():.1f}')
@@ -0,0 +1,222 @@
+from .bitboard import is_winning_mask
+from .transposition import EXACT, LOWER, UPPER
+import time
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def centre_order(width):
+    """
+    Returns columns (numbered from 0) sorted from the centre to the edges
+    """
+    return sorted(range(width), key=lambda column: abs(2*column - width + 1))
+
+
+class Negamax:
+    """
+    Class Negamax. Searches Position with negamax and alpha-beta pruning,
+    trying central columns first. Deepens the search one ply at a time
+    until time or nodes budget is used.
+    Positive score means the player to move wins, the sooner
+    the higher, 0 means draw or result beyond searched depth.
+    Contains attributes:
+
+    :param time_limit: seconds for one search, None for no limit
+    :type time_limit: float
+
+    :param node_limit: nodes for one search, None for no limit
+    :type node_limit: int
+
+    :param max_depth: maximal searched depth, None for no limit
+    :type max_depth: int
+
+    :param table: table of already searched positions, None for no table
+    :type table: TranspositionTable
+    """
+    def __init__(self, time_limit=1.0, node_limit=None, max_depth=None,
+                 table=None):
+        self._time_limit = time_limit
+        self._node_limit = node_limit
+        self._max_depth = max_depth
+        self._table = table
+        self._nodes = 0
+        self._depth = 0
+        self._elapsed = 0.0
+
+    def time_limit(self):
+        return self._time_limit
+
+    def set_time_limit(self, time_limit):
+        self._time_limit = time_limit
+
+    def __getstate__(self):
+        """
+        Transposition table is not copied when search is pickled
+        (e.g. sent to worker process)
+        """
+        state = self.__dict__.copy()
+        state['_table'] = None
+        return state
+
+    def table(self):
+        return self._table
+
+    def set_table(self, table):
+        self._table = table
+
+    def nodes(self):
+        return self._nodes
+
+    def depth(self):
+        return self._depth
+
+    def elapsed(self):
+        return self._elapsed
+
+    def nodes_per_second(self):
+        if not self._elapsed:
+            return 0.0
+        return self._nodes / self._elapsed
+
+    def stats(self):
+        """
+        Returns statistics of the last search
+        """
+        return {
+            'nodes': self.nodes(),
+            'depth': self.depth(),
+            'elapsed': self.elapsed(),
+            'nodes_per_second': self.nodes_per_second(),
+        }
+
+    def _prepare(self, position):
+        height = position.height
+        self._height = height
+        self._win_count = position.win_count
+        self._cells = position.width * height
+        self._order = centre_order(position.width)
+        self._bottoms = [position.bottom_mask(c)
+                         for c in range(position.width)]
+        self._tops = [position.top_mask(c) for c in range(position.width)]
+        self._columns = [position.column_mask(c)
+                         for c in range(position.width)]
+        self._nodes = 0
+        self._depth = 0
+        self._start = time.perf_counter()
+
+    def _check_budget(self):
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            raise _BudgetExceeded
+        if not self._nodes & 1023 and self._time_limit is not None:
+            if time.perf_counter() - self._start >= self._time_limit:
+                raise _BudgetExceeded
+
+    def search(self, position):
+        """
+        Searches given position
+        Returns tuple of best column (numbered from 0) and its score
+        Returns None if there is no playable column
+        """
+        self._prepare(position)
+        playable = [column for column in self._order
+                    if position.can_play(column)]
+        if not playable:
+            return None
+        best = (playable[0], 0)
+        max_depth = self._cells - position.moves
+        if self._max_depth is not None:
+            max_depth = min(max_depth, self._max_depth)
+        for depth in range(1, max_depth + 1):
+            first = best[0]
+            order = [first] + [c for c in playable if c != first]
+            try:
+                best = self._root(position, order, depth)
+            except _BudgetExceeded:
+                break
+            self._depth = depth
+            if best[1] != 0:
+                break
+        self._elapsed = time.perf_counter() - self._start
+        return best
+
+    def _root(self, position, order, depth):
+        current = position.current
+        mask = position.mask
+        moves = position.moves
+        alpha = -self._cells - 1
+        beta = self._cells + 1
+        best = order[0]
+        for column in order:
+            played = (mask + self._bottoms[column]) & self._columns[column]
+            if is_winning_mask(current | played, self._height,
+                               self._win_count):
+                return column, self._cells - moves
+        for column in order:
+            score = -self._negamax(current ^ mask,
+                                   mask | (mask + self._bottoms[column]),
+                                   moves + 1, depth - 1, -beta, -alpha)
+            if score > alpha:
+                alpha = score
+                best = column
+        return best, alpha
+
+    def _negamax(self, current, mask, moves, depth, alpha, beta):
+        """
+        Returns score of position for the player to move
+        """
+        self._nodes += 1
+        self._check_budget()
+        table = self._table
+        first = None
+        if table is not None:
+            key = current + mask
+            entry = table.probe(key)
+            if entry is not None:
+                score, bound, entry_depth, first = entry
+                if entry_depth >= depth:
+                    if bound == EXACT:
+                        return score
+                    if bound == LOWER and score > alpha:
+                        alpha = score
+                    elif bound == UPPER and score < beta:
+                        beta = score
+                    if alpha >= beta:
+                        return score
+        playable = []
+        for column in self._order:
+            if mask & self._tops[column]:
+                continue
+            played = (mask + self._bottoms[column]) & self._columns[column]
+            if is_winning_mask(current | played, self._height,
+                               self._win_count):
+                return self._cells - moves
+            playable.append(column)
+        if depth == 0 or not playable:
+            return 0
+        if first in playable:
+            playable.remove(first)
+            playable.insert(0, first)
+        start_alpha = alpha
+        best_score = None
+        for column in playable:
+            score = -self._negamax(current ^ mask,
+                                   mask | (mask + self._bottoms[column]),
+                                   moves + 1, depth - 1, -beta, -alpha)
+            if best_score is None or score > best_score:
+                best_score = score
+                best_move = column
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        if table is not None:
+            if best_score <= start_alpha:
+                bound = UPPER
+            elif best_score >= beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            table.store(key, best_score, bound, depth, best_move)
+        return best_score
@@ -0,0 +1,483 @@
+from .game import Game
+from .player import Player
+from .bot import Bot, SearchBot
+from .score import Score
+from .database import (LazyDatabase, HighscoresDatabase,
+                       read_player_stats_from_file)
+from .scheduler import BotMoveScheduler
+from .config import (BOT_TIME_LIMIT, HIGHSCORES_LIMIT, SERVER_HOST,
+                     SERVER_PORT, SERVER_TABLE_MEMORY, SERVER_SCHEDULER)
+from .errors import (ColumnIsFullError, ColumnOutOfRangeError,
+                     DatabasePathNotFound, FileIsEmptyError, InvalidDataError,
+                     InvalidNameError, InvalidRequestError,
+                     MoveCancelledError)
+from . import instrumentation
+import argparse
+import asyncio
+import itertools
+import json
+
+
+TOO_LONG = object()
+
+
+def is_number(value):
+    """
+    Returns True if value read from json request is an integer,
+    json true and false are not numbers
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class Session:
+    """
+    Class Session. One game hosted by the server.
+    Contains attributes:
+
+    :param id: id of the session
+    :type id: int
+
+    :param game: played game
+    :type game: Game
+
+    :param winner: winner of finished game, None if there is no winner
+    :type winner: Player
+
+    :param finished: True if game has ended with win or draw
+    :type finished: bool
+
+    :param lock: lock held while move is made or game is saved
+    :type lock: asyncio.Lock
+    """
+    def __init__(self, id, game):
+        self._id = id
+        self._game = game
+        self._winner = None
+        self._finished = False
+        self._lock = asyncio.Lock()
+
+    def id(self):
+        return self._id
+
+    def game(self):
+        return self._game
+
+    def version(self):
+        """
+        Returns count of changes of the board made so far
+        """
+        return self._game.board().renderer().version()
+
+    def winner(self):
+        return self._winner
+
+    def finished(self):
+        return self._finished
+
+    def lock(self):
+        return self._lock
+
+    def mode(self):
+        if any(isinstance(player, Bot) for player in self._game.players()):
+            return 'pvb'
+        return 'pvp'
+
+    def play(self, column):
+        """
+        Inserts current player's sign to given column (numbered from 1)
+        Returns tuple of winner and his count of moves, or False
+        Raises InvalidRequestError if game has ended or column is invalid
+        """
+        if self._finished:
+            raise InvalidRequestError('Game has ended')
+        game = self._game
+        player = game.current_player()
+        try:
+            game.board().insert_player_sign(column, player.sign())
+        except (ColumnIsFullError, ColumnOutOfRangeError) as e:
+            raise InvalidRequestError(str(e)) from e
+        winner = game.check_winner()
+        if winner:
+            self._winner = winner[0]
+            self._finished = True
+        elif ' ' not in game.board().board()[0]:
+            self._finished = True
+        else:
+            game.toggle()
+        return winner
+
+    def state(self, since=None):
+        """
+        Returns dict describing the session, sent to clients
+        If version of the board known by client is given as since,
+        only cells changed after it are sent instead of whole board
+        """
+        game = self._game
+        renderer = game.board().renderer()
+        if since is not None:
+            return {
+                'session': self._id,
+                'version': renderer.version(),
+                'changes': [list(change)
+                            for change in renderer.changes(since)],
+                'current_player': game.current_player().name(),
+                'finished': self._finished,
+                'winner': self._winner.name() if self._winner else None,
+            }
+        players = [{'name': player.name(), 'sign': player.sign(),
+                    'is_bot': isinstance(player, Bot)}
+                   for player in game.players()]
+        return {
+            'session': self._id,
+            'game_id': game.id(),
+            'mode': self.mode(),
+            'players': players,
+            'current_player': game.current_player().name(),
+            'board': [''.join(row) for row in game.board().board()],
+            'version': renderer.version(),
+            'finished': self._finished,
+            'winner': self._winner.name() if self._winner else None,
+        }
+
+
+class GameServer:
+    """
+    Class GameServer. Hosts many games in one asyncio event loop.
+    Clients send one json object per line, with 'command' key,
+    and get one json object per line, with 'ok' key. Disk operations
+    run in executor threads, so they do not stop other games.
+    Contains attributes:
+
+    :param games_path: path of games database file
+    :type games_path: str
+
+    :param highscores_path: path of highscores file
+    :type highscores_path: str
+
+    :param bot_time_limit: seconds of search for one bot's move
+    :type bot_time_limit: float
+
+    :param bot_table_memory: bytes of transposition table of one bot,
+        kept small, because every hosted bot has its own table
+    :type bot_table_memory: int
+
+    :param sessions: hosted sessions mapped by their ids
+    :type sessions: dict
+
+    :param scheduler: computes bots' moves outside of event loop,
+        None creates scheduler of SERVER_SCHEDULER kind
+    :type scheduler: BotMoveScheduler
+    """
+    def __init__(self, games_path='database.json',
+                 highscores_path='highscores.json',
+                 bot_time_limit=BOT_TIME_LIMIT,
+                 bot_table_memory=SERVER_TABLE_MEMORY, scheduler=None):
+        self._games_path = games_path
+        self._highscores_path = highscores_path
+        self._bot_time_limit = bot_time_limit
+        self._bot_table_memory = bot_table_memory
+        if scheduler is None:
+            scheduler = BotMoveScheduler(SERVER_SCHEDULER)
+        self._scheduler = scheduler
+        self._sessions = {}
+        self._ids = itertools.count()
+        self._commands = {
+            'new': self._new,
+            'move': self._move,
+            'state': self._state,
+            'save': self._save,
+            'load': self._load,
+            'close': self._close,
+            'highscores': self._highscores,
+            'stats': self._stats,
+        }
+
+    def sessions(self):
+        return self._sessions
+
+    def scheduler(self):
+        return self._scheduler
+
+    def close(self):
+        """
+        Stops workers computing bots' moves
+        """
+        self._scheduler.close()
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    def _session(self, request):
+        try:
+            return self._sessions[request['session']]
+        except (KeyError, TypeError):
+            raise InvalidRequestError('Unknown session')
+
+    def _add_session(self, game, owned):
+        session = Session(next(self._ids), game)
+        self._sessions[session.id()] = session
+        owned.add(session.id())
+        return session
+
+    async def handle_request(self, request, owned=None):
+        """
+        Handles one request of a client
+        Returns response dict
+        """
+        owned = set() if owned is None else owned
+        try:
+            if not isinstance(request, dict):
+                raise InvalidRequestError('Request has to be json object')
+            command = request.get('command')
+            if not isinstance(command, str):
+                raise InvalidRequestError('Unknown command')
+            command = self._commands.get(command)
+            if command is None:
+                raise InvalidRequestError('Unknown command')
+            response = await command(request, owned)
+        except InvalidRequestError as e:
+            return {'ok': False, 'error': str(e)}
+        except (OSError, InvalidDataError) as e:
+            return {'ok': False, 'error': f'Database error: {e}'}
+        response['ok'] = True
+        return response
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one connected client until it disconnects
+        Sessions created by the client are closed with the connection
+        """
+        owned = set()
+        try:
+            while True:
+                line = await self._read_line(reader)
+                if not line:
+                    break
+                if line is TOO_LONG:
+                    response = {'ok': False, 'error': 'Request is too long'}
+                    writer.write(json.dumps(response).encode() + b'\n')
+                    await writer.drain()
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {'ok': False, 'error': 'Invalid json'}
+                else:
+                    response = await self.handle_request(request, owned)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for id in owned:
+                self._sessions.pop(id, None)
+                self._scheduler.cancel(id)
+            writer.close()
+
+    async def _read_line(self, reader):
+        """
+        Returns one line sent by client, empty bytes when client
+        disconnects, or TOO_LONG if the line does not fit in reader's
+        buffer. Too long line is read and dropped in parts
+        """
+        too_long = False
+        while True:
+            try:
+                line = await reader.readuntil(b'\n')
+            except asyncio.IncompleteReadError as e:
+                line = e.partial
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+                too_long = True
+                continue
+            return TOO_LONG if too_long else line
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        """
+        Starts listening for clients
+        Returns asyncio.Server object
+        """
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def _new(self, request, owned):
+        mode = request.get('mode', 'pvp')
+        try:
+            players = [Player(item['name'], item['sign'])
+                       for item in request['players']]
+            if mode == 'pvb':
+                players.append(SearchBot(request['bot_sign'],
+                                         self._bot_time_limit,
+                                         table_memory=self._bot_table_memory))
+        except (KeyError, TypeError, InvalidNameError):
+            raise InvalidRequestError('Invalid players')
+        if not all(isinstance(player.name(), str) for player in players):
+            raise InvalidRequestError('Invalid players')
+        if mode not in ('pvp', 'pvb') or len(players) != 2:
+            raise InvalidRequestError('Game needs two players')
+        signs = [player.sign() for player in players]
+        valid = all(isinstance(sign, str) and len(sign) == 1
+                    and sign != ' ' for sign in signs)
+        if not valid or len(set(signs)) != 2:
+            raise InvalidRequestError(
+                'Players need different one letter signs')
+        if players[0].name() == players[1].name():
+            raise InvalidRequestError('Players\' names cannot be the same')
+        game = Game(players)
+        game.choose_first_player()
+        session = self._add_session(game, owned)
+        await self._play_bot(session)
+        return session.state()
+
+    async def _play_bot(self, session):
+        """
+        Makes moves of bot until it is other player's turn
+        """
+        game = session.game()
+        while (not session.finished()
+               and isinstance(game.current_player(), Bot)):
+            try:
+                column = await self._scheduler.choose_column(game,
+                                                             session.id())
+            except MoveCancelledError:
+                raise InvalidRequestError('Game has been closed')
+            session.play(column)
+
+    async def _move(self, request, owned):
+        session = self._session(request)
+        column = request.get('column')
+        if not is_number(column):
+            raise InvalidRequestError('Column has to be a number')
+        async with session.lock():
+            if isinstance(session.game().current_player(), Bot):
+                raise InvalidRequestError('It is bot\'s turn')
+            winner = session.play(column)
+            if winner and session.mode() == 'pvp':
+                score = Score(winner[0].name(), winner[1])
+                await self._run(self._add_score, score)
+            await self._play_bot(session)
+        return session.state()
+
+    def _add_score(self, score):
+        highscores = HighscoresDatabase()
+        highscores.update_file(self._highscores_path,
+                               lambda db: db.add_score(score))
+
+    async def _state(self, request, owned):
+        since = request.get('since')
+        if since is not None and (not is_number(since) or since < 0):
+            raise InvalidRequestError('Version has to be a number')
+        session = self._session(request)
+        if since is not None and since > session.version():
+            raise InvalidRequestError('Unknown version of the board')
+        return session.state(since)
+
+    async def _save(self, request, owned):
+        session = self._session(request)
+        async with session.lock():
+            await self._run(self._save_game, session.game())
+        return session.state()
+
+    def _save_game(self, game):
+        with LazyDatabase() as database:
+            database.update_file(self._games_path,
+                                 lambda db: db.add_game(game))
+
+    async def _load(self, request, owned):
+        id = request.get('id')
+        if not is_number(id):
+            raise InvalidRequestError('Unknown game')
+        game = await self._run(self._load_game, id)
+        if not game:
+            raise InvalidRequestError('Unknown game')
+        for player in game.players():
+            if isinstance(player, SearchBot):
+                player.search().set_time_limit(self._bot_time_limit)
+                player.set_table_memory(self._bot_table_memory)
+        session = self._add_session(game, owned)
+        await self._play_bot(session)
+        return session.state()
+
+    def _load_game(self, id):
+        with LazyDatabase() as database:
+            try:
+                database.read_from_file(self._games_path)
+            except (DatabasePathNotFound, FileIsEmptyError):
+                return False
+            return database.get_game_by_id(id)
+
+    async def _close(self, request, owned):
+        session = self._session(request)
+        del self._sessions[session.id()]
+        owned.discard(session.id())
+        self._scheduler.cancel(session.id())
+        return {'session': session.id()}
+
+    async def _highscores(self, request, owned):
+        limit = request.get('limit', HIGHSCORES_LIMIT)
+        if not is_number(limit) or limit < 0:
+            raise InvalidRequestError('Limit has to be a number')
+        scores = await self._run(self._read_highscores)
+        return {'scores': [{'player_name': score.player_name(),
+                            'moves': score.moves()}
+                           for score in scores[:limit]]}
+
+    def _read_highscores(self):
+        highscores = HighscoresDatabase()
+        try:
+            highscores.read_from_file(self._highscores_path)
+        except (DatabasePathNotFound, FileIsEmptyError):
+            return []
+        return highscores.scores()
+
+    async def _stats(self, request, owned):
+        name = request.get('name')
+        if not isinstance(name, str):
+            raise InvalidRequestError('Unknown player')
+        stats = await self._run(self._read_stats, name)
+        if stats is None:
+            raise InvalidRequestError('Unknown player')
+        return {'name': stats.name(), 'wins': stats.wins(),
+                'best': stats.best(), 'average': stats.average()}
+
+    def _read_stats(self, name):
+        try:
+            stats = read_player_stats_from_file(self._highscores_path)
+        except (DatabasePathNotFound, FileIsEmptyError):
+            return None
+        return stats.player_stats(name)
+
+
+async def serve(host, port, server):
+    listener = await server.start(host, port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description='Hosts Connect4 games for many clients')
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--games', default='database.json',
+                        help='games database file')
+    parser.add_argument('--highscores', default='highscores.json',
+                        help='highscores file')
+    parser.add_argument('--bot-time-limit', type=float,
+                        default=BOT_TIME_LIMIT)
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(arguments)
+    if args.metrics:
+        instrumentation.start(args.metrics, args.metrics_file)
+    server = GameServer(args.games, args.highscores, args.bot_time_limit)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
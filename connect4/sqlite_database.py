@@ -0,0 +1,139 @@
+from .game import Game
+from .classes_io import write_game_data, read_game_data
+from .errors import DatabasePathNotFound, DatabasePermissionError
+import json
+import sqlite3
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player1_name TEXT NOT NULL,
+    player1_sign TEXT NOT NULL,
+    player1_is_bot INTEGER NOT NULL,
+    player2_name TEXT NOT NULL,
+    player2_sign TEXT NOT NULL,
+    player2_is_bot INTEGER NOT NULL,
+    current_player TEXT NOT NULL,
+    board TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_player1_name ON games (player1_name);
+CREATE INDEX IF NOT EXISTS games_player2_name ON games (player2_name);
+"""
+
+COLUMNS = ('id, player1_name, player1_sign, player1_is_bot, player2_name, '
+           'player2_sign, player2_is_bot, current_player, board')
+
+
+def _row_to_data(row):
+    """
+    Returns data of a game in the format used by json database
+    """
+    return {
+        'id': row[0],
+        'player1': {'name': row[1], 'sign': row[2], 'is_bot': bool(row[3])},
+        'player2': {'name': row[4], 'sign': row[5], 'is_bot': bool(row[6])},
+        'current_player': row[7],
+        'board': json.loads(row[8]),
+    }
+
+
+def _data_to_row(data):
+    return (data['id'],
+            data['player1']['name'], data['player1']['sign'],
+            int(data['player1']['is_bot']),
+            data['player2']['name'], data['player2']['sign'],
+            int(data['player2']['is_bot']),
+            data['current_player'],
+            json.dumps(data['board'], separators=(',', ':')))
+
+
+class SqliteDatabase:
+    """
+    Class SqliteDatabase. Keeps every game in its own row of SQLite
+    database, so saving, loading and removing a game does not touch
+    other games. Has the same interface as Database.
+    Contains attributes:
+
+    :param path: path of SQLite database file
+    :type path: str
+    """
+    def __init__(self, path=':memory:'):
+        self._path = path
+        try:
+            self._connection = sqlite3.connect(path)
+            self._connection.executescript(SCHEMA)
+        except sqlite3.OperationalError as e:
+            if 'readonly' in str(e):
+                raise DatabasePermissionError(
+                    "No permission to open database") from e
+            raise DatabasePathNotFound("Invalid path") from e
+
+    def path(self):
+        return self._path
+
+    def games(self):
+        """
+        Returns list of all games
+        """
+        rows = self._connection.execute(
+            f'SELECT {COLUMNS} FROM games ORDER BY id')
+        return [read_game_data(_row_to_data(row)) for row in rows]
+
+    def games_of_player(self, name):
+        """
+        Returns list of games played by player of given name
+        """
+        rows = self._connection.execute(
+            f'SELECT {COLUMNS} FROM games WHERE player1_name = ? '
+            f'UNION SELECT {COLUMNS} FROM games WHERE player2_name = ? '
+            'ORDER BY id', (name, name))
+        return [read_game_data(_row_to_data(row)) for row in rows]
+
+    def add_game(self, game: Game):
+        """
+        Adds game to database, or overwrites it if it has an id
+        Sets id of new game
+        """
+        data = write_game_data(game, game.id())
+        with self._connection:
+            cursor = self._connection.execute(
+                f'INSERT OR REPLACE INTO games ({COLUMNS}) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', _data_to_row(data))
+        game._id = cursor.lastrowid if game.id() is None else game.id()
+
+    def remove_game(self, game):
+        """
+        Removes game from database
+        """
+        if game:
+            with self._connection:
+                cursor = self._connection.execute(
+                    'DELETE FROM games WHERE id = ?', (game.id(),))
+            if cursor.rowcount:
+                return True
+        raise ValueError('Cannot find game in games list')
+
+    def get_game_by_id(self, id):
+        """
+        returns game of given id
+        returns False if given id is invalid
+        """
+        row = self._connection.execute(
+            f'SELECT {COLUMNS} FROM games WHERE id = ?', (id,)).fetchone()
+        if row is None:
+            return False
+        return read_game_data(_row_to_data(row))
+
+    def print_saved_games(self):
+        """
+        Prints games in database
+        """
+        print('Saved games:')
+        rows = self._connection.execute(
+            'SELECT id, player1_name, player2_name FROM games ORDER BY id')
+        for id, player1_name, player2_name in rows:
+            print(f'{id} : {player1_name} vs {player2_name}')
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,165 @@
+from .config import TABLE_MEMORY
+from array import array
+import random
+
+
+EXACT = 1
+LOWER = 2
+UPPER = 3
+
+KEY_MASK = (1 << 64) - 1
+
+# bytes taken by one entry: key, score, depth, move and bound type
+ENTRY_SIZE = 8 + 2 + 2 + 2 + 1
+
+
+class ZobristHash:
+    """
+    Class ZobristHash. Hashes NumPy arrays of signs used by Board,
+    so positions of any Game can be stored in TranspositionTable.
+    Contains attributes:
+
+    :param width: width of the board
+    :type width: int
+
+    :param height: height of the board
+    :type height: int
+
+    :param signs: signs of both players
+    :type signs: list
+
+    :param codes: random 64-bit code of every sign on every cell
+    :type codes: list
+    """
+    def __init__(self, width, height, signs, seed=0):
+        generator = random.Random(seed)
+        self._width = width
+        self._height = height
+        self._signs = list(signs)
+        self._codes = [[[generator.getrandbits(64) for _ in range(width)]
+                        for _ in range(height)]
+                       for _ in self._signs]
+
+    def signs(self):
+        return self._signs
+
+    def code(self, row, column, sign):
+        return self._codes[self._signs.index(sign)][row][column]
+
+    def hash_array(self, array):
+        """
+        Returns hash of whole NumPy array of signs
+        """
+        key = 0
+        for slot, sign in enumerate(self._signs):
+            codes = self._codes[slot]
+            for row, column in zip(*(array == sign).nonzero()):
+                key ^= codes[row][column]
+        return key
+
+    def update(self, key, row, column, sign):
+        """
+        Returns hash after putting (or removing) sign on given cell
+        """
+        return key ^ self.code(row, column, sign)
+
+
+class TranspositionTable:
+    """
+    Class TranspositionTable. Fixed-size table of searched positions
+    kept in flat arrays, so its memory never grows above given cap.
+    Position with key k is kept only in slot k % size, keys longer
+    than 64 bits are compared by their lowest 64 bits.
+    Contains attributes:
+
+    :param memory: maximal memory of the table in bytes
+    :type memory: int
+
+    :param replace: 'depth' keeps entry searched deeper when two
+        positions share a slot, 'always' keeps the newest one
+    :type replace: str
+
+    :param hits: count of probes which found the position
+    :type hits: int
+
+    :param misses: count of probes which found an empty slot
+    :type misses: int
+
+    :param collisions: count of probes which found other position
+    :type collisions: int
+    """
+    def __init__(self, memory=TABLE_MEMORY, replace='depth'):
+        if replace not in ('depth', 'always'):
+            raise ValueError('Replace policy has to be depth or always')
+        size = max(1, memory // ENTRY_SIZE)
+        self._size = size
+        self._replace = replace
+        self.clear()
+
+    def size(self):
+        return self._size
+
+    def hits(self):
+        return self._hits
+
+    def misses(self):
+        return self._misses
+
+    def collisions(self):
+        return self._collisions
+
+    def stats(self):
+        return {
+            'size': self.size(),
+            'hits': self.hits(),
+            'misses': self.misses(),
+            'collisions': self.collisions(),
+        }
+
+    def clear(self):
+        """
+        Removes all entries and resets counters
+        """
+        size = self._size
+        self._keys = array('Q', bytes(8 * size))
+        self._scores = array('h', bytes(2 * size))
+        self._depths = array('h', bytes(2 * size))
+        self._moves = array('h', bytes(2 * size))
+        self._bounds = array('b', bytes(size))
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+
+    def probe(self, key):
+        """
+        Returns tuple of score, bound type, depth and best move
+        of given position
+        Returns None if position is not in the table
+        """
+        index = key % self._size
+        if not self._bounds[index]:
+            self._misses += 1
+            return None
+        if self._keys[index] != key & KEY_MASK:
+            self._collisions += 1
+            return None
+        self._hits += 1
+        return (self._scores[index], self._bounds[index],
+                self._depths[index], self._moves[index])
+
+    def store(self, key, score, bound, depth, move):
+        """
+        Stores position, when its slot is taken by other position,
+        replaces it according to the replace policy
+        """
+        index = key % self._size
+        key &= KEY_MASK
+        if (self._replace == 'depth' and self._bounds[index]
+                and self._keys[index] != key
+                and self._depths[index] > depth):
+            return
+        self._keys[index] = key
+        self._scores[index] = score
+        self._bounds[index] = bound
+        self._depths[index] = depth
+        self._moves[index] = move
@@ -0,0 +1,61 @@
+from connect4.arena import Arena, play_game, bot_factory
+from connect4.bot import Bot, SearchBot
+from connect4.config import WIDTH, HEIGHT
+from functools import partial
+import json
+import pytest
+
+
+class _FullColumnBot(Bot):
+    def choose_column(self, width):
+        return 1
+
+
+def test_play_game():
+    result = play_game(0, [Bot, Bot])
+    assert result['first'] == 1
+    assert result['winner'] in (None, 1, 2)
+    assert 0 < result['moves'] <= WIDTH * HEIGHT
+    assert len(result['move_times']) == result['moves']
+
+
+def test_play_game_forfeit():
+    result = play_game(1, [_FullColumnBot, _FullColumnBot])
+    assert result['first'] == 2
+    assert result['forfeit'] is True
+    assert result['winner'] == 1
+    assert result['moves'] == HEIGHT + 1
+
+
+def test_arena_invalid():
+    with pytest.raises(ValueError):
+        Arena([Bot])
+
+
+def test_arena_run(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    search = partial(SearchBot, time_limit=None, max_depth=2)
+    summary = Arena([search, Bot], workers=0).run(4, path)
+    lines = path.read_text().splitlines()
+    assert len(lines) == 4
+    assert summary['games'] == 4
+    assert summary['wins'][0] + summary['wins'][1] + summary['draws'] == 4
+    results = [json.loads(line) for line in lines]
+    assert summary['moves'] == sum(result['moves'] for result in results)
+    assert results[0]['game'] == 0
+
+
+def test_arena_run_processes(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    summary = Arena([Bot, Bot], workers=2).run(6, path)
+    games = sorted(json.loads(line)['game']
+                   for line in path.read_text().splitlines())
+    assert games == list(range(6))
+    assert summary['games'] == 6
+
+
+def test_bot_factory():
+    assert bot_factory('random', 1.0) is Bot
+    assert isinstance(bot_factory('search', 1.0)('x'), SearchBot)
+    with pytest.raises(ValueError):
+        bot_factory('human', 1.0)
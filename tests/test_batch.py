@@ -0,0 +1,88 @@
+from connect4.batch import BoardBatch, ONGOING, FIRST_WON, SECOND_WON, DRAW
+from connect4.game import Game
+from connect4.player import Player
+from connect4.config import HEIGHT, WIDTH
+import numpy as np
+import random
+
+
+def test_batch_create():
+    batch = BoardBatch(5)
+    assert batch.boards().shape == (5, HEIGHT, WIDTH)
+    assert batch.boards().dtype == np.int8
+    assert (batch.status() == ONGOING).all()
+
+
+def test_batch_apply_moves():
+    batch = BoardBatch(3)
+    status, accepted = batch.apply_moves([1, 0, 8])
+    assert accepted.tolist() == [True, False, False]
+    assert status.tolist() == [ONGOING] * 3
+    assert batch.board(0, 'xo')[HEIGHT-1][0] == 'x'
+    assert batch.moves().tolist() == [1, 0, 0]
+    assert batch.current().tolist() == [2, 1, 1]
+
+
+def test_batch_full_column_rejected():
+    batch = BoardBatch(1)
+    for _ in range(HEIGHT):
+        batch.apply_moves([2])
+    status, accepted = batch.apply_moves([2])
+    assert accepted.tolist() == [False]
+
+
+def test_batch_wins():
+    batch = BoardBatch(2)
+    for columns in [[1, 1], [1, 2], [2, 1], [1, 2], [3, 3], [1, 2], [4, 5],
+                    [0, 2]]:
+        status, _ = batch.apply_moves(columns)
+    assert status.tolist() == [FIRST_WON, SECOND_WON]
+    status, accepted = batch.apply_moves([5, 5])
+    assert accepted.tolist() == [False, False]
+
+
+def test_batch_draw():
+    batch = BoardBatch(1, width=2, height=2, win_count=3)
+    for column in [1, 1, 2, 2]:
+        status, _ = batch.apply_moves([column])
+    assert status.tolist() == [DRAW]
+
+
+def test_batch_same_as_game():
+    random.seed(5)
+    count = 64
+    batch = BoardBatch(count)
+    games = [Game([Player('1', 'x'), Player('2', 'o')]) for _ in range(count)]
+    results = [False] * count
+    for _ in range(WIDTH * HEIGHT):
+        columns = []
+        for index, game in enumerate(games):
+            array = game.board().board()
+            free = [column for column in range(1, WIDTH+1)
+                    if array[0][column-1] == ' ']
+            if results[index] or not free:
+                columns.append(0)
+                continue
+            column = random.choice(free)
+            sign = 'x' if batch.current()[index] == 1 else 'o'
+            game.board().insert_player_sign(column, sign)
+            results[index] = game.check_winner()
+            columns.append(column)
+        status, _ = batch.apply_moves(columns)
+    for index, game in enumerate(games):
+        assert np.array_equal(batch.board(index, 'xo'), game.board().board())
+        if results[index] and results[index][0].sign() == 'x':
+            expected = FIRST_WON
+        elif results[index]:
+            expected = SECOND_WON
+        else:
+            expected = DRAW
+        assert status[index] == expected
+
+
+def test_batch_reset():
+    batch = BoardBatch(2)
+    batch.apply_moves([1, 1])
+    batch.reset([0])
+    assert batch.moves().tolist() == [0, 1]
+    assert not batch.boards()[0].any()
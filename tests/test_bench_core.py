@@ -0,0 +1,28 @@
+from benchmarks.bench_core import compare, main, sized_cases, SIZED_CASES
+import json
+
+
+def write_results(path, results):
+    data = {'results': {name: {'seconds': seconds, 'number': 1}
+                        for name, seconds in results.items()}}
+    with open(path, 'w') as file_handle:
+        json.dump(data, file_handle)
+    return data
+
+
+def test_compare_flags_regressions(tmp_path):
+    baseline = write_results(tmp_path / 'baseline.json',
+                             {'a': 1.0, 'b': 1.0, 'old': 1.0})
+    current = write_results(tmp_path / 'current.json',
+                            {'a': 1.05, 'b': 1.5, 'new': 1.0})
+    rows = compare(baseline, current, 0.1)
+    assert [(row[0], row[4]) for row in rows] == [('a', False), ('b', True)]
+    arguments = ['compare', str(tmp_path / 'baseline.json'),
+                 str(tmp_path / 'current.json')]
+    assert main(arguments) == 1
+    assert main(arguments + ['--threshold', '0.6']) == 0
+
+
+def test_sized_cases_names(tmp_path):
+    cases = sized_cases(2, str(tmp_path))
+    assert list(cases) == [f'{name}.2' for name in SIZED_CASES]
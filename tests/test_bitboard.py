@@ -0,0 +1,96 @@
+from connect4.bitboard import BitBoard
+from connect4.board import Board
+from connect4.game import Game
+from connect4.player import Player
+from connect4.errors import (ColumnIsFullError, ColumnOutOfRangeError,
+                             InvalidDataError, InvalidSignError)
+from connect4.config import HEIGHT, WIDTH
+import numpy as np
+import pytest
+
+
+def test_bitboard_create():
+    board = BitBoard()
+    assert board.height() == HEIGHT
+    assert board.width() == WIDTH
+    assert board.board().shape == (HEIGHT, WIDTH)
+    assert str(board) == str(Board())
+
+
+def test_bitboard_insert_player_sign_normal():
+    board = BitBoard()
+    board.insert_player_sign(3, 'x')
+    assert board.insert_player_sign(3, 'o') is True
+    assert board.board()[HEIGHT-1][2] == 'x'
+    assert board.board()[HEIGHT-2][2] == 'o'
+    assert board.heights()[2] == 2
+
+
+def test_bitboard_insert_player_sign_invalid_col():
+    board = BitBoard()
+    with pytest.raises(ColumnOutOfRangeError):
+        board.insert_player_sign(8, 'o')
+
+
+def test_bitboard_insert_player_sign_full_column():
+    board = BitBoard()
+    for _ in range(6):
+        board.insert_player_sign(3, 'x')
+    with pytest.raises(ColumnIsFullError):
+        board.insert_player_sign(3, 'x')
+
+
+def test_bitboard_insert_third_sign():
+    board = BitBoard()
+    board.insert_player_sign(1, 'x')
+    board.insert_player_sign(1, 'o')
+    with pytest.raises(InvalidSignError):
+        board.insert_player_sign(1, 'l')
+
+
+def test_bitboard_same_as_board():
+    board = Board()
+    bitboard = BitBoard()
+    for column in [4, 4, 3, 5, 1, 7, 7, 2, 4, 4]:
+        sign = 'x' if column % 2 else 'o'
+        board.insert_player_sign(column, sign)
+        bitboard.insert_player_sign(column, sign)
+    assert np.array_equal(board.board(), bitboard.board())
+    assert str(board) == str(bitboard)
+
+
+def test_bitboard_from_array():
+    board = Board()
+    for column in [1, 2, 2, 3, 3, 3]:
+        board.insert_player_sign(column, 'o')
+    board.insert_player_sign(3, 'x')
+    bitboard = BitBoard(board.board())
+    assert np.array_equal(bitboard.board(), board.board())
+    assert bitboard.heights() == [1, 2, 4, 0, 0, 0, 0]
+
+
+def test_bitboard_from_invalid_array():
+    array = np.full((HEIGHT, WIDTH), ' ')
+    array[0][0] = 'x'
+    with pytest.raises(InvalidDataError):
+        BitBoard(array)
+
+
+def test_bitboard_winning_sign():
+    board = BitBoard()
+    for column in [1, 2, 3]:
+        board.insert_player_sign(column, 'x')
+        board.insert_player_sign(column, 'o')
+    assert board.winning_sign() is False
+    board.insert_player_sign(4, 'x')
+    assert board.winning_sign() == 'x'
+
+
+def test_game_with_bitboard():
+    player1 = Player('1', 'x')
+    player2 = Player('2', 'o')
+    game = Game([player1, player2], board=BitBoard())
+    for _ in range(4):
+        game.board().insert_player_sign(3, 'o')
+    assert game.check_vertical() == 'o'
+    assert game.check_winner() == (player2, 4)
@@ -2,7 +2,7 @@ from connect4.player import Player
 from connect4.bot import Bot
 from connect4.game import Game
 from connect4.board import Board
-from connect4.score import Score
+from connect4.score import Score, PlayerStats
 from connect4.errors import (InvalidNameError, InvalidPlayerCount,
                              ColumnIsFullError, ColumnOutOfRangeError)
 from connect4.config import HEIGHT, WIDTH
@@ -226,3 +226,54 @@ def test_score_str():
     assert score.moves() == 5
     assert score.player_name() == 'nazwa'
     assert str(score) == 'Winner: nazwa, Moves count: 5'
+
+
+def test_player_stats_str():
+    stats = PlayerStats('nazwa')
+    assert stats.average() is None
+    assert str(stats) == 'nazwa: wins: 0, best: -, average: -'
+    stats.add(6)
+    stats.add(9)
+    assert str(stats) == 'nazwa: wins: 2, best: 6, average: 7.5'
+
+
+def test_check_last_move_win():
+    player1 = Player('1', 'x')
+    player2 = Player('2', 'o')
+    game = Game([player1, player2])
+    for column in [1, 2, 4]:
+        game.board().insert_player_sign(column, 'x')
+    assert game.check_last_move() is False
+    game.board().insert_player_sign(3, 'x')
+    assert game.board().last_move() == (HEIGHT-1, 2)
+    assert game.check_last_move() == 'x'
+
+
+def test_check_winner_incremental_same_as_full():
+    player1 = Player('1', 'x')
+    player2 = Player('2', 'o')
+    random.seed(3)
+    for _ in range(50):
+        game = Game([player1, player2])
+        sign = 'x'
+        winner = False
+        while not winner:
+            free = [column for column in range(1, WIDTH+1)
+                    if game.board().board()[0][column-1] == ' ']
+            if not free:
+                break
+            game.board().insert_player_sign(random.choice(free), sign)
+            sign = 'o' if sign == 'x' else 'x'
+            winner = game.check_winner()
+            assert winner == game.check_winner(full=True)
+
+
+def test_check_winner_loaded_board():
+    player1 = Player('1', 'x')
+    player2 = Player('2', 'o')
+    game = Game([player1, player2])
+    for _ in range(4):
+        game.board().insert_player_sign(5, 'o')
+    loaded = Game([player1, player2], game.board().board().copy())
+    assert loaded.board().last_move() is None
+    assert loaded.check_winner() == (player2, 4)
@@ -1,7 +1,20 @@
 from connect4.player import Player
 from connect4.classes_io import (write_game, write_highscores, write_to_json,
-                                 read_highscores, read_games, read_from_json)
-from connect4.database import Database, HighscoresDatabase
+                                 read_highscores, read_games, read_from_json,
+                                 write_to_binary, read_from_binary,
+                                 pack_games_data, unpack_games_data,
+                                 BINARY_HEADER, BINARY_MAGIC,
+                                 stream_to_json, iter_json_array,
+                                 iter_from_json, write_game_data,
+                                 write_score_data, read_game_data,
+                                 read_score_data)
+from connect4.database import Database, HighscoresDatabase, BinaryDatabase
+from connect4.errors import InvalidDataError
+import io
+import json
+import os
+import numpy as np
+import pytest
 
 
 def test_read_from_json():
@@ -74,3 +87,113 @@ def test_write_highscores_to_json():
     assert hdb.scores()[3].moves() == 10
 
 
+def test_binary_round_trip_matches_json():
+    with open('tests/test_classes_io_read.json', 'r') as handle:
+        data = json.load(handle)
+    bot = dict(data[0], id=7, current_player='Bot',
+               player2={'name': 'Bot', 'sign': 'o', 'is_bot': True})
+    data.append(bot)
+    unpacked = unpack_games_data(pack_games_data(data))
+    assert len(unpacked) == len(data)
+    for item, other in zip(data, unpacked):
+        assert other['board'].tolist() == item['board']
+        assert dict(other, board=None) == dict(item, board=None)
+
+
+def test_binary_mixed_board_sizes():
+    with open('tests/test_classes_io_read.json', 'r') as handle:
+        data = json.load(handle)
+    small = dict(data[0], id=1, board=[['x', ' ', 'o'], ['x', 'o', ' ']])
+    data.append(small)
+    unpacked = unpack_games_data(pack_games_data(data))
+    assert unpacked[0]['board'].tolist() == data[0]['board']
+    assert unpacked[1]['board'].tolist() == small['board']
+
+
+def test_write_to_binary(tmp_path):
+    path = tmp_path / 'games.bin'
+    with open('tests/test_classes_io_read.json', 'r') as handle:
+        games = read_from_json(read_games, handle)
+    with open(path, 'wb') as handle:
+        write_to_binary(games, write_game, handle)
+    with open(path, 'rb') as handle:
+        loaded = read_from_binary(read_games, handle)
+    assert len(loaded) == len(games)
+    for game, other in zip(games, loaded):
+        assert game.id() == other.id()
+        assert game.current_player().name() == other.current_player().name()
+        assert np.array_equal(game.board().board(), other.board().board())
+    assert path.stat().st_size * 10 < os.path.getsize(
+        'tests/test_classes_io_read.json')
+
+
+def test_read_from_binary_invalid_data():
+    with pytest.raises(InvalidDataError):
+        read_from_binary(read_games, io.BytesIO(b'{"games": []}'))
+    packed = BINARY_HEADER.pack(BINARY_MAGIC, 1, 0) + b'\x00\x00'
+    with pytest.raises(InvalidDataError):
+        read_from_binary(read_games, io.BytesIO(packed))
+
+
+def test_binary_database(tmp_path):
+    path = str(tmp_path / 'games.bin')
+    with open('tests/test_classes_io_read.json', 'r') as handle:
+        games = read_from_json(read_games, handle)
+    BinaryDatabase(games).save_to_file(path)
+    db = BinaryDatabase()
+    db.read_from_file(path)
+    assert db.get_game_by_id(0).players()[0].name() == 'konrad'
+    assert db.get_game_by_id(0).board().board().shape == (6, 7)
+
+
+def test_stream_to_json_matches_write_to_json():
+    with open('tests/test_classes_io_read.json', 'r') as handle:
+        games = read_from_json(read_games, handle)
+    expected = io.StringIO()
+    write_to_json(games, write_game, expected)
+    result = io.StringIO()
+    count = stream_to_json(iter(games), write_game_data, result)
+    assert count == len(games)
+    assert result.getvalue() == expected.getvalue()
+
+    empty = io.StringIO()
+    stream_to_json(iter([]), write_score_data, empty)
+    assert json.loads(empty.getvalue()) == []
+
+
+def test_iter_json_array_small_chunks():
+    with open('tests/test_highscores_read.json', 'r') as handle:
+        expected = json.load(handle)
+    for chunk_size in (1, 3, 16, 4096):
+        with open('tests/test_highscores_read.json', 'r') as handle:
+            items = list(iter_json_array(handle, chunk_size))
+        assert items == expected
+    items = list(iter_json_array(io.StringIO(' [ 12 , [1, 2], "a" ] '), 1))
+    assert items == [12, [1, 2], 'a']
+
+
+def test_iter_json_array_numbers_split_between_chunks():
+    text = '[10.5, 2e3, -7, 1.25E-2 , true, null, "x"]'
+    for chunk_size in range(1, len(text) + 1):
+        items = list(iter_json_array(io.StringIO(text), chunk_size))
+        assert items == [10.5, 2e3, -7, 1.25e-2, True, None, 'x']
+    with pytest.raises(InvalidDataError):
+        list(iter_json_array(io.StringIO('[1 2]'), 1))
+
+
+def test_iter_from_json_yields_objects():
+    with open('tests/test_highscores_read.json', 'r') as handle:
+        scores = iter_from_json(read_score_data, handle, 5)
+        first = next(scores)
+        assert first.player_name() == 'konrad'
+        assert first.moves() == 4
+        assert len(list(scores)) == 4
+    with open('tests/test_classes_io_read.json', 'r') as handle:
+        games = list(iter_from_json(read_game_data, handle, 10))
+    assert games[0].players()[1].name() == 'maciej'
+
+
+def test_iter_json_array_invalid_data():
+    for text in ('{"a": 1}', '[1, 2', '[1 2]', '[1, }', '[1] 2', ''):
+        with pytest.raises(InvalidDataError):
+            list(iter_json_array(io.StringIO(text), 2))
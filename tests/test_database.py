@@ -1,7 +1,15 @@
-from connect4.database import Database, HighscoresDatabase
+from connect4.database import (Database, HighscoresDatabase, LazyDatabase,
+                               index_path, read_player_stats_from_file,
+                               WriteBehind, atomic_open)
+from connect4.errors import FileIsEmptyError
 from connect4.player import Player
 from connect4.game import Game
 from connect4.score import Score
+import json
+import numpy as np
+import pytest
+import time
+import os
 
 
 def test_database():
@@ -51,6 +59,55 @@ def test_database_remove_game():
     assert all(game in db.games() for game in games)
 
 
+def test_database_ids_survive_removal_and_save(tmp_path):
+    path = str(tmp_path / 'games.json')
+    games = create_saved_games(path)
+    db = Database()
+    db.read_from_file(path)
+    db.remove_game(db.get_game_by_id(1))
+    assert db.get_game_by_id(1) is False
+    game = Game([Player('new', 'x'), Player('bot', 'o')])
+    game._current_player = game.players()[0]
+    db.add_game(game)
+    assert game.id() == 3
+    db.save_to_file(path)
+
+    db = Database()
+    db.read_from_file(path)
+    assert [item.id() for item in db.games()] == [0, 2, 3]
+    loaded = db.get_game_by_id(2)
+    assert loaded.players()[0].name() == games[2].players()[0].name()
+    assert db.next_id() == 4
+
+
+def test_database_id_of_removed_last_game_not_reused(tmp_path):
+    path = str(tmp_path / 'games.json')
+    create_saved_games(path)
+    for database in (Database, LazyDatabase):
+        db = database()
+        db.read_from_file(path)
+        last = max(game.id() for game in db.games())
+        db.remove_game(db.get_game_by_id(last))
+        db.save_to_file(path)
+        db = database()
+        db.read_from_file(path)
+        game = Game([Player('new', 'x'), Player('bot', 'o')])
+        game._current_player = game.players()[0]
+        db.add_game(game)
+        assert game.id() == last + 1
+        db.save_to_file(path)
+
+
+def test_database_add_game_overwrites_same_id():
+    db = Database()
+    game = Game([Player('1', 'x'), Player('2', 'o')])
+    db.add_game(game)
+    db.add_game(game)
+    assert len(db.games()) == 1
+    with pytest.raises(ValueError):
+        db.remove_game(False)
+
+
 def test_highscores():
     score1 = Score('1', 5)
     score2 = Score('2', 10)
@@ -82,3 +139,265 @@ def test_highscores_sort_scores():
     assert db.scores()[0] == score1
     assert db.scores()[1] == score3
     assert db.scores()[2] == score2
+
+
+def test_highscores_keeps_best_scores():
+    db = HighscoresDatabase(limit=3)
+    scores = [Score(str(moves), moves) for moves in (9, 4, 12, 7, 4, 20)]
+    kept = [db.add_score(score) for score in scores]
+    assert kept == [True, True, True, True, True, False]
+    assert [score.moves() for score in db.scores()] == [4, 4, 7]
+    assert db.scores()[0] is scores[1]
+    assert [score.moves() for score in db.dropped()] == [12, 9, 20]
+
+
+def test_highscores_save_archives_dropped_scores(tmp_path):
+    path = str(tmp_path / 'highscores.json')
+    archive = str(tmp_path / 'archive.jsonl')
+    db = HighscoresDatabase([Score('1', 8), Score('2', 5)], limit=1,
+                            archive=archive)
+    db.save_to_file(path)
+    assert db.dropped() == []
+    loaded = HighscoresDatabase(limit=5)
+    loaded.read_from_file(path)
+    assert [score.player_name() for score in loaded.scores()] == ['2']
+    with open(archive) as file_handle:
+        assert [json.loads(line) for line in file_handle] == [
+            {'player_name': '1', 'moves': 8}]
+
+
+def test_highscores_trims_scores_of_file(tmp_path):
+    path = str(tmp_path / 'highscores.json')
+    archive = str(tmp_path / 'archive.jsonl')
+    scores = [Score(str(moves), moves) for moves in (9, 4, 12, 7)]
+    HighscoresDatabase(scores, limit=None).save_to_file(path)
+    loaded = HighscoresDatabase(limit=2, archive=archive)
+    loaded.read_from_file(path)
+    assert [score.moves() for score in loaded.scores()] == [4, 7]
+    assert [score.moves() for score in loaded.dropped()] == [12, 9]
+    assert loaded.add_score(Score('a', 5))
+    assert [score.moves() for score in loaded.scores()] == [4, 5]
+    loaded.save_to_file(path)
+    with open(archive) as file_handle:
+        assert len(file_handle.readlines()) == 3
+    assert loaded.player_stats('12').wins() == 1
+
+
+def test_highscores_sorted_once():
+    db = HighscoresDatabase([Score('1', 8), Score('2', 5)])
+    scores = db.scores()
+    assert db.scores() is scores
+    db.add_score(Score('3', 6))
+    assert db.scores() is not scores
+    assert [score.moves() for score in db.scores()] == [5, 6, 8]
+
+
+def test_highscores_player_stats(tmp_path):
+    path = str(tmp_path / 'highscores.json')
+    db = HighscoresDatabase(limit=2)
+    for name, moves in (('a', 10), ('b', 5), ('a', 6), ('a', 20)):
+        db.add_score(Score(name, moves))
+    stats = db.player_stats('a')
+    assert (stats.wins(), stats.best(), stats.total_moves()) == (3, 6, 36)
+    assert stats.average() == 12
+    assert db.player_stats('c') is None
+    db.save_to_file(path)
+    assert os.path.exists(tmp_path / 'highscores_stats.json')
+
+    stats = read_player_stats_from_file(path)
+    assert stats.player_stats('a').wins() == 3
+    loaded = HighscoresDatabase(limit=2)
+    loaded.read_from_file(path)
+    loaded.add_score(Score('b', 7))
+    assert loaded.player_stats('b').wins() == 2
+    assert loaded.player_stats('a').best() == 6
+
+
+def test_highscores_stats_counted_from_old_file(tmp_path):
+    path = str(tmp_path / 'highscores.json')
+    with open(path, 'w') as file_handle:
+        json.dump([{'player_name': 'a', 'moves': 4},
+                   {'player_name': 'a', 'moves': 8}], file_handle)
+    db = HighscoresDatabase()
+    db.read_from_file(path)
+    assert db.player_stats('a').average() == 6
+
+
+def test_highscores_save_is_atomic(tmp_path, monkeypatch):
+    path = str(tmp_path / 'highscores.json')
+    HighscoresDatabase([Score('1', 5)]).save_to_file(path)
+
+    def broken_write(data, file_handle):
+        file_handle.write('[{"player_name": ')
+        raise RuntimeError('crash')
+    db = HighscoresDatabase([Score('2', 7)])
+    monkeypatch.setattr(db, '_write', broken_write)
+    with pytest.raises(RuntimeError):
+        db.save_to_file(path)
+    assert sorted(os.listdir(tmp_path)) == [
+        'highscores.json', 'highscores_stats.json']
+    loaded = HighscoresDatabase()
+    loaded.read_from_file(path)
+    assert [score.player_name() for score in loaded.scores()] == ['1']
+
+
+def test_read_from_empty_file(tmp_path):
+    path = tmp_path / 'highscores.json'
+    path.write_text('')
+    with pytest.raises(FileIsEmptyError):
+        HighscoresDatabase().read_from_file(str(path))
+
+
+def test_write_behind_merges_saves(tmp_path):
+    path = str(tmp_path / 'highscores.json')
+    db = HighscoresDatabase()
+    writer = WriteBehind(db, path, interval=0.05)
+    for moves in range(10):
+        db.add_score(Score('a', moves + 4))
+        writer.save()
+    assert writer.writes() == 0
+    assert writer.pending()
+    time.sleep(0.3)
+    assert writer.writes() == 1
+    assert not writer.pending()
+    db.add_score(Score('b', 3))
+    writer.save()
+    writer.close()
+    assert writer.writes() == 2
+    loaded = HighscoresDatabase()
+    loaded.read_from_file(path)
+    assert len(loaded.scores()) == 11
+
+
+def test_write_behind_retries_failed_write(tmp_path, monkeypatch):
+    path = str(tmp_path / 'highscores.json')
+    db = HighscoresDatabase([Score('a', 5)])
+    writer = WriteBehind(db, path, interval=0.05)
+    save_to_file = db.save_to_file
+
+    def broken_save(path):
+        raise OSError('disk full')
+    monkeypatch.setattr(db, 'save_to_file', broken_save)
+    writer.save()
+    time.sleep(0.2)
+    assert writer.writes() == 0
+    monkeypatch.setattr(db, 'save_to_file', save_to_file)
+    with pytest.raises(OSError):
+        writer.save()
+    time.sleep(0.2)
+    assert writer.writes() == 1
+    assert not writer.pending()
+    writer.close()
+
+
+def test_atomic_open_unique_temporary_files(tmp_path):
+    path = str(tmp_path / 'games.json')
+    with open(path, 'w') as file_handle:
+        file_handle.write('old')
+    os.chmod(path, 0o640)
+    with atomic_open(path) as first, atomic_open(path) as second:
+        assert len(os.listdir(tmp_path)) == 3
+        first.write('first')
+        second.write('second')
+    with open(path) as file_handle:
+        assert file_handle.read() == 'first'
+    assert os.listdir(tmp_path) == ['games.json']
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_atomic_open_new_file_follows_umask(tmp_path):
+    path = str(tmp_path / 'games.json')
+    previous = os.umask(0o027)
+    try:
+        with atomic_open(path) as file_handle:
+            file_handle.write('new')
+    finally:
+        os.umask(previous)
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def create_saved_games(path, count=3):
+    games = []
+    for number in range(count):
+        game = Game([Player(f'p{number}', 'x'), Player('bot', 'o')])
+        game._current_player = game.players()[0]
+        game.board().insert_player_sign(number + 1, 'x')
+        games.append(game)
+    Database(games).save_to_file(path)
+    return games
+
+
+def test_lazy_database_reads_without_index(tmp_path):
+    path = str(tmp_path / 'games.json')
+    games = create_saved_games(path)
+    db = LazyDatabase()
+    db.read_from_file(path)
+    assert db.headers() == [(0, 'p0', 'bot'), (1, 'p1', 'bot'),
+                            (2, 'p2', 'bot')]
+    game = db.get_game_by_id(2)
+    assert np.array_equal(game.board().board(), games[2].board().board())
+    assert db.get_game_by_id(5) is False
+
+
+def test_lazy_database_save_writes_index(tmp_path, capsys):
+    path = str(tmp_path / 'games.json')
+    create_saved_games(path)
+    db = LazyDatabase()
+    db.read_from_file(path)
+    game = Game([Player('new', 'x'), Player('bot', 'o')])
+    game._current_player = game.players()[0]
+    db.add_game(game)
+    db.save_to_file(path)
+    assert game.id() == 3
+    assert os.path.exists(index_path(path))
+
+    db = LazyDatabase()
+    db.read_from_file(path)
+    assert all(isinstance(item, tuple) for item in db._games.values())
+    db.print_saved_games()
+    assert '3 : new vs bot' in capsys.readouterr().out
+    loaded = db.get_game_by_id(1)
+    assert loaded.players()[0].name() == 'p1'
+    assert sum(isinstance(item, Game) for item in db._games.values()) == 1
+
+    full = Database()
+    full.read_from_file(path)
+    assert [item.id() for item in full.games()] == [0, 1, 2, 3]
+
+
+def test_lazy_database_output_matches_json_dump(tmp_path):
+    path = str(tmp_path / 'games.json')
+    lazy_path = str(tmp_path / 'lazy.json')
+    create_saved_games(path)
+    db = LazyDatabase()
+    db.read_from_file(path)
+    db.save_to_file(lazy_path)
+    with open(path) as expected, open(lazy_path) as result:
+        assert expected.read() == result.read()
+
+
+def test_lazy_database_ignores_stale_index(tmp_path):
+    path = str(tmp_path / 'games.json')
+    create_saved_games(path)
+    db = LazyDatabase()
+    db.read_from_file(path)
+    db.save_to_file(path)
+    create_saved_games(path, 2)
+    db = LazyDatabase()
+    db.read_from_file(path)
+    assert len(db.headers()) == 2
+    assert len(db.games()) == 2
+
+
+def test_lazy_database_reads_games_from_file_read_at_first(tmp_path):
+    path = str(tmp_path / 'games.json')
+    create_saved_games(path)
+    with LazyDatabase() as db:
+        db.read_from_file(path)
+        db.save_to_file(path)
+    with LazyDatabase() as db:
+        db.read_from_file(path)
+        create_saved_games(path, 2)
+        assert [game.players()[0].name() for game in db.games()] == \
+            ['p0', 'p1', 'p2']
+    assert db._file is None
@@ -0,0 +1,53 @@
+from connect4.detection import line_windows, check_line, winning_sign
+from connect4.board import Board
+from connect4.game import Game
+from connect4.player import Player
+from connect4.config import HEIGHT, WIDTH, WIN_COUNT
+import numpy as np
+
+
+def test_line_windows_horizontal():
+    mask = np.zeros((HEIGHT, WIDTH), dtype=bool)
+    mask[2, 1:5] = True
+    windows = line_windows(mask, 'horizontal')
+    assert windows.shape == (HEIGHT, WIDTH-WIN_COUNT+1)
+    assert np.argwhere(windows).tolist() == [[2, 1]]
+
+
+def test_line_windows_too_small_board():
+    mask = np.ones((3, 3), dtype=bool)
+    assert not line_windows(mask, 'diag_left').any()
+
+
+def test_check_line_diagonals():
+    array = np.full((HEIGHT, WIDTH), ' ')
+    for index in range(WIN_COUNT):
+        array[HEIGHT-1-index][index] = 'x'
+        array[index][index] = 'o'
+    assert check_line(array, ['x', 'o'], 'diag_right') == 'x'
+    assert check_line(array, ['x', 'o'], 'diag_left') == 'o'
+    assert check_line(array, ['x', 'o'], 'horizontal') is False
+
+
+def test_winning_sign_big_board():
+    board = Board(np.full((100, 100), ' '))
+    for column in range(40, 46):
+        for _ in range(column - 39):
+            board.insert_player_sign(column, 'o')
+        board.insert_player_sign(column, 'x')
+    array = board.board()
+    assert check_line(array, ['x', 'o'], 'diag_right', 6) == 'x'
+    assert winning_sign(array, ['x', 'o'], 6) == 'o'
+    assert winning_sign(array, ['x', 'o'], 7) is False
+
+
+def test_game_custom_win_count():
+    player1 = Player('1', 'x')
+    player2 = Player('2', 'o')
+    game = Game([player1, player2], np.full((100, 100), ' '), win_count=6)
+    for _ in range(5):
+        game.board().insert_player_sign(50, 'o')
+    assert game.check_winner() is False
+    game.board().insert_player_sign(50, 'o')
+    assert game.check_winner() == (player2, 6)
+    assert game.check_winner(full=True) == (player2, 6)
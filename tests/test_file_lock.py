@@ -0,0 +1,79 @@
+from connect4.database import (LazyDatabase, HighscoresDatabase,
+                               PlayerStatsDatabase)
+from connect4.file_lock import FileLock, lock_path
+from connect4.player import Player
+from connect4.game import Game
+from connect4.score import Score
+from multiprocessing import Pool
+import os
+import pytest
+
+
+def save_games(path, count):
+    for _ in range(count):
+        game = Game([Player('1', 'x'), Player('2', 'o')])
+        game._current_player = game.players()[0]
+        LazyDatabase().update_file(path, lambda db: db.add_game(game))
+
+
+def add_scores(path, count):
+    for moves in range(count):
+        score = Score(str(os.getpid()), moves + 4)
+        HighscoresDatabase(limit=None).update_file(
+            path, lambda db: db.add_score(score))
+
+
+def test_file_lock_timeout(tmp_path):
+    path = str(tmp_path / 'database.json')
+    with FileLock(path) as lock:
+        assert lock.locked()
+        assert os.path.exists(lock_path(path))
+        with pytest.raises(TimeoutError):
+            FileLock(path, timeout=0.05).acquire()
+    assert not lock.locked()
+    with FileLock(path, timeout=0.05):
+        pass
+
+
+def test_update_file_from_many_processes(tmp_path):
+    games_path = str(tmp_path / 'database.json')
+    scores_path = str(tmp_path / 'highscores.json')
+    with Pool(4) as pool:
+        pool.starmap(save_games, [(games_path, 10)] * 4)
+        pool.starmap(add_scores, [(scores_path, 10)] * 4)
+    db = LazyDatabase()
+    db.read_from_file(games_path)
+    assert [id for id, _, _ in db.headers()] == list(range(40))
+    highscores = HighscoresDatabase(limit=None)
+    highscores.read_from_file(scores_path)
+    assert len(highscores.scores()) == 40
+    stats = highscores.stats().stats()
+    assert sum(player.wins() for player in stats.values()) == 40
+
+
+def test_update_file_of_missing_file_starts_empty(tmp_path):
+    path = str(tmp_path / 'database.json')
+    database = LazyDatabase()
+    save_games(path, 2)
+    database.read_from_file(path)
+    os.remove(path)
+    game = Game([Player('3', 'x'), Player('4', 'o')])
+    game._current_player = game.players()[0]
+    database.update_file(path, lambda db: db.add_game(game))
+    loaded = LazyDatabase()
+    loaded.read_from_file(path)
+    assert [header[1] for header in loaded.headers()] == ['3']
+    assert game.id() == 2
+
+    path = str(tmp_path / 'highscores.json')
+    highscores = HighscoresDatabase([Score('a', 5)])
+    highscores.update_file(path, lambda db: db.add_score(Score('b', 7)))
+    assert [score.player_name() for score in highscores.scores()] == ['b']
+    assert highscores.player_stats('a') is None
+
+    path = str(tmp_path / 'stats.json')
+    stats = PlayerStatsDatabase()
+    stats.add_score(Score('a', 5))
+    stats.update_file(path, lambda db: db.add_score(Score('b', 7)))
+    assert stats.player_stats('a') is None
+    assert stats.player_stats('b').wins() == 1
@@ -0,0 +1,168 @@
+from connect4 import instrumentation
+from connect4.instrumentation import Registry, Histogram
+from connect4.board import Board
+from connect4.bitboard import BitBoard
+from connect4.bot import Bot, SearchBot
+from connect4.database import Database, DatabaseObject
+from connect4.player import Player
+from connect4.game import Game
+from connect4.scheduler import BotMoveScheduler
+from connect4.sqlite_database import SqliteDatabase
+from connect4.journal_database import JournalDatabase
+import argparse
+import asyncio
+import json
+import os
+import pytest
+import signal
+
+
+@pytest.fixture
+def registry():
+    registry = Registry()
+    instrumentation.enable(registry)
+    yield registry
+    instrumentation.disable()
+
+
+def create_game():
+    game = Game([Player('1', 'x'), Player('2', 'o')])
+    game._current_player = game.players()[0]
+    return game
+
+
+def test_histogram_buckets():
+    histogram = Histogram('test', buckets=(1, 2))
+    for value in (0.5, 1, 1.5, 3):
+        histogram.observe(value)
+    assert histogram.count() == 4
+    assert histogram.sum() == 6
+    assert histogram.cumulative() == [('1', 2), ('2', 3), ('+Inf', 4)]
+
+
+def test_disable_restores_methods():
+    originals = (Board.insert_player_sign, BitBoard.insert_player_sign,
+                 Game.check_winner, Bot.choose_column,
+                 SearchBot.choose_column, DatabaseObject.save_to_file,
+                 Database.read_from_file)
+    instrumentation.enable(Registry())
+    assert instrumentation.enabled()
+    assert Board.insert_player_sign is not originals[0]
+    instrumentation.disable()
+    assert not instrumentation.enabled()
+    assert (Board.insert_player_sign, BitBoard.insert_player_sign,
+            Game.check_winner, Bot.choose_column,
+            SearchBot.choose_column, DatabaseObject.save_to_file,
+            Database.read_from_file) == originals
+
+
+def test_moves_and_win_checks_counted(registry):
+    game = create_game()
+    for column in (1, 2, 3):
+        game.board().insert_player_sign(column, 'x')
+    game.check_winner()
+    bitboard = BitBoard()
+    bitboard.insert_player_sign(1, 'x')
+    metrics = registry.metrics()
+    assert metrics['connect4_move_seconds'].count() == 4
+    assert metrics['connect4_win_check_seconds'].count() == 1
+
+
+def test_bot_decision_counted_once(registry):
+    bot = SearchBot('o', 0.05)
+    game = Game([Player('1', 'x'), bot])
+    game._current_player = bot
+    bot.choose_column(game.width())
+    SearchBot('o').choose_column(7)
+    assert registry.metrics()['connect4_bot_decision_seconds'].count() == 2
+
+
+def test_scheduled_move_counted_in_process_mode(registry):
+    bot = SearchBot('o', time_limit=None, max_depth=2)
+    game = Game([Player('1', 'x'), bot])
+    game._current_player = bot
+    scheduler = BotMoveScheduler('process', 1)
+    try:
+        column = asyncio.run(scheduler.choose_column(game, key=1))
+    finally:
+        scheduler.close()
+    assert column in range(1, 8)
+    metrics = registry.metrics()
+    assert metrics['connect4_scheduled_move_seconds'].count() == 1
+
+
+def test_game_stores_counted(registry, tmp_path):
+    for database in (SqliteDatabase(str(tmp_path / 'games.db')),
+                     JournalDatabase(str(tmp_path / 'games.journal'))):
+        game = create_game()
+        database.add_game(game)
+        database.get_game_by_id(game.id())
+        database.games()
+        database.remove_game(game)
+        database.close()
+    metrics = registry.metrics()
+    assert metrics['connect4_database_write_seconds'].count() == 4
+    assert metrics['connect4_database_read_seconds'].count() == 4
+
+
+def test_database_bytes_counted(registry, tmp_path):
+    path = str(tmp_path / 'database.json')
+    game = create_game()
+    game._id = 0
+    Database([game]).save_to_file(path)
+    Database().read_from_file(path)
+    metrics = registry.metrics()
+    size = os.path.getsize(path)
+    assert metrics['connect4_database_write_seconds'].count() == 1
+    assert metrics['connect4_database_read_seconds'].count() == 1
+    assert metrics['connect4_database_written_bytes_total'].value() == size
+    assert metrics['connect4_database_read_bytes_total'].value() == size
+
+
+def test_snapshot_formats(registry):
+    Board().insert_player_sign(1, 'x')
+    data = json.loads(instrumentation.snapshot('json', registry))
+    assert data['connect4_move_seconds']['count'] == 1
+    assert data['connect4_move_seconds']['buckets']['+Inf'] == 1
+    text = instrumentation.snapshot('prometheus', registry)
+    assert '# TYPE connect4_move_seconds histogram' in text
+    assert 'connect4_move_seconds_bucket{le="+Inf"} 1' in text
+    assert 'connect4_move_seconds_count 1' in text
+    assert 'connect4_database_read_bytes_total 0' in text
+    with pytest.raises(ValueError):
+        instrumentation.snapshot('xml', registry)
+
+
+def test_signal_handler_dumps_snapshot(registry, tmp_path):
+    path = str(tmp_path / 'metrics.txt')
+    previous = instrumentation.install_signal_handler(
+        signal.SIGUSR1, path, 'prometheus', registry)
+    try:
+        Board().insert_player_sign(1, 'x')
+        os.kill(os.getpid(), signal.SIGUSR1)
+        with open(path) as file_handle:
+            assert 'connect4_move_seconds_count 1' in file_handle.read()
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+
+def test_start_from_arguments(tmp_path, monkeypatch):
+    path = str(tmp_path / 'metrics.json')
+    monkeypatch.setenv('CONNECT4_METRICS', 'json')
+    monkeypatch.setenv('CONNECT4_METRICS_FILE', path)
+    parser = argparse.ArgumentParser()
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args([])
+    assert (args.metrics, args.metrics_file) == ('json', path)
+    with pytest.raises(ValueError):
+        instrumentation.start('xml')
+    previous = signal.getsignal(signal.SIGUSR1)
+    instrumentation.start(args.metrics, args.metrics_file)
+    try:
+        assert instrumentation.enabled()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        with open(path) as file_handle:
+            assert 'connect4_move_seconds' in json.load(file_handle)
+    finally:
+        instrumentation.disable()
+        signal.signal(signal.SIGUSR1, previous)
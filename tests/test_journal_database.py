@@ -0,0 +1,144 @@
+from connect4.journal_database import JournalDatabase
+from connect4.player import Player
+from connect4.game import Game
+from connect4.errors import InvalidDataError
+import json
+import numpy as np
+import os
+import pytest
+
+
+def create_game(name1='1', name2='2'):
+    game = Game([Player(name1, 'x'), Player(name2, 'o')])
+    game._current_player = game.players()[0]
+    game.board().insert_player_sign(3, 'x')
+    return game
+
+
+def test_journal_add_and_reopen(tmp_path):
+    path = str(tmp_path / 'games.journal')
+    db = JournalDatabase(path)
+    games = [create_game(), create_game('3', '4')]
+    for game in games:
+        db.add_game(game)
+    assert [game.id() for game in games] == [0, 1]
+    db.close()
+    db = JournalDatabase(path)
+    loaded = db.get_game_by_id(1)
+    assert loaded.players()[0].name() == '3'
+    assert np.array_equal(loaded.board().board(), games[1].board().board())
+    assert len(db.games()) == 2
+    db.close()
+
+
+def test_journal_overwrite_appends(tmp_path):
+    path = str(tmp_path / 'games.journal')
+    db = JournalDatabase(path, compact_ratio=None)
+    game = create_game()
+    db.add_game(game)
+    game.board().insert_player_sign(4, 'o')
+    db.add_game(game)
+    assert db.records() == 2
+    assert db.dead_records() == 1
+    loaded = db.get_game_by_id(game.id())
+    assert loaded.board().board()[-1][3] == 'o'
+    db.close()
+
+
+def test_journal_remove_game(tmp_path):
+    path = str(tmp_path / 'games.journal')
+    db = JournalDatabase(path)
+    games = [create_game(), create_game()]
+    for game in games:
+        db.add_game(game)
+    assert db.remove_game(games[0]) is True
+    with pytest.raises(ValueError):
+        db.remove_game(games[0])
+    db.close()
+    db = JournalDatabase(path)
+    assert db.get_game_by_id(0) is False
+    new_game = create_game()
+    db.add_game(new_game)
+    assert new_game.id() == 2
+    db.close()
+
+
+def test_journal_compact(tmp_path):
+    path = str(tmp_path / 'games.journal')
+    db = JournalDatabase(path, compact_ratio=None)
+    games = [create_game() for _ in range(5)]
+    for _ in range(3):
+        for game in games:
+            db.add_game(game)
+    db.remove_game(games[0])
+    assert db.records() == 16
+    db.compact()
+    assert db.records() == 4
+    assert db.dead_records() == 0
+    assert sorted(game.id() for game in db.games()) == [1, 2, 3, 4]
+    db.close()
+    lines = open(path).readlines()
+    assert len(lines) == 5
+    assert json.loads(lines[0]) == {'op': 'meta', 'next_id': 5}
+
+
+def test_journal_automatic_compaction(tmp_path):
+    path = str(tmp_path / 'games.journal')
+    db = JournalDatabase(path, compact_ratio=0.5, background=True)
+    game = create_game()
+    for _ in range(200):
+        db.add_game(game)
+    db.close()
+    db = JournalDatabase(path)
+    assert db.records() < 200
+    assert len(db.games()) == 1
+    db.close()
+
+
+def test_journal_invalid_file(tmp_path):
+    path = tmp_path / 'games.journal'
+    path.write_text('not a journal\n')
+    with pytest.raises(InvalidDataError):
+        JournalDatabase(str(path))
+
+
+def test_journal_ids_not_reused_after_compaction(tmp_path):
+    path = str(tmp_path / 'games.journal')
+    db = JournalDatabase(path, compact_ratio=None)
+    for _ in range(3):
+        db.add_game(create_game())
+    db.remove_game(db.get_game_by_id(2))
+    db.compact()
+    assert db.records() == 2
+    db.close()
+    db = JournalDatabase(path, compact_ratio=None)
+    game = create_game()
+    db.add_game(game)
+    assert game.id() == 3
+    db.close()
+
+
+def test_journal_torn_last_record(tmp_path):
+    path = str(tmp_path / 'games.journal')
+    db = JournalDatabase(path, sync=True)
+    db.add_game(create_game())
+    db.close()
+    size = os.path.getsize(path)
+    with open(path, 'ab') as file_handle:
+        file_handle.write(b'{"op":"put","game":{"id":1,"pla')
+    db = JournalDatabase(path)
+    assert os.path.getsize(path) == size
+    assert db.records() == 1
+    db.add_game(create_game('3', '4'))
+    db.close()
+    db = JournalDatabase(path)
+    assert db.get_game_by_id(1).players()[0].name() == '3'
+    db.close()
+
+
+def test_journal_print_saved_games(tmp_path, capsys):
+    db = JournalDatabase(str(tmp_path / 'games.journal'))
+    db.add_game(create_game('konrad', 'maciej'))
+    db.print_saved_games()
+    assert '0 : konrad vs maciej' in capsys.readouterr().out
+    db.close()
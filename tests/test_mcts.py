@@ -0,0 +1,48 @@
+from connect4.mcts import MonteCarloSearch
+from connect4.bitboard import Position
+from connect4.bot import MCTSBot
+from connect4.game import Game
+from connect4.player import Player
+from connect4.config import WIDTH
+import pytest
+
+
+def test_mcts_needs_budget():
+    with pytest.raises(ValueError):
+        MonteCarloSearch(simulations=None, time_limit=None)
+
+
+def test_mcts_simulations():
+    search = MonteCarloSearch(simulations=200, time_limit=None, seed=1)
+    column = search.search(Position())
+    assert column in range(WIDTH)
+    assert search.playouts() == 200
+    assert search.root().visits == 200
+    assert search.stats()['playouts_per_second'] > 0
+
+
+def test_mcts_finds_win():
+    position = Position()
+    for column in [0, 0, 1, 1, 2, 2]:
+        position.play(column)
+    search = MonteCarloSearch(simulations=500, time_limit=None, seed=1)
+    assert search.search(position) == 3
+
+
+def test_mcts_reuses_tree():
+    position = Position()
+    search = MonteCarloSearch(simulations=300, time_limit=None, seed=1)
+    column = search.search(position)
+    position.play(column)
+    position.play(0)
+    search.search(position)
+    assert search.reused() > 0
+    assert search.root().visits == search.reused() + 300
+
+
+def test_mcts_bot_choose_column():
+    bot = MCTSBot('o', simulations=500, time_limit=None, seed=2)
+    game = Game([Player('1', 'x'), bot])
+    for column in [1, 2, 3]:
+        game.board().insert_player_sign(column, 'x')
+    assert bot.choose_column(WIDTH) == 4
@@ -0,0 +1,62 @@
+from connect4.opening_book import (OpeningBook, generate_book, book_positions,
+                                   mirror_key, canonical_key)
+from connect4.bitboard import Position
+from connect4.bot import SearchBot
+from connect4.game import Game
+from connect4.player import Player
+from connect4.errors import InvalidDataError
+from connect4.config import WIDTH, HEIGHT
+import pytest
+
+
+def test_mirror_key():
+    position = Position()
+    position.play(0)
+    position.play(1)
+    mirrored = Position()
+    mirrored.play(WIDTH-1)
+    mirrored.play(WIDTH-2)
+    assert mirror_key(position.key(), WIDTH, HEIGHT) == mirrored.key()
+    assert canonical_key(position)[0] == canonical_key(mirrored)[0]
+
+
+def test_book_positions():
+    assert len(book_positions(0)) == 1
+    assert len(book_positions(1)) == 1 + 4
+    assert len(book_positions(2)) == 1 + 4 + 25
+
+
+def test_generate_and_lookup(tmp_path):
+    path = tmp_path / 'book.bin'
+    count = generate_book(path, depth=2, node_limit=300)
+    with OpeningBook(path) as book:
+        assert len(book) == count
+        position = Position()
+        column, _ = book.lookup(position)
+        assert column in range(WIDTH)
+        position.play(0)
+        left = book.lookup(position)
+        mirrored = Position()
+        mirrored.play(WIDTH-1)
+        right = book.lookup(mirrored)
+        assert right == (WIDTH - 1 - left[0], left[1])
+        for column in [1, 2, 3]:
+            position.play(column)
+        assert book.lookup(position) is None
+
+
+def test_invalid_book(tmp_path):
+    path = tmp_path / 'book.bin'
+    path.write_bytes(b'not a book at all')
+    with pytest.raises(InvalidDataError):
+        OpeningBook(path)
+
+
+def test_search_bot_with_book(tmp_path):
+    path = tmp_path / 'book.bin'
+    generate_book(path, depth=1, node_limit=300)
+    with OpeningBook(path) as book:
+        bot = SearchBot('o', node_limit=0, book=book)
+        Game([Player('1', 'x'), bot])
+        assert bot.choose_column(WIDTH) == book.lookup(Position())[0] + 1
+        assert bot.search().nodes() == 0
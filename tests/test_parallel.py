@@ -0,0 +1,86 @@
+from connect4.parallel import (ParallelSearch, pack_position, unpack_position,
+                               search_root_move)
+from connect4.bitboard import Position
+from connect4.bot import ParallelBot
+from connect4.game import Game
+from connect4.player import Player
+from connect4.config import WIDTH
+import gc
+import pytest
+
+
+def test_pack_position():
+    position = Position()
+    for column in [3, 2, 3]:
+        position.play(column)
+    packed = pack_position(position)
+    assert all(isinstance(item, int) for item in packed)
+    assert unpack_position(packed).key() == position.key()
+
+
+def test_search_root_move_win():
+    position = Position()
+    for column in [0, 0, 1, 1, 2, 2]:
+        position.play(column)
+    column, score, _ = search_root_move(pack_position(position), 3,
+                                        None, None, 2)
+    assert column == 3
+    assert score > 0
+
+
+def test_parallel_invalid_mode():
+    with pytest.raises(ValueError):
+        ParallelSearch(mode='tree')
+
+
+def test_parallel_root_search():
+    position = Position()
+    for column in [0, 6, 1, 6, 2]:
+        position.play(column)
+    search = ParallelSearch(2, 'root', time_limit=None, max_depth=3)
+    try:
+        assert search.search(position) == 3
+        assert search.stats()['work'] > 0
+    finally:
+        search.close()
+
+
+def test_parallel_mcts_search():
+    position = Position()
+    for column in [0, 0, 1, 1, 2, 2]:
+        position.play(column)
+    search = ParallelSearch(2, 'mcts', time_limit=None, simulations=300,
+                            seed=1)
+    try:
+        assert search.search(position) == 3
+        assert search.work() == 600
+    finally:
+        search.close()
+
+
+def test_parallel_bot():
+    bot = ParallelBot('o', workers=2, time_limit=None, max_depth=3)
+    game = Game([Player('1', 'x'), bot])
+    for column in [1, 2, 3]:
+        game.board().insert_player_sign(column, 'x')
+    with bot:
+        assert bot.choose_column(WIDTH) == 4
+    assert bot.search()._executor is None
+
+
+def test_parallel_search_shut_down_when_collected():
+    search = ParallelSearch(1, 'root', time_limit=None, max_depth=2)
+    executor = search.executor()
+    del search
+    gc.collect()
+    assert executor._shutdown_thread
+
+
+def test_search_root_move_counts_root_ply():
+    position = Position()
+    _, _, nodes = search_root_move(pack_position(position), 3,
+                                   None, None, 1)
+    assert nodes == 0
+    _, _, nodes = search_root_move(pack_position(position), 3,
+                                   None, None, 2)
+    assert nodes > 0
@@ -0,0 +1,59 @@
+from connect4.renderer import BoardRenderer
+from connect4.board import Board
+from connect4.bitboard import BitBoard
+import numpy as np
+
+
+def full_text(board):
+    border = '-' * (board.width() * 4 + 1)
+    rows = [''.join(f'| {item} ' for item in row) + '|'
+            for row in board.board()]
+    return '\n'.join([border] + rows + [border])
+
+
+def test_renderer_empty_board():
+    board = Board()
+    assert str(board) == full_text(board)
+    assert BoardRenderer(6, 7).render() == full_text(board)
+
+
+def test_renderer_updates_inserted_signs():
+    board = Board()
+    str(board)
+    for column, sign in ((4, 'x'), (4, 'o'), (1, 'x'), (7, 'o')):
+        board.insert_player_sign(column, sign)
+        assert str(board) == full_text(board)
+
+
+def test_renderer_created_after_moves():
+    array = np.full((4, 5), ' ')
+    array[3][0] = 'x'
+    board = Board(array)
+    board.insert_player_sign(2, 'o')
+    assert str(board) == full_text(board)
+    assert board.renderer().version() == 0
+
+
+def test_renderer_changes():
+    board = Board()
+    renderer = board.renderer()
+    board.insert_player_sign(3, 'x')
+    version = renderer.version()
+    board.insert_player_sign(3, 'o')
+    board.insert_player_sign(5, 'x')
+    assert renderer.version() == 3
+    assert renderer.changes() == [(5, 2, 'x'), (4, 2, 'o'), (5, 4, 'x')]
+    assert renderer.changes(version) == [(4, 2, 'o'), (5, 4, 'x')]
+    assert renderer.changes(renderer.version()) == []
+
+
+def test_renderer_bitboard():
+    board = Board()
+    bitboard = BitBoard()
+    str(bitboard)
+    for column, sign in ((2, 'x'), (2, 'o'), (6, 'x')):
+        board.insert_player_sign(column, sign)
+        bitboard.insert_player_sign(column, sign)
+        assert str(bitboard) == str(board) == full_text(board)
+    assert bitboard.renderer().changes() == [(5, 1, 'x'), (4, 1, 'o'),
+                                             (5, 5, 'x')]
@@ -0,0 +1,115 @@
+from connect4.scheduler import BotMoveScheduler
+from connect4.bot import Bot, SearchBot
+from connect4.player import Player
+from connect4.game import Game
+from connect4.transposition import TranspositionTable
+from connect4.errors import SchedulerQueueFullError, MoveCancelledError
+import asyncio
+import pickle
+import threading
+import pytest
+
+
+class SlowBot(Bot):
+    def __init__(self, sign, event):
+        super().__init__(sign)
+        self._event = event
+
+    def choose_column(self, width):
+        self._event.wait(5)
+        return 1
+
+
+def create_game(bot):
+    game = Game([Player('a', 'x'), bot])
+    game._current_player = bot
+    game.board().insert_player_sign(4, 'x')
+    return game
+
+
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+def test_scheduler_computes_move(kind):
+    scheduler = BotMoveScheduler(kind, 2)
+    bot = SearchBot('o', time_limit=None, max_depth=4, table_memory=1024)
+    game = create_game(bot)
+
+    async def scenario():
+        return await scheduler.choose_column(game, key=1)
+    column = asyncio.run(scenario())
+    scheduler.close()
+    assert column in range(1, 8)
+    assert scheduler.stats()['completed'] == 1
+    assert scheduler.queued() == 0
+
+
+def test_scheduler_deadline_and_busy_bot():
+    event = threading.Event()
+    scheduler = BotMoveScheduler('thread', 2, deadline=0.05)
+    game = create_game(SlowBot('o', event))
+
+    async def scenario():
+        first = await scheduler.choose_column(game, key=1)
+        second = await scheduler.choose_column(game, key=1)
+        event.set()
+        await asyncio.sleep(0.1)
+        return first, second
+    first, second = asyncio.run(scenario())
+    scheduler.close()
+    assert first in range(1, 8) and second in range(1, 8)
+    assert scheduler.stats()['timeouts'] == 2
+    assert scheduler.queued() == 0
+
+
+def test_scheduler_queue_full_and_cancel():
+    event = threading.Event()
+    scheduler = BotMoveScheduler('thread', 1, queue_size=1, deadline=None)
+    game = create_game(SlowBot('o', event))
+    other = create_game(SlowBot('o', event))
+
+    async def scenario():
+        task = asyncio.create_task(scheduler.choose_column(game, key=1))
+        await asyncio.sleep(0.05)
+        with pytest.raises(SchedulerQueueFullError):
+            await scheduler.choose_column(other, key=2, wait=False)
+        assert scheduler.cancel(1) == 1
+        with pytest.raises(MoveCancelledError):
+            await task
+        event.set()
+    asyncio.run(scenario())
+    scheduler.close()
+    assert scheduler.stats()['cancelled'] == 1
+
+
+def test_scheduler_cancel_waiting_request():
+    event = threading.Event()
+    scheduler = BotMoveScheduler('thread', 1, queue_size=1, deadline=None)
+    game = create_game(SlowBot('o', event))
+    waiting_bot = SlowBot('o', event)
+    calls = []
+    waiting_bot.choose_column = lambda width: calls.append(width) or 1
+    waiting = create_game(waiting_bot)
+
+    async def scenario():
+        first = asyncio.create_task(scheduler.choose_column(game, key=1))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(scheduler.choose_column(waiting, key=2))
+        await asyncio.sleep(0.05)
+        assert scheduler.cancel(2) == 1
+        event.set()
+        assert await first == 1
+        with pytest.raises(MoveCancelledError):
+            await second
+    asyncio.run(scenario())
+    scheduler.close()
+    assert calls == []
+    assert scheduler.stats()['cancelled'] == 1
+    assert scheduler.queued() == 0
+
+
+def test_pickled_search_bot_drops_table():
+    bot = SearchBot('o', table_memory=1024)
+    create_game(bot)
+    bot.search().set_table(TranspositionTable(1024))
+    copy = pickle.loads(pickle.dumps(bot))
+    assert copy.search().table() is None
+    assert copy.game().board().board()[5][3] == 'x'
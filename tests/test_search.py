@@ -0,0 +1,78 @@
+from connect4.bitboard import Position
+from connect4.search import Negamax, centre_order
+from connect4.bot import Bot, SearchBot
+from connect4.game import Game
+from connect4.player import Player
+from connect4.config import HEIGHT, WIDTH
+
+
+def test_centre_order():
+    assert centre_order(7) == [3, 2, 4, 1, 5, 0, 6]
+
+
+def test_position_play():
+    position = Position()
+    position.play(3)
+    position.play(3)
+    assert position.moves == 2
+    assert position.can_play(3)
+    for _ in range(HEIGHT - 2):
+        position.play(3)
+    assert not position.can_play(3)
+    assert position.playable_columns() == [0, 1, 2, 4, 5, 6]
+
+
+def test_position_from_array():
+    player1 = Player('1', 'x')
+    player2 = Player('2', 'o')
+    game = Game([player1, player2])
+    for column in [1, 2, 3]:
+        game.board().insert_player_sign(column, 'x')
+        game.board().insert_player_sign(column, 'o')
+    position = Position.from_array(game.board().board(), 'x')
+    assert position.moves == 6
+    assert position.is_winning_move(3)
+    assert not position.is_winning_move(4)
+
+
+def test_negamax_finds_win():
+    position = Position()
+    for column in [0, 0, 1, 1, 2, 2]:
+        position.play(column)
+    column, score = Negamax(time_limit=None, max_depth=4).search(position)
+    assert column == 3
+    assert score > 0
+
+
+def test_negamax_blocks_win():
+    position = Position()
+    for column in [0, 6, 1, 6, 2]:
+        position.play(column)
+    column, score = Negamax(time_limit=None, max_depth=4).search(position)
+    assert column == 3
+
+
+def test_negamax_node_limit():
+    search = Negamax(time_limit=None, node_limit=500)
+    column, _ = search.search(Position())
+    assert column in range(WIDTH)
+    assert search.nodes() <= 500
+    assert search.stats()['nodes'] == search.nodes()
+
+
+def test_bot_chooses_free_column():
+    bot = Bot('o')
+    game = Game([Player('1', 'x'), bot])
+    for column in range(1, WIDTH):
+        for _ in range(HEIGHT):
+            game.board().insert_player_sign(column, 'x')
+    assert bot.choose_column(WIDTH) == WIDTH
+
+
+def test_search_bot_choose_column():
+    bot = SearchBot('o', time_limit=None, max_depth=4)
+    game = Game([Player('1', 'x'), bot])
+    for column in [1, 2, 3]:
+        game.board().insert_player_sign(column, 'x')
+    assert bot.choose_column(WIDTH) == 4
+    assert bot.search().nodes_per_second() > 0
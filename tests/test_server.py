@@ -0,0 +1,197 @@
+from connect4.server import GameServer
+from connect4.scheduler import BotMoveScheduler
+import asyncio
+import json
+
+
+def create_server(tmp_path):
+    return GameServer(str(tmp_path / 'database.json'),
+                      str(tmp_path / 'highscores.json'),
+                      bot_time_limit=0.01, bot_table_memory=0,
+                      scheduler=BotMoveScheduler('thread', 2))
+
+
+def new_pvp(server, owned=None):
+    request = {'command': 'new', 'mode': 'pvp',
+               'players': [{'name': 'a', 'sign': 'x'},
+                           {'name': 'b', 'sign': 'o'}]}
+    return server.handle_request(request, owned)
+
+
+async def send_request(writer, request):
+    writer.write(json.dumps(request).encode() + b'\n')
+    await writer.drain()
+
+
+def test_server_pvp_game_and_highscores(tmp_path):
+    server = create_server(tmp_path)
+
+    async def scenario():
+        state = await new_pvp(server)
+        session = state['session']
+        first = state['current_player']
+        for column in (1, 2, 1, 2, 1, 2):
+            state = await server.handle_request(
+                {'command': 'move', 'session': session, 'column': column})
+            assert state['ok']
+        state = await server.handle_request(
+            {'command': 'move', 'session': session, 'column': 1})
+        assert state['finished']
+        assert state['winner'] == first
+        late = await server.handle_request(
+            {'command': 'move', 'session': session, 'column': 3})
+        assert late == {'ok': False, 'error': 'Game has ended'}
+        scores = await server.handle_request({'command': 'highscores'})
+        assert scores['scores'] == [{'player_name': first, 'moves': 4}]
+        stats = await server.handle_request({'command': 'stats',
+                                             'name': first})
+        assert stats['wins'] == 1
+    asyncio.run(scenario())
+
+
+def test_server_invalid_requests(tmp_path):
+    server = create_server(tmp_path)
+
+    async def scenario():
+        assert not (await server.handle_request([]))['ok']
+        assert not (await server.handle_request({'command': 'x'}))['ok']
+        missing = await server.handle_request({'command': 'state',
+                                               'session': 5})
+        assert missing['error'] == 'Unknown session'
+        state = await new_pvp(server)
+        wrong = await server.handle_request(
+            {'command': 'move', 'session': state['session'], 'column': 9})
+        assert wrong == {'ok': False, 'error': 'Column is out of range'}
+        same = await server.handle_request(
+            {'command': 'new', 'players': [{'name': 'a', 'sign': 'x'},
+                                           {'name': 'b', 'sign': 'x'}]})
+        assert not same['ok']
+        assert not (await server.handle_request({'command': 'load',
+                                                 'id': 0}))['ok']
+        for request in ({'command': []},
+                        {'command': 'highscores', 'limit': 'x'},
+                        {'command': 'load', 'id': [1]},
+                        {'command': 'stats', 'name': {}},
+                        {'command': 'new', 'mode': 'pvb', 'bot_sign': [],
+                         'players': [{'name': 'a', 'sign': 'x'}]},
+                        {'command': 'new', 'players': [
+                            {'name': ['a'], 'sign': 'x'},
+                            {'name': 'b', 'sign': 'o'}]}):
+            response = await server.handle_request(request)
+            assert response['ok'] is False
+            assert response['error']
+    asyncio.run(scenario())
+
+
+def test_server_too_long_line(tmp_path):
+    server = create_server(tmp_path)
+
+    async def scenario():
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'x' * 200000 + b'\n')
+            await send_request(writer, {'command': 'new', 'players': [
+                {'name': 'a', 'sign': 'x'}, {'name': 'b', 'sign': 'o'}]})
+            error = json.loads(await reader.readline())
+            assert error == {'ok': False, 'error': 'Request is too long'}
+            state = json.loads(await reader.readline())
+            assert state['ok']
+            writer.close()
+            await writer.wait_closed()
+    asyncio.run(scenario())
+
+
+def test_server_pvb_save_and_load(tmp_path):
+    server = create_server(tmp_path)
+
+    async def scenario():
+        state = await server.handle_request(
+            {'command': 'new', 'mode': 'pvb', 'bot_sign': 'o',
+             'players': [{'name': 'a', 'sign': 'x'}]})
+        assert state['current_player'] == 'a'
+        session = state['session']
+        bot_moves = ''.join(state['board']).count('o')
+        state = await server.handle_request(
+            {'command': 'move', 'session': session, 'column': 4})
+        board = ''.join(state['board'])
+        assert board.count('x') == 1
+        assert board.count('o') == bot_moves + 1
+        saved = await server.handle_request({'command': 'save',
+                                             'session': session})
+        assert saved['game_id'] == 0
+        loaded = await server.handle_request({'command': 'load', 'id': 0})
+        assert loaded['session'] != session
+        assert loaded['mode'] == 'pvb'
+        assert loaded['board'] == state['board']
+    asyncio.run(scenario())
+
+
+def test_server_state_changes(tmp_path):
+    server = create_server(tmp_path)
+
+    async def scenario():
+        state = await new_pvp(server)
+        session = state['session']
+        version = state['version']
+        await server.handle_request(
+            {'command': 'move', 'session': session, 'column': 2})
+        await server.handle_request(
+            {'command': 'move', 'session': session, 'column': 2})
+        diff = await server.handle_request(
+            {'command': 'state', 'session': session, 'since': version})
+        assert 'board' not in diff
+        assert diff['version'] == version + 2
+        assert [change[:2] for change in diff['changes']] == [[5, 1], [4, 1]]
+        assert diff['changes'][0][2] != diff['changes'][1][2]
+        wrong = await server.handle_request(
+            {'command': 'state', 'session': session, 'since': -1})
+        assert not wrong['ok']
+        wrong = await server.handle_request(
+            {'command': 'state', 'session': session, 'since': version + 3})
+        assert not wrong['ok']
+        wrong = await server.handle_request(
+            {'command': 'move', 'session': session, 'column': True})
+        assert not wrong['ok']
+    asyncio.run(scenario())
+
+
+def test_server_many_clients(tmp_path):
+    server = create_server(tmp_path)
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        request = {'command': 'new',
+                   'players': [{'name': 'a', 'sign': 'x'},
+                               {'name': 'b', 'sign': 'o'}]}
+        writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        state = json.loads(await reader.readline())
+        for column in range(1, 5):
+            request = {'command': 'move', 'session': state['session'],
+                       'column': column}
+            writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+            state = json.loads(await reader.readline())
+        writer.write(b'not json\n')
+        await writer.drain()
+        error = json.loads(await reader.readline())
+        writer.close()
+        await writer.wait_closed()
+        return state, error
+
+    async def scenario():
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            results = await asyncio.gather(*(client(port)
+                                             for _ in range(100)))
+            await asyncio.sleep(0.05)
+        assert len({state['session'] for state, _ in results}) == 100
+        assert all(''.join(state['board']).count(' ') == 38
+                   for state, _ in results)
+        assert all(error == {'ok': False, 'error': 'Invalid json'}
+                   for _, error in results)
+        assert server.sessions() == {}
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+from connect4.sqlite_database import SqliteDatabase
+from connect4.player import Player
+from connect4.bot import Bot
+from connect4.game import Game
+import numpy as np
+import pytest
+
+
+def create_game(name1='1', name2='2'):
+    game = Game([Player(name1, 'x'), Player(name2, 'o')])
+    game._current_player = game.players()[0]
+    game.board().insert_player_sign(3, 'x')
+    return game
+
+
+def test_sqlite_database_add_game(tmp_path):
+    db = SqliteDatabase(str(tmp_path / 'games.sqlite'))
+    game = create_game()
+    db.add_game(game)
+    assert game.id() is not None
+    assert len(db.games()) == 1
+    loaded = db.get_game_by_id(game.id())
+    assert loaded.players()[0].name() == '1'
+    assert loaded.current_player().name() == '1'
+    assert np.array_equal(loaded.board().board(), game.board().board())
+    db.close()
+
+
+def test_sqlite_database_overwrite_game():
+    db = SqliteDatabase()
+    game = create_game()
+    db.add_game(game)
+    game.board().insert_player_sign(3, 'o')
+    db.add_game(game)
+    assert len(db.games()) == 1
+    loaded = db.get_game_by_id(game.id())
+    assert np.array_equal(loaded.board().board(), game.board().board())
+
+
+def test_sqlite_database_remove_game():
+    db = SqliteDatabase()
+    games = [create_game(), create_game()]
+    for game in games:
+        db.add_game(game)
+    assert db.remove_game(games[0]) is True
+    assert db.get_game_by_id(games[0].id()) is False
+    assert [game.id() for game in db.games()] == [games[1].id()]
+    with pytest.raises(ValueError):
+        db.remove_game(games[0])
+
+
+def test_sqlite_database_ids_are_stable():
+    db = SqliteDatabase()
+    games = [create_game(), create_game(), create_game()]
+    for game in games:
+        db.add_game(game)
+    db.remove_game(games[1])
+    new_game = create_game()
+    db.add_game(new_game)
+    assert new_game.id() == games[2].id() + 1
+    assert db.get_game_by_id(games[2].id()) is not False
+
+
+def test_sqlite_database_games_of_player():
+    db = SqliteDatabase()
+    db.add_game(create_game('konrad', 'maciej'))
+    db.add_game(create_game('basia', 'konrad'))
+    db.add_game(create_game('basia', 'maciej'))
+    assert len(db.games_of_player('konrad')) == 2
+    assert len(db.games_of_player('nobody')) == 0
+
+
+def test_sqlite_database_bot_game(capsys):
+    db = SqliteDatabase()
+    game = Game([Player('konrad', 'x'), Bot('o')])
+    game._current_player = game.players()[1]
+    db.add_game(game)
+    assert isinstance(db.get_game_by_id(game.id()).players()[1], Bot)
+    db.print_saved_games()
+    assert f'{game.id()} : konrad vs Bot' in capsys.readouterr().out
@@ -0,0 +1,75 @@
+from connect4.transposition import (TranspositionTable, ZobristHash,
+                                    ENTRY_SIZE, EXACT, LOWER, UPPER)
+from connect4.bitboard import Position
+from connect4.search import Negamax
+from connect4.board import Board
+from connect4.config import HEIGHT, WIDTH
+import pytest
+
+
+def test_table_size():
+    table = TranspositionTable(1000 * ENTRY_SIZE)
+    assert table.size() == 1000
+
+
+def test_table_invalid_policy():
+    with pytest.raises(ValueError):
+        TranspositionTable(replace='never')
+
+
+def test_table_store_probe():
+    table = TranspositionTable(100 * ENTRY_SIZE)
+    assert table.probe(5) is None
+    table.store(5, 3, EXACT, 4, 2)
+    assert table.probe(5) == (3, EXACT, 4, 2)
+    assert table.probe(105) is None
+    assert table.stats() == {'size': 100, 'hits': 1, 'misses': 1,
+                             'collisions': 1}
+
+
+def test_table_depth_preferred():
+    table = TranspositionTable(100 * ENTRY_SIZE)
+    table.store(5, 3, LOWER, 6, 2)
+    table.store(105, 1, UPPER, 2, 1)
+    assert table.probe(5) == (3, LOWER, 6, 2)
+    table.store(105, 1, UPPER, 6, 1)
+    assert table.probe(105) == (1, UPPER, 6, 1)
+
+
+def test_table_always_replace():
+    table = TranspositionTable(100 * ENTRY_SIZE, replace='always')
+    table.store(5, 3, LOWER, 6, 2)
+    table.store(105, 1, UPPER, 2, 1)
+    assert table.probe(5) is None
+    assert table.probe(105) == (1, UPPER, 2, 1)
+
+
+def test_table_clear():
+    table = TranspositionTable(100 * ENTRY_SIZE)
+    table.store(5, 3, EXACT, 4, 2)
+    table.clear()
+    assert table.probe(5) is None
+    assert table.hits() == 0
+
+
+def test_zobrist_hash():
+    zobrist = ZobristHash(WIDTH, HEIGHT, ['x', 'o'])
+    board = Board()
+    key = zobrist.hash_array(board.board())
+    assert key == 0
+    board.insert_player_sign(4, 'x')
+    key = zobrist.update(key, HEIGHT-1, 3, 'x')
+    assert key == zobrist.hash_array(board.board())
+    assert zobrist.update(key, HEIGHT-1, 3, 'x') == 0
+
+
+def test_negamax_with_table_same_result():
+    position = Position()
+    for column in [3, 3, 2, 4, 2]:
+        position.play(column)
+    table = TranspositionTable()
+    with_table = Negamax(time_limit=None, max_depth=6, table=table)
+    without_table = Negamax(time_limit=None, max_depth=6)
+    assert with_table.search(position) == without_table.search(position)
+    assert with_table.nodes() < without_table.nodes()
+    assert table.hits() > 0